@@ -1,7 +1,14 @@
 #!/usr/bin/python3
+import os
 import pathlib
 import sys
 
+# 🖥️ Sem ecrã (servidores, CI): python animation.py --headless
+# O PyOpenGL escolhe a plataforma no primeiro import, por isso tem de ser antes dos imports do projeto
+HEADLESS = "--headless" in sys.argv
+if HEADLESS:
+    os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+
 # Setup do caminho
 package_dir = str(pathlib.Path(__file__).resolve().parents[2])
 if package_dir not in sys.path:
@@ -26,8 +33,9 @@ def animation_menu():
 if __name__ == "__main__":
     print("🎬 Iniciando Animação Completa")
     
-    # Menu de escolha da câmera
-    free_camera = animation_menu()
+    # Menu de escolha da câmera (headless não tem teclado: câmeras automáticas)
+    free_camera = False if HEADLESS else animation_menu()
     
+    # Com PYOPENGL_PLATFORM=egl/osmesa o Base cria um contexto headless
     animation = SceneManager(free_camera_mode=free_camera)
     animation.run()
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""
+Pipeline de carregamento de assets em paralelo.
+
+As etapas só de CPU (parsing de OBJ, parsing de MTL e descodificação de imagens para
+bytes RGBA) correm num pool de processos (ou threads); a construção das geometrias,
+que cria buffers e texturas OpenGL, corre sempre na thread principal, que é a dona
+do contexto. Enquanto a thread principal faz o upload de um asset, os workers já
+estão a preparar os seguintes.
+
+Os OBJ não voltam pelo pipe do pool: o worker grava-os na cache binária
+(core.mesh_cache) e a thread principal mapeia esses ficheiros em memória, sem cópias.
+"""
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from core import mesh_cache
+from core.obj_reader import OBJ_READER_VERSION, my_obj_reader_arrays
+from core_ext.texture import Texture
+from core_ext.texture_cache import texture_cache
+from geometry.humano import parse_mtl_colors
+
+# Etapas medidas para cada asset, pela ordem do relatório
+STAGES = ["obj", "mtl", "imagens", "espera", "upload"]
+
+
+def _prepare_obj(obj_path):
+    """
+    Worker: garante que o OBJ está na cache binária. Só devolve os arrays
+    (copiados pelo pipe) se não for possível gravar a cache.
+    """
+    grouped_data = my_obj_reader_arrays(obj_path, use_cache=True)
+    if mesh_cache.load(obj_path, OBJ_READER_VERSION) is not None:
+        return None
+    return grouped_data
+
+
+def _timed(function, argument):
+    """Worker: corre uma etapa e devolve (resultado, segundos de CPU gastos)"""
+    start = time.perf_counter()
+    result = function(argument)
+    return result, time.perf_counter() - start
+
+
+def default_worker_count():
+    """Deixa um núcleo livre para a thread principal (uploads e render)"""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def create_executor(max_workers, use_processes=True):
+    """Pool para as etapas de CPU; usa threads se não for possível criar processos"""
+    if use_processes:
+        try:
+            # "spawn" para os workers não herdarem o estado do pygame/OpenGL
+            return ProcessPoolExecutor(max_workers=max_workers,
+                                       mp_context=multiprocessing.get_context("spawn"))
+        except (OSError, ImportError, NotImplementedError) as e:
+            print(f"⚠️ Pool de processos indisponível ({e}), a usar threads")
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+class AssetLoader:
+    """
+    Regista assets com add() e carrega-os todos com run().
+    Também pode ser usado de forma incremental: start() envia o trabalho de CPU para
+    os workers e cada step(time_budget) faz uploads só enquanto houver orçamento de
+    tempo, sem bloquear à espera dos workers (útil durante as transições).
+    progress_callback(nome, etapa, concluídos, total) é chamado na thread principal
+    quando um asset termina a etapa "cpu" e depois a etapa "upload".
+    """
+    def __init__(self, max_workers=None, use_processes=True, progress_callback=None, executor=None):
+        self.max_workers = max_workers or default_worker_count()
+        self.use_processes = use_processes
+        self.progress_callback = progress_callback
+        self.assets = []
+        # nome -> {etapa: segundos}
+        self.timings = {}
+        # nome -> exceção
+        self.errors = {}
+        # nome -> resultado do build
+        self.results = {}
+        self.total_time = 0.0
+        # Executor partilhado (não é fechado pelo loader) ou criado no start()
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._jobs = None
+        self._futures = {}
+        self._accounted = set()
+        self._done_count = 0
+        self._start_time = None
+
+    @property
+    def is_finished(self):
+        return self._jobs is not None and not self._jobs
+
+    def add(self, name, build, obj_path=None, mtl_path=None, images=()):
+        """
+        Regista um asset. build(obj_data, mtl_colors) corre na thread principal com
+        os grupos do OBJ (arrays) e as cores do MTL já lidos; as imagens indicadas
+        ficam descodificadas na texture_cache, para o build só fazer o upload.
+        """
+        self.assets.append((name, build, obj_path, mtl_path, list(images)))
+
+    def _notify(self, name, stage):
+        if self.progress_callback is not None:
+            self.progress_callback(name, stage, self._done_count, len(self.assets))
+
+    def _submit(self, stage, function, argument):
+        # Cada ficheiro é processado uma só vez, mesmo que vários assets o usem
+        key = (stage, argument)
+        if key not in self._futures:
+            self._futures[key] = self._executor.submit(_timed, function, argument)
+        return self._futures[key]
+
+    def start(self):
+        """Envia todas as etapas de CPU para os workers"""
+        self._start_time = time.perf_counter()
+        if self._executor is None:
+            self._executor = create_executor(self.max_workers, self.use_processes)
+        self._jobs = deque()
+        for name, build, obj_path, mtl_path, images in self.assets:
+            obj_future = self._submit("obj", _prepare_obj, obj_path) if obj_path else None
+            mtl_future = self._submit("mtl", parse_mtl_colors, mtl_path) if mtl_path else None
+            image_futures = [(f, self._submit("imagens", Texture.decode_image, f)) for f in images]
+            self._jobs.append((name, build, obj_path, obj_future, mtl_future, image_futures))
+
+    def step(self, time_budget=None):
+        """
+        Faz os uploads pela ordem de registo. Sem time_budget bloqueia até acabar;
+        com time_budget (segundos) pára quando o tempo acaba ou quando o próximo asset
+        ainda não saiu dos workers. Devolve True quando todos os assets estão prontos.
+        """
+        if self._jobs is None:
+            self.start()
+        step_start = time.perf_counter()
+        while self._jobs:
+            if time_budget is not None:
+                if time.perf_counter() - step_start >= time_budget:
+                    break
+                if not all(future.done() for future in self._job_futures(self._jobs[0])):
+                    break
+            self._upload_job(self._jobs.popleft())
+        if self._jobs:
+            return False
+        self._finish()
+        return True
+
+    def run(self):
+        """Carrega todos os assets; devolve {nome: resultado do build, ou None se falhou}"""
+        self.start()
+        self.step()
+        return self.results
+
+    @staticmethod
+    def _job_futures(job):
+        _, _, _, obj_future, mtl_future, image_futures = job
+        futures = [future for _, future in image_futures]
+        return [f for f in (obj_future, mtl_future) if f is not None] + futures
+
+    def _collect(self, future, stage, timing):
+        wait_start = time.perf_counter()
+        result, cpu_time = future.result()
+        timing["espera"] += time.perf_counter() - wait_start
+        # O tempo de CPU de um ficheiro partilhado conta só para o primeiro asset
+        if id(future) not in self._accounted:
+            self._accounted.add(id(future))
+            timing[stage] += cpu_time
+        return result
+
+    def _upload_job(self, job):
+        name, build, obj_path, obj_future, mtl_future, image_futures = job
+        timing = self.timings.setdefault(name, dict.fromkeys(STAGES, 0.0))
+        self._done_count += 1
+        try:
+            obj_data = None
+            if obj_future is not None:
+                obj_data = self._collect(obj_future, "obj", timing)
+                if obj_data is None:
+                    obj_data = my_obj_reader_arrays(obj_path, use_cache=True)
+            mtl_colors = self._collect(mtl_future, "mtl", timing) if mtl_future is not None else None
+            for image_file, image_future in image_futures:
+                texture_cache.add_decoded(image_file, self._collect(image_future, "imagens", timing))
+            self._notify(name, "cpu")
+
+            upload_start = time.perf_counter()
+            self.results[name] = build(obj_data, mtl_colors)
+            timing["upload"] = time.perf_counter() - upload_start
+        except Exception as e:
+            print(f"❌ Erro ao carregar {name}: {e}")
+            self.errors[name] = e
+            self.results[name] = None
+        self._notify(name, "upload")
+
+    def _finish(self):
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._futures.clear()
+        # Imagens descodificadas que nenhum build chegou a usar
+        texture_cache.clear_decoded()
+        if self._start_time is not None:
+            self.total_time = time.perf_counter() - self._start_time
+            self._start_time = None
+
+    def report(self, limit=15):
+        """Tabela de tempos por asset (os mais lentos primeiro) e totais por etapa"""
+        print(f"⏱️ Carregamento: {len(self.assets)} assets em {self.total_time:.2f}s "
+              f"({self.max_workers} workers, {'processos' if self.use_processes else 'threads'})")
+        header = "".join(f"{stage:>9s}" for stage in STAGES)
+        print(f"   {'asset':32s}{header}{'total':>9s}")
+        slowest = sorted(self.timings.items(), key=lambda item: -sum(item[1].values()))
+        for name, timing in slowest[:limit]:
+            values = "".join(f"{timing[stage]:9.3f}" for stage in STAGES)
+            print(f"   {name[:32]:32s}{values}{sum(timing.values()):9.3f}")
+        if len(slowest) > limit:
+            print(f"   ... mais {len(slowest) - limit} assets")
+        totals = "".join(f"{sum(t[stage] for t in self.timings.values()):9.3f}" for stage in STAGES)
+        print(f"   {'TOTAL':32s}{totals}")
+        if self.errors:
+            print(f"   ❌ {len(self.errors)} assets falharam: {', '.join(self.errors)}")
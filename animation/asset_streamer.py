@@ -0,0 +1,122 @@
+"""
+Carregamento de assets por cena, a pedido.
+
+Cada cena declara em ASSETS os nomes dos assets de que precisa (ver BaseScene).
+O AssetStreamer carrega esses assets com o AssetLoader: prefetch() envia o trabalho
+de CPU para os workers e update(time_budget) vai fazendo os uploads aos poucos,
+frame a frame (ex.: durante os 5s de tela preta das transições); acquire() garante
+que tudo está carregado antes de a cena começar. Os assets que a próxima cena não
+usa são libertados da GPU com evict().
+"""
+import time
+from collections import deque
+
+from animation.asset_loader import AssetLoader, create_executor, default_worker_count
+
+
+class AssetDefinition:
+    """
+    Como carregar e libertar um asset:
+    register(loader) regista no AssetLoader os ficheiros do asset e devolve uma
+    função assemble(results) que monta o objeto final a partir dos resultados;
+    release(objeto) liberta os recursos da GPU; empty é o valor publicado quando
+    o asset não está carregado (None para salas, [] para listas de frames).
+    """
+    def __init__(self, register, release, empty=None):
+        self.register = register
+        self.release = release
+        self.empty = empty
+
+
+class AssetStreamer:
+    def __init__(self, definitions, max_workers=None, use_processes=True, progress_callback=None):
+        # nome -> AssetDefinition
+        self.definitions = definitions
+        self.max_workers = max_workers or default_worker_count()
+        self.use_processes = use_processes
+        self.progress_callback = progress_callback
+        # nome -> objeto carregado
+        self.resident = {}
+        # Lotes em curso, por ordem: (nomes, loader, {nome: assemble})
+        self._batches = deque()
+        # Pool partilhado por todos os lotes (evita arrancar processos a cada cena)
+        self._executor = None
+        # Estatísticas
+        self.loaded_count = 0
+        self.evicted_count = 0
+        self.peak_resident = 0
+
+    @property
+    def pending_names(self):
+        return [name for names, _, _ in self._batches for name in names]
+
+    @property
+    def is_idle(self):
+        return not self._batches
+
+    def prefetch(self, names):
+        """Começa a carregar (sem bloquear) os assets que ainda não estão carregados"""
+        pending = set(self.pending_names)
+        missing = [name for name in names if name not in self.resident and name not in pending]
+        if not missing:
+            return
+        if self._executor is None:
+            self._executor = create_executor(self.max_workers, self.use_processes)
+        loader = AssetLoader(self.max_workers, self.use_processes,
+                             progress_callback=self.progress_callback, executor=self._executor)
+        assemblers = {name: self.definitions[name].register(loader) for name in missing}
+        loader.start()
+        self._batches.append((missing, loader, assemblers))
+        print(f"📦 Prefetch: {', '.join(missing)}")
+
+    def update(self, time_budget=None):
+        """
+        Faz uploads dos lotes pendentes. Com time_budget (segundos) nunca bloqueia
+        mais do que isso; sem time_budget termina tudo. Devolve True se não há nada pendente.
+        """
+        start = time.perf_counter()
+        while self._batches:
+            remaining = None
+            if time_budget is not None:
+                remaining = time_budget - (time.perf_counter() - start)
+                if remaining <= 0:
+                    return False
+            names, loader, assemblers = self._batches[0]
+            if not loader.step(remaining):
+                return False
+            self._batches.popleft()
+            for name in names:
+                self.resident[name] = assemblers[name](loader.results)
+            self.loaded_count += len(names)
+            self.peak_resident = max(self.peak_resident, len(self.resident))
+            loader.report(limit=5)
+        return True
+
+    def acquire(self, names):
+        """Garante que os assets estão carregados (bloqueia se preciso) e devolve-os"""
+        self.prefetch(names)
+        if any(name not in self.resident for name in names):
+            wait_start = time.perf_counter()
+            self.update()
+            print(f"⏳ Espera por assets: {time.perf_counter() - wait_start:.2f}s")
+        return {name: self.resident[name] for name in names}
+
+    def evict(self, keep):
+        """Liberta os assets carregados que não estão em keep; devolve os nomes libertados"""
+        evicted = [name for name in self.resident if name not in keep]
+        for name in evicted:
+            self.definitions[name].release(self.resident.pop(name))
+        self.evicted_count += len(evicted)
+        if evicted:
+            print(f"🗑️ Assets libertados: {', '.join(evicted)}")
+        return evicted
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def report(self):
+        print(f"📦 Streaming: {len(self.resident)} assets carregados "
+              f"(pico {self.peak_resident}), {self.loaded_count} carregamentos, "
+              f"{self.evicted_count} libertados")
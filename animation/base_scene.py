@@ -1,7 +1,13 @@
+import bisect
+import itertools
 import math
 from abc import ABC, abstractmethod
 
 class BaseScene(ABC):
+    # Assets do SceneManager usados pela cena (ex.: "quarto", "andar_frames");
+    # são carregados antes de initialize() e libertados quando deixam de ser usados
+    ASSETS = []
+
     def __init__(self, scene, camera, renderer):
         self.scene = scene
         self.camera = camera
@@ -23,6 +29,30 @@ class BaseScene(ABC):
     def update(self, delta_time):
         """Atualiza a cena a cada frame"""
         pass
+
+    def seek(self, scene_time, step=1 / 60):
+        """
+        Põe a cena no estado do instante scene_time (segundos desde o início da
+        cena), depois de initialize(). Por omissão repete os updates com passo fixo;
+        as cenas com waypoints e keyframes calculam o estado diretamente
+        """
+        elapsed = 0.0
+        while elapsed + step <= scene_time and not self.is_finished:
+            self.update(step)
+            elapsed += step
+        if scene_time > elapsed and not self.is_finished:
+            self.update(scene_time - elapsed)
+
+    @staticmethod
+    def cumulative_starts(items):
+        """Instante de início de cada waypoint/keyframe (somas das durações anteriores)"""
+        return [0.0] + list(itertools.accumulate(item["duration"] for item in items))[:-1]
+
+    @staticmethod
+    def lookup(starts, time):
+        """Pesquisa binária: (índice do item que contém time, tempo dentro desse item)"""
+        index = max(0, bisect.bisect_right(starts, time) - 1)
+        return index, time - starts[index]
     
     def interpolate(self, start, end, progress):
         """Interpolação linear entre dois valores"""
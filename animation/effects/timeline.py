@@ -1,3 +1,4 @@
+import bisect
 import time
 
 class MusicTimeline:
@@ -8,6 +9,8 @@ class MusicTimeline:
         
         # 🎵 TIMELINE DE MÚSICA
         self.music_timeline = []
+        # Início de cada entrada, por ordem (pesquisa binária em _find_entry)
+        self.entry_starts = []
         self.current_timeline_index = 0
         self.timeline_start_time = 0.0
         self.timeline_active = False
@@ -28,6 +31,7 @@ class MusicTimeline:
         """
         self.music_timeline = timeline_config.copy()
         self.music_timeline.sort(key=lambda x: x["start"])  # Ordena por tempo de início
+        self.entry_starts = [entry["start"] for entry in self.music_timeline]
         
         print(f"🎵 TIMELINE MUSICAL CONFIGURADA:")
         for i, entry in enumerate(self.music_timeline):
@@ -69,14 +73,7 @@ class MusicTimeline:
             current_time = time.time() - self.timeline_start_time
         
         # 🔍 ENCONTRA ENTRADA ATUAL DA TIMELINE
-        target_entry = None
-        target_index = -1
-        
-        for i, entry in enumerate(self.music_timeline):
-            if entry["start"] <= current_time < entry["end"]:
-                target_entry = entry
-                target_index = i
-                break
+        target_index, target_entry = self._find_entry(current_time)
         
         # 🎵 VERIFICA SE PRECISA MUDAR MÚSICA
         if target_index != self.current_timeline_index:
@@ -93,6 +90,25 @@ class MusicTimeline:
                 print(f"🔇 SILÊNCIO aos {current_time:.1f}s - fora dos intervalos")
                 self._stop_current_music()
     
+    def _find_entry(self, current_time):
+        """(índice, entrada) que contém current_time, ou (-1, None) fora dos intervalos"""
+        index = bisect.bisect_right(self.entry_starts, current_time) - 1
+        if index >= 0 and current_time < self.music_timeline[index]["end"]:
+            return index, self.music_timeline[index]
+        return -1, None
+
+    def seek(self, current_time):
+        """Salta para current_time: ativa a timeline e toca a música da entrada desse instante"""
+        if not self.music_timeline:
+            return None
+        self.timeline_active = True
+        self.current_timeline_index, entry = self._find_entry(current_time)
+        if entry:
+            self._play_timeline_music(entry)
+        else:
+            self._stop_current_music()
+        return entry
+
     def _play_timeline_music(self, entry):
         """Reproduz música de uma entrada da timeline"""
         if not entry["music"]:
@@ -154,11 +170,7 @@ class MusicTimeline:
         else:
             current_time = time.time() - self.timeline_start_time if self.timeline_active else 0
         
-        for entry in self.music_timeline:
-            if entry["start"] <= current_time < entry["end"]:
-                return entry
-        
-        return None
+        return self._find_entry(current_time)[1]
     
     def set_fade_duration(self, seconds):
         """Define duração dos fades entre músicas"""
@@ -1,5 +1,4 @@
 import math
-import time
 
 class SceneTransitions:
     """Sistema de transições cinematográficas entre cenas"""
@@ -26,7 +25,8 @@ class SceneTransitions:
         self.transition_type = None
         self.transition_progress = 0.0
         self.transition_duration = 5.0  # ← SEMPRE 5 segundos
-        self.transition_start_time = 0.0
+        # Tempo da transição, somado dos delta_time (não do relógio: exportação com passo fixo)
+        self.transition_elapsed = 0.0
         
         # 📷 Câmera para transições
         self.transition_camera_start = None
@@ -57,7 +57,7 @@ class SceneTransitions:
         self.transition_type = transition_type
         self.transition_duration = 5.0  # ← FORÇA 5 segundos sempre
         self.transition_progress = 0.0
-        self.transition_start_time = time.time()
+        self.transition_elapsed = 0.0
         self.scene_cleaned = True
         
         # Salva cor de fundo original
@@ -69,6 +69,13 @@ class SceneTransitions:
         # Configura transição específica - todas são FADE BLACK simples
         self._setup_simple_fade_transition()
     
+    def seek(self, elapsed, transition_type="fade_black"):
+        """Começa uma transição já com elapsed segundos decorridos (SceneManager.seek)"""
+        self.start_transition(transition_type)
+        self.transition_elapsed = elapsed
+        self.transition_progress = min(1.0, elapsed / self.transition_duration)
+        self._update_simple_fade_transition()
+
     def _cleanup_scene_immediately(self):
         """LIMPA TUDO da scene imediatamente"""
         print("🧹 LIMPEZA COMPLETA DA SCENE - INICIANDO...")
@@ -82,7 +89,7 @@ class SceneTransitions:
             objects_to_remove = []
             
             # 🗑️ COLETA TODOS OS OBJETOS para remover
-            for obj in scene.children:
+            for obj in scene.children_list:
                 # Preserva apenas câmera e camera_rig
                 if (obj != self.scene_manager.camera and 
                     obj != getattr(self.scene_manager, 'camera_rig', None)):
@@ -134,7 +141,8 @@ class SceneTransitions:
             return False
         
         # Atualiza progresso
-        elapsed_time = time.time() - self.transition_start_time
+        self.transition_elapsed += delta_time
+        elapsed_time = self.transition_elapsed
         self.transition_progress = min(1.0, elapsed_time / self.transition_duration)
         
         # 🌑 APLICA FADE SIMPLES (sempre igual)
@@ -0,0 +1,319 @@
+#!/usr/bin/python3
+"""
+Exportação offline em paralelo: o clip é dividido em segmentos de tempo global
+(SceneManager.clip_duration, com as durações reais das cenas, como no seek) e cada
+segmento é renderizado por um worker, num processo com o seu contexto headless.
+No fim os segmentos são juntados por ordem.
+
+A fila de trabalhos é uma pasta, por isso os workers tanto podem ser processos
+locais (comando run) como processos noutras máquinas que vejam a mesma pasta
+(comandos plan, worker e stitch):
+    pasta/farm.json        saída, FPS, tamanho e número de segmentos
+    pasta/pendentes/       um ficheiro JSON por segmento por fazer
+    pasta/em_curso/        segmentos reservados por um worker (rename atómico)
+    pasta/concluidos/      segmentos prontos, com o número de frames gravados
+    pasta/segmentos/       vídeo (ou pasta de PNGs) de cada segmento
+
+Cada worker chega ao início do segmento avançando só a lógica com o passo fixo,
+sem renderizar, e reaproveita o mesmo SceneManager entre segmentos: os frames são
+exatamente os da exportação sequencial. Como os segmentos são reservados por
+ordem, um worker só avança no tempo. Com --seek salta para o início com o
+SceneManager.seek, num SceneManager novo por segmento (mais rápido, mas ainda não
+se garante que os frames sejam iguais aos sequenciais).
+
+Uso (a partir da raiz do projeto):
+    python -m animation.render_farm run saida.mp4 [--workers 4] [--segment 10] [--fps 30] [--size 1280x720] [--seek]
+    python -m animation.render_farm plan pasta saida.mp4 [--segment 10] [--fps 30] [--size 1280x720] [--seek]
+    python -m animation.render_farm worker pasta      (em cada máquina, quantos quiser)
+    python -m animation.render_farm stitch pasta
+    python -m animation.render_farm requeue pasta     (devolve segmentos de workers que morreram)
+"""
+import os
+
+# Workers sem ecrã nem som: o PyOpenGL escolhe a plataforma no primeiro import, e os
+# processos criados com spawn voltam a importar este módulo antes de tudo o resto
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import math
+import multiprocessing
+import shutil
+import socket
+import subprocess
+import time
+
+from animation.scene_manager import SceneManager
+from animation.video_encoder import is_video
+from animation.video_export import DEFAULT_FPS, DEFAULT_SIZE, OfflineExporter, parse_size
+
+# Segundos de clip por segmento
+DEFAULT_SEGMENT_SECONDS = 10.0
+FARM_FILE = "farm.json"
+PENDING_DIR = "pendentes"
+CLAIMED_DIR = "em_curso"
+DONE_DIR = "concluidos"
+SEGMENTS_DIR = "segmentos"
+
+
+def _write_json(path, data):
+    """Escreve num ficheiro temporário e troca: quem lê nunca vê um JSON a meio"""
+    temporary = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(data, file, indent=2)
+    os.replace(temporary, path)
+
+
+def _read_json(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def _segment_name(index):
+    return f"segment_{index:04d}"
+
+
+def plan(job_dir, output, fps=DEFAULT_FPS, size=DEFAULT_SIZE, segment_seconds=DEFAULT_SEGMENT_SECONDS,
+         replay=True):
+    """
+    Divide o clip em segmentos e cria um trabalho por segmento em job_dir.
+    O último segmento não tem fim: vai até o clip terminar (clip_finished), sem
+    depender de o último frame bater certo com a conta das durações
+    """
+    for directory in (PENDING_DIR, CLAIMED_DIR, DONE_DIR, SEGMENTS_DIR):
+        os.makedirs(os.path.join(job_dir, directory), exist_ok=True)
+    if os.listdir(os.path.join(job_dir, PENDING_DIR)) or os.listdir(os.path.join(job_dir, CLAIMED_DIR)):
+        raise Exception(f"A pasta {job_dir} já tem trabalhos por fazer")
+    segment_frames = max(1, round(segment_seconds * fps))
+    clip_duration = SceneManager.clip_duration()
+    total_frames = round(clip_duration * fps)
+    segment_count = max(1, math.ceil(total_frames / segment_frames))
+    extension = os.path.splitext(output)[1] if is_video(output) else ""
+    for index in range(segment_count):
+        name = _segment_name(index)
+        job = {
+            "index": index,
+            "start_frame": index * segment_frames,
+            "end_frame": None if index == segment_count - 1 else (index + 1) * segment_frames,
+            "output": os.path.join(SEGMENTS_DIR, name + extension),
+        }
+        _write_json(os.path.join(job_dir, PENDING_DIR, name + ".json"), job)
+    _write_json(os.path.join(job_dir, FARM_FILE), {
+        "output": output,
+        "fps": fps,
+        "size": list(size),
+        "segment_count": segment_count,
+        "replay": replay,
+    })
+    print(f"📋 {segment_count} segmentos de {segment_frames} frames em {job_dir} "
+          f"(~{clip_duration:.0f}s de clip a {fps} FPS)")
+    return segment_count
+
+
+def claim(job_dir):
+    """
+    Reserva o primeiro segmento pendente; devolve (caminho da reserva, trabalho)
+    ou None quando não há mais. O rename é atómico: se dois workers tentarem o
+    mesmo segmento, só um consegue e o outro passa ao seguinte
+    """
+    pending_dir = os.path.join(job_dir, PENDING_DIR)
+    worker_name = f"{socket.gethostname()}.{os.getpid()}"
+    for file_name in sorted(os.listdir(pending_dir)):
+        if not file_name.endswith(".json"):
+            continue
+        claimed_path = os.path.join(job_dir, CLAIMED_DIR, f"{file_name}.{worker_name}")
+        try:
+            os.rename(os.path.join(pending_dir, file_name), claimed_path)
+        except FileNotFoundError:
+            continue
+        return claimed_path, _read_json(claimed_path)
+    return None
+
+
+def release(job_dir, claimed_path):
+    """Devolve um segmento reservado à fila (o worker falhou ou morreu)"""
+    file_name = os.path.basename(claimed_path).split(".json")[0] + ".json"
+    os.rename(claimed_path, os.path.join(job_dir, PENDING_DIR, file_name))
+
+
+def requeue(job_dir):
+    """Devolve à fila todos os segmentos reservados que não foram concluídos"""
+    claimed_dir = os.path.join(job_dir, CLAIMED_DIR)
+    claimed_list = sorted(os.listdir(claimed_dir))
+    for file_name in claimed_list:
+        release(job_dir, os.path.join(claimed_dir, file_name))
+    print(f"🔁 {len(claimed_list)} segmentos devolvidos à fila")
+    return len(claimed_list)
+
+
+def _open_exporter(fps, size):
+    manager = SceneManager(screen_size=size)
+    manager.initialize()
+    return OfflineExporter(manager, fps)
+
+
+def _close_exporter(exporter):
+    exporter.reader.delete()
+    exporter.manager.asset_streamer.shutdown()
+    exporter.manager.context.delete()
+
+
+def work(job_dir):
+    """
+    Worker: reserva e renderiza segmentos até a fila ficar vazia.
+    Devolve o número de segmentos feitos
+    """
+    farm = _read_json(os.path.join(job_dir, FARM_FILE))
+    fps = farm["fps"]
+    size = tuple(farm["size"])
+    replay = farm.get("replay", True)
+    exporter = None
+    done_count = 0
+    while True:
+        claimed = claim(job_dir)
+        if claimed is None:
+            break
+        claimed_path, job = claimed
+        start_frame = job["start_frame"]
+        try:
+            # Com seek, cada segmento começa num SceneManager novo: não herda o estado
+            # dos segmentos de antes. Sem seek, um segmento devolvido à fila pode estar
+            # para trás: começa do início
+            if exporter is not None and (not replay or exporter.frame_index > start_frame):
+                _close_exporter(exporter)
+                exporter = None
+            if exporter is None:
+                exporter = _open_exporter(fps, size)
+            segment_output = os.path.join(job_dir, job["output"])
+            frame_count = exporter.run(segment_output, start_frame=start_frame, end_frame=job["end_frame"],
+                                       replay=replay)
+        except BaseException:
+            release(job_dir, claimed_path)
+            raise
+        name = _segment_name(job["index"])
+        _write_json(os.path.join(job_dir, DONE_DIR, name + ".json"), dict(job, frames=frame_count))
+        os.remove(claimed_path)
+        done_count += 1
+        print(f"✅ Segmento {job['index'] + 1}/{farm['segment_count']}: {frame_count} frames")
+    if exporter is not None:
+        _close_exporter(exporter)
+    return done_count
+
+
+def _worker_main(job_dir):
+    work(job_dir)
+
+
+def _concat_videos(segment_paths, output):
+    """Junta vídeos com os mesmos parâmetros sem voltar a codificar (concat do ffmpeg)"""
+    list_path = output + ".segmentos.txt"
+    with open(list_path, "w") as file:
+        for path in segment_paths:
+            file.write(f"file '{os.path.abspath(path)}'\n")
+    try:
+        subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                        "-i", list_path, "-c", "copy", output], check=True)
+    finally:
+        os.remove(list_path)
+
+
+def stitch(job_dir):
+    """
+    Junta os segmentos por ordem na saída final. Os PNGs já têm o número global do
+    frame (first_frame do VideoEncoder), por isso só mudam de pasta
+    """
+    farm = _read_json(os.path.join(job_dir, FARM_FILE))
+    done_dir = os.path.join(job_dir, DONE_DIR)
+    job_list = [_read_json(os.path.join(done_dir, file_name))
+                for file_name in os.listdir(done_dir) if file_name.endswith(".json")]
+    job_list.sort(key=lambda job: job["index"])
+    missing = sorted(set(range(farm["segment_count"])) - {job["index"] for job in job_list})
+    if missing:
+        raise Exception(f"Faltam {len(missing)} segmentos: {missing}")
+    # Segmentos depois do fim do clip (as cenas acabaram mais cedo) ficam vazios
+    job_list = [job for job in job_list if job["frames"] > 0]
+    output = farm["output"]
+    segment_paths = [os.path.join(job_dir, job["output"]) for job in job_list]
+    if is_video(output):
+        _concat_videos(segment_paths, output)
+    else:
+        os.makedirs(output, exist_ok=True)
+        for path in segment_paths:
+            for file_name in sorted(os.listdir(path)):
+                os.replace(os.path.join(path, file_name), os.path.join(output, file_name))
+    frame_count = sum(job["frames"] for job in job_list)
+    print(f"🧵 {len(job_list)} segmentos juntados em {output}: {frame_count} frames "
+          f"({frame_count / farm['fps']:.1f}s)")
+    return frame_count
+
+
+def run_local(output, workers, fps=DEFAULT_FPS, size=DEFAULT_SIZE,
+              segment_seconds=DEFAULT_SEGMENT_SECONDS, job_dir=None, keep=False, replay=True):
+    """Planeia, renderiza com um grupo de processos locais e junta os segmentos"""
+    job_dir = job_dir or output.rstrip("/\\") + ".farm"
+    plan(job_dir, output, fps, size, segment_seconds, replay)
+    # spawn: cada worker cria o seu próprio contexto OpenGL
+    context = multiprocessing.get_context("spawn")
+    start = time.perf_counter()
+    process_list = [context.Process(target=_worker_main, args=(job_dir,)) for _ in range(workers)]
+    for process in process_list:
+        process.start()
+    for process in process_list:
+        process.join()
+    elapsed = time.perf_counter() - start
+    failed = [process.exitcode for process in process_list if process.exitcode != 0]
+    if failed:
+        raise Exception(f"{len(failed)} workers falharam (códigos {failed}); "
+                        f"os segmentos deles voltaram para {os.path.join(job_dir, PENDING_DIR)}")
+    frame_count = stitch(job_dir)
+    print(f"🏭 {workers} workers: {frame_count} frames em {elapsed:.1f}s ({frame_count / elapsed:.1f} FPS)")
+    if not keep:
+        shutil.rmtree(job_dir)
+    return frame_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta o clip em paralelo, por segmentos")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_plan_arguments(command):
+        command.add_argument("--fps", type=int, default=DEFAULT_FPS)
+        command.add_argument("--size", type=parse_size, default=DEFAULT_SIZE, help="LARGURAxALTURA")
+        command.add_argument("--segment", type=float, default=DEFAULT_SEGMENT_SECONDS,
+                             help="segundos de clip por segmento")
+        command.add_argument("--seek", dest="replay", action="store_false",
+                             help="salta para o início dos segmentos com seek em vez de avançar a lógica")
+
+    run_command = commands.add_parser("run", help="planeia, renderiza com processos locais e junta")
+    run_command.add_argument("output", help="ficheiro de vídeo (.mp4, .mkv, ...) ou pasta para PNGs")
+    run_command.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    run_command.add_argument("--jobs", default=None, help="pasta da fila (por omissão, <saída>.farm)")
+    run_command.add_argument("--keep", action="store_true", help="não apaga a pasta da fila no fim")
+    add_plan_arguments(run_command)
+    plan_command = commands.add_parser("plan", help="cria a fila de segmentos numa pasta partilhada")
+    plan_command.add_argument("jobs")
+    plan_command.add_argument("output", help="ficheiro de vídeo (.mp4, .mkv, ...) ou pasta para PNGs")
+    add_plan_arguments(plan_command)
+    for name, help_text in (("worker", "renderiza segmentos até a fila ficar vazia"),
+                            ("stitch", "junta os segmentos concluídos"),
+                            ("requeue", "devolve à fila os segmentos reservados")):
+        commands.add_parser(name, help=help_text).add_argument("jobs")
+    arguments = parser.parse_args()
+
+    if arguments.command == "run":
+        run_local(arguments.output, arguments.workers, arguments.fps, arguments.size,
+                  arguments.segment, arguments.jobs, arguments.keep, arguments.replay)
+    elif arguments.command == "plan":
+        plan(arguments.jobs, arguments.output, arguments.fps, arguments.size, arguments.segment,
+             arguments.replay)
+    elif arguments.command == "worker":
+        work(arguments.jobs)
+    elif arguments.command == "stitch":
+        stitch(arguments.jobs)
+    elif arguments.command == "requeue":
+        requeue(arguments.jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+import bisect
 import math
 import time
 import re
@@ -6,11 +7,16 @@ from core.base import Base
 from core_ext.camera import Camera
 from core_ext.renderer import Renderer
 from core_ext.scene import Scene
-from core.obj_reader import my_obj_reader
+from animation.asset_streamer import AssetDefinition, AssetStreamer
+from core_ext.mesh import Mesh
 from geometry.sala_musica import sala_musicaGeometry
 from geometry.quarto import quartoGeometry
 from geometry.cozinha import cozinhaGeometry
-from geometry.humano import humanoGeometry
+from core_ext.animation_clip import AnimationClip
+from core_ext.texture_cache import texture_cache
+from core.program_cache import program_cache
+from core.buffer_store import buffer_store
+from core.vertex_index import indexing_report
 from extras.movement_rig import MovementRig
 from animation.effects.audio import audio_manager
 from animation.effects.timeline import MusicTimeline
@@ -24,7 +30,25 @@ from animation.scenes.scene05_wakeup import WakeUpScene
 from animation.scenes.scene04_rally import RallyScene
 
 class SceneManager(Base):
-    
+
+    # ⏱️ Duração de cada parte do clip (tempo global)
+    INITIAL_TRANSITION = 5.0
+    SCENE_DURATIONS = [30.0, 25.0, 20.0, 30.0, 25.0]  # Durações das scenes na timeline musical
+    TRANSITION_DURATION = 5.0
+    SCENE_CLASSES = [MusicRoomScene, KitchenDinnerScene, BedroomScene, RallyScene, WakeUpScene]
+
+    @classmethod
+    def clip_duration(cls):
+        """
+        Duração real do clip completo, a mesma da tabela do seek: transição inicial,
+        cada cena com a duração que declara (get_duration) e as transições entre elas.
+        Os construtores das cenas não usam OpenGL, por isso não precisa de contexto
+        """
+        scene_durations = [scene_class(None, None, None, None).get_duration()
+                           for scene_class in cls.SCENE_CLASSES]
+        return (cls.INITIAL_TRANSITION + sum(scene_durations)
+                + cls.TRANSITION_DURATION * (len(scene_durations) - 1))
+
     def __init__(self, free_camera_mode=False, **kwargs):
         self.free_camera_mode = free_camera_mode
         self.is_moving_to_target = False
@@ -47,9 +71,14 @@ class SceneManager(Base):
         
         # 🌑 TRANSIÇÃO INICIAL
         self.initial_transition_active = True
-        self.initial_transition_duration = 5.0
+        self.initial_transition_duration = self.INITIAL_TRANSITION
         self.initial_transition_timer = 0.0
 
+        # 🏁 Todas as cenas terminaram (a exportação de vídeo pára aqui)
+        self.clip_finished = False
+        # ⏩ Sem render: avança só a lógica (ex.: um worker a chegar ao início do seu segmento)
+        self.render_enabled = True
+
         super().__init__(**kwargs)
 
     def extract_number(self,filename):
@@ -88,126 +117,20 @@ class SceneManager(Base):
         
         self.renderer = Renderer([0.1, 0.1, 0.1])
         self.scene = Scene()
-        self.camera = Camera(aspect_ratio=800 / 600)
+        # Proporção da janela (ou da imagem headless)
+        width, height = self.context.size
+        self.camera = Camera(aspect_ratio=width / height)
 
         print("🏠 Carregando objetos...")
 
-        # 🎼 Sala musical
-        self.sala_musica = sala_musicaGeometry(0.1, 0.1, 0.1, my_obj_reader("scenes/music_scene/salamusica.obj"))
-        #self.scene.add(self.sala_musica)
-        print("✅ Sala de música carregada")
-
-        # 🛏️ Cena do quarto
-        self.quarto = quartoGeometry(0.1, 0.1, 0.1, my_obj_reader("scenes/bedroom_scene/quarto.obj"))
-        #self.quarto.set_position([7, 0, 0])
-        # self.scene.add(self.quarto)
-        print("✅ Quarto carregado")
-
-        # 🍽️ Cena da cozinha
-        self.cozinha = cozinhaGeometry(0.1, my_obj_reader("scenes/kitchen_scene/cozinha.obj"))
-        #self.cozinha.set_position([14, 0, 0])
-        # self.scene.add(self.cozinha)
-        print("✅ Cozinha carregada")
-
-        # Carregar frames das animações
-        self.andar_frames = []
-        self.olhar_frames = []
-        self.levantar_frames = []
-        self.dormir_frames = []
-        self.acordar_frames = []
-
-        
-        # Carrega animação de andar 
-        try:
-            andar_path = "scenes/human_body/andar"
-            andar_files = [f for f in os.listdir(andar_path) if f.endswith('.obj')]
-            andar_files = sorted(andar_files, key=self.extract_number)  # ← ORDENAÇÃO CORRETA
-            
-            print(f"🚶 Arquivos de andar encontrados: {andar_files}")
-            
-            for i, file in enumerate(andar_files):
-                obj_data = my_obj_reader(os.path.join(andar_path, file))
-                frame = humanoGeometry(obj_data, mtl_path="scenes/human_body/andar/humano_andar_1.mtl")
-                self.andar_frames.append(frame)
-                
-            print(f"✅ Carregados {len(self.andar_frames)} frames de andar")
-        except Exception as e:
-            print(f"❌ Erro ao carregar frames de andar: {e}")
-
-
-        # Carrega animação parada
-        try:
-            olhar_path = "scenes/human_body/olhar"
-            olhar_files = [f for f in os.listdir(olhar_path) if f.endswith('.obj')]
-            olhar_files = sorted(olhar_files, key=self.extract_number)  # ← ORDENAÇÃO CORRETA
-            
-            print(f"👀 Arquivos de olhar encontrados: {olhar_files}")
-            
-            for i, file in enumerate(olhar_files):
-                obj_data = my_obj_reader(os.path.join(olhar_path, file))
-                frame = humanoGeometry(obj_data, mtl_path="scenes/human_body/olhar/humano_olhar_1.mtl")
-                self.olhar_frames.append(frame)
-                
-            print(f"✅ Carregados {len(self.olhar_frames)} frames de olhar")
-        except Exception as e:
-            print(f"❌ Erro ao carregar frames de olhar: {e}")
-
-        # Carrega animação de levantar
-        try:
-            levantar_path = "scenes/human_body/sitStand"
-            levantar_files = [f for f in os.listdir(levantar_path) if f.endswith('.obj')]
-            levantar_files = sorted(levantar_files, key=self.extract_number)  # ← ORDENAÇÃO CORRETA
-            
-            print(f"🪑 Arquivos de levantar encontrados: {levantar_files}")
-            
-            for i, file in enumerate(levantar_files):
-                obj_data = my_obj_reader(os.path.join(levantar_path, file))
-                frame = humanoGeometry(obj_data, mtl_path="scenes/human_body/sitStand/humano_levantar_1.mtl")
-                self.levantar_frames.append(frame)
-                
-            print(f"✅ Carregados {len(self.levantar_frames)} frames de levantar")
-        except Exception as e:
-            print(f"❌ Erro ao carregar frames de levantar: {e}")
-
-        # Carrega animação de dormir
-        try:
-            dormir_path = "scenes/human_body/dormir"
-            dormir_files = [f for f in os.listdir(dormir_path) if f.endswith('.obj')]
-            dormir_files = sorted(dormir_files, key=self.extract_number)  # ← ORDENAÇÃO CORRETA
-            
-            print(f"😴 Arquivos de dormir encontrados: {dormir_files}")
-            
-            for i, file in enumerate(dormir_files):
-                obj_data = my_obj_reader(os.path.join(dormir_path, file))
-                frame = humanoGeometry(obj_data, mtl_path="scenes/human_body/dormir/humano_dormir_1.mtl")
-                self.dormir_frames.append(frame)
-                
-            print(f"✅ Carregados {len(self.dormir_frames)} frames de dormir")
-        except Exception as e:
-            print(f"❌ Erro ao carregar frames de dormir: {e}")
-
-        # Carrega animação de acordar
-        try:
-            acordar_path = "scenes/human_body/acordar"
-            acordar_files = [f for f in os.listdir(acordar_path) if f.endswith('.obj')]
-            acordar_files = sorted(acordar_files, key=self.extract_number)  # ← ORDENAÇÃO CORRETA
-            
-            print(f"🌅 Arquivos de acordar encontrados: {acordar_files}")
-            
-            # 🔍 DEBUG: Mostra ordem de carregamento
-            print(f"🔍 DEBUG - Ordem de carregamento dos frames de acordar:")
-            for i, filename in enumerate(acordar_files[:5]):  # Mostra só os 5 primeiros
-                number = self.extract_number(filename)
-                print(f"   Frame {i}: {filename} (número extraído: {number})")
-            
-            for i, file in enumerate(acordar_files):
-                obj_data = my_obj_reader(os.path.join(acordar_path, file))
-                frame = humanoGeometry(obj_data, mtl_path="scenes/human_body/acordar/humano_acordar_1.mtl")
-                self.acordar_frames.append(frame)
-                
-            print(f"✅ Carregados {len(self.acordar_frames)} frames de acordar")
-        except Exception as e:
-            print(f"❌ Erro ao carregar frames de acordar: {e}")
+        # 📦 Os assets são carregados por cena, a pedido: cada cena declara em ASSETS
+        # o que usa e os assets da próxima cena são carregados durante a transição
+        self.asset_streamer = AssetStreamer(self._asset_definitions(),
+                                            progress_callback=self._on_asset_progress)
+        # Tempo máximo de upload por frame durante as transições (segundos)
+        self.asset_upload_budget = 0.008
+        for name, definition in self.asset_streamer.definitions.items():
+            setattr(self, name, definition.empty)
 
         self.current_frame = 0
         self.frame_count = 0
@@ -248,27 +171,156 @@ class SceneManager(Base):
             print("📷 Controles de câmera livre:")
             print("   WASD: mover, QE: rodar, RF: olhar cima/baixo")
             print("   SPACE: subir, SHIFT: descer")
+            print("   P: identificar o objeto na mira")
         else:
             # Modo automático: câmera será controlada pelas cenas
             self.camera_rig = None
             print("📷 Modo automático - câmera será controlada pelas cenas")
 
         # Lista de cenas
-        self.scenes = [
-            MusicRoomScene(self.scene, self.camera, self.renderer, self),
-            KitchenDinnerScene(self.scene, self.camera, self.renderer, self),
-            BedroomScene(self.scene, self.camera, self.renderer, self),
-            RallyScene(self.scene, self.camera, self.renderer, self),
-            WakeUpScene(self.scene, self.camera, self.renderer, self),
-        ]
+        self.scenes = [scene_class(self.scene, self.camera, self.renderer, self)
+                       for scene_class in self.SCENE_CLASSES]
         
         self.current_scene_index = 0
         self.current_scene = None
+        self._build_seek_table()
         
         # Inicia primeira cena
         print("🌑 Iniciando transição inicial de 5 segundos...")
         self._start_initial_transition()
 
+    def _room_images(self, images_path):
+        """Imagens de uma sala, para serem descodificadas em paralelo"""
+        try:
+            return [os.path.join(images_path, f) for f in sorted(os.listdir(images_path))
+                    if f.lower().endswith((".jpg", ".jpeg", ".png"))]
+        except OSError:
+            return []
+
+    def _asset_definitions(self):
+        """Assets que as cenas podem pedir (nomes iguais aos atributos do SceneManager)"""
+        return {
+            # 🎼 Sala musical
+            "sala_musica": self._room_asset(
+                lambda obj_data: sala_musicaGeometry(0.1, 0.1, 0.1, obj_data),
+                "scenes/music_scene/salamusica.obj", "images/music_scene", "sala_musica"),
+            # 🍽️ Cena da cozinha
+            "cozinha": self._room_asset(
+                lambda obj_data: cozinhaGeometry(0.1, obj_data),
+                "scenes/kitchen_scene/cozinha.obj", "images/kitchen_scene", "cozinha"),
+            # 🛏️ Cena do quarto
+            "quarto": self._room_asset(
+                lambda obj_data: quartoGeometry(0.1, 0.1, 0.1, obj_data),
+                "scenes/bedroom_scene/quarto.obj", "images/bedroom_scene", "quarto"),
+            # Frames das animações do humano
+            "andar_frames": self._frames_asset(
+                "🚶", "andar", "scenes/human_body/andar", "humano_andar_1.mtl"),
+            "olhar_frames": self._frames_asset(
+                "👀", "olhar", "scenes/human_body/olhar", "humano_olhar_1.mtl"),
+            "levantar_frames": self._frames_asset(
+                "🪑", "levantar", "scenes/human_body/sitStand", "humano_levantar_1.mtl"),
+            "dormir_frames": self._frames_asset(
+                "😴", "dormir", "scenes/human_body/dormir", "humano_dormir_1.mtl"),
+            "acordar_frames": self._frames_asset(
+                "🌅", "acordar", "scenes/human_body/acordar", "humano_acordar_1.mtl"),
+        }
+
+    def _room_asset(self, builder, obj_path, images_path, texture_scope):
+        """Sala: um OBJ + as imagens da sala; as texturas ficam no scope da sala"""
+        def register(loader):
+            loader.add(texture_scope, lambda obj_data, _: builder(obj_data),
+                       obj_path=obj_path, images=self._room_images(images_path))
+            def assemble(results):
+                room = results[texture_scope]
+                if room is not None:
+                    indexing_report(texture_scope, [mesh.geometry for mesh in room.get_descendants_by_type(Mesh)])
+                return room
+            return assemble
+
+        def release(room):
+            if room is not None:
+                self._delete_meshes(room)
+            deleted = texture_cache.release_scope(texture_scope)
+            print(f"🖼️ Texturas de '{texture_scope}' libertadas: {deleted}")
+
+        return AssetDefinition(register, release)
+
+    def _frames_asset(self, icon, set_name, frames_path, mtl_file):
+        """Animação do humano: um OBJ por frame, todos com as cores do mesmo .mtl, num só AnimationClip"""
+        def register(loader):
+            try:
+                frame_files = [f for f in os.listdir(frames_path) if f.endswith('.obj')]
+            except OSError as e:
+                print(f"❌ Erro ao carregar frames de {set_name}: {e}")
+                frame_files = []
+            frame_files = sorted(frame_files, key=self.extract_number)  # ← ORDENAÇÃO CORRETA
+            print(f"{icon} Arquivos de {set_name} encontrados: {frame_files}")
+
+            mtl_path = os.path.join(frames_path, mtl_file)
+            frame_names = []
+            for file in frame_files:
+                name = f"{set_name}/{file}"
+                # Os frames só são enviados para a GPU juntos, no AnimationClip
+                loader.add(name,
+                           lambda obj_data, mtl_colors: (obj_data, mtl_colors),
+                           obj_path=os.path.join(frames_path, file),
+                           mtl_path=mtl_path)
+                frame_names.append(name)
+
+            def assemble(results):
+                # Frames que falharam são ignorados
+                frames = [results[name] for name in frame_names if results[name] is not None]
+                if not frames:
+                    print(f"❌ Nenhum frame de {set_name} carregado")
+                    return None
+                clip = AnimationClip([obj_data for obj_data, _ in frames], mtl_colors=frames[0][1])
+                print(f"✅ Carregados {len(clip)} frames de {set_name}")
+                clip.report(set_name)
+                return clip
+            return assemble
+
+        def release(clip):
+            if clip is not None:
+                clip.delete()
+
+        return AssetDefinition(register, release)
+
+    def _delete_meshes(self, root):
+        for obj in root.descendant_list:
+            if isinstance(obj, Mesh):
+                obj.delete()
+
+    def _prefetch_scene_assets(self, scene_index):
+        """Liberta o que a próxima cena não usa e começa a carregar o que ela usa"""
+        manifest = self.scenes[scene_index].ASSETS
+        # Tira do grafo de cena o que vai ser libertado: o renderer não pode desenhar meshes apagadas
+        for name in self.asset_streamer.resident:
+            asset = getattr(self, name, None)
+            if name not in manifest and getattr(asset, "parent", None) is not None:
+                asset.parent.remove(asset)
+        for name in self.asset_streamer.evict(keep=manifest):
+            setattr(self, name, self.asset_streamer.definitions[name].empty)
+        self.asset_streamer.prefetch(manifest)
+
+    def _acquire_scene_assets(self, scene_index):
+        """Publica no SceneManager os assets da cena (termina o carregamento se preciso)"""
+        manifest = self.scenes[scene_index].ASSETS
+        for name, asset in self.asset_streamer.acquire(manifest).items():
+            setattr(self, name, asset)
+        if manifest:
+            texture_cache.report()
+            program_cache.report()
+            buffer_store.report()
+            self.asset_streamer.report()
+
+    def _on_asset_progress(self, name, stage, done, total):
+        """Mostra o progresso do carregamento a cada 10% (e nas salas)"""
+        if stage != "upload":
+            return
+        step = max(1, total // 10)
+        if "/" not in name or done % step == 0 or done == total:
+            print(f"⏳ [{done}/{total}] {name}")
+
     def _setup_global_music_timeline(self):
         """Configura timeline musical para toda a animação"""
         
@@ -315,6 +367,9 @@ class SceneManager(Base):
         self.initial_transition_timer = 0.0
         self.initial_transition_active = True
         
+        # 📦 Carrega os assets da primeira cena durante a tela preta
+        self._prefetch_scene_assets(0)
+
         print("🌑 Transição inicial configurada - 5s de tela preta")
 
     def _clean_scene_completely(self):
@@ -346,7 +401,9 @@ class SceneManager(Base):
                 self._direct_scene_change(index)
         else:
             print("🎭 Todas as cenas concluídas!")
+            self.asset_streamer.shutdown()
             self.running = False
+            self.clip_finished = True
     
     def _start_scene_with_transition(self, next_index):
         current_scene_type = self._get_scene_type(self.current_scene_index)
@@ -372,6 +429,9 @@ class SceneManager(Base):
             transition_config["duration"]
         )
         
+        # 📦 Carrega os assets da próxima cena durante a transição
+        self._prefetch_scene_assets(next_index)
+
         # Agenda mudança de cena para quando transição terminar
         self.pending_scene_change = next_index
 
@@ -399,6 +459,7 @@ class SceneManager(Base):
         
         self.current_scene_index = index
         self.current_scene = self.scenes[index]
+        self._acquire_scene_assets(index)
         self.current_scene.initialize()
         
         # 🔧 VERIFICA SE SCENE_NAME EXISTE
@@ -433,6 +494,9 @@ class SceneManager(Base):
         # Atualiza câmera livre se estiver no modo livre
         if self.free_camera_mode and self.camera_rig:
             self.camera_rig.update(self.input, self.delta_time)
+            # 🎯 OBJETO NA MIRA (tecla P)
+            if self.input.is_key_down("p"):
+                self.pick_object()
         
         # 🚶 ATUALIZA MOVIMENTO INTERPOLADO
         self.update_movement(self.delta_time)
@@ -466,6 +530,8 @@ class SceneManager(Base):
                 print("🚶 Controles desabilitados durante movimento automático")
 
         if self.transitions.is_active():
+            # 📦 Uploads da próxima cena aos poucos, durante a tela preta
+            self.asset_streamer.update(self.asset_upload_budget)
             transition_finished = self.transitions.update(self.delta_time)
             
             # Se transição terminou e há cena pendente
@@ -486,18 +552,19 @@ class SceneManager(Base):
                     self.start_scene(next_index)
                 else:
                     print("🎭 Todas as cenas concluídas!")
+                    self.asset_streamer.shutdown()
                     self.running = False
+                    self.clip_finished = True
         
         # Renderiza
-        self.renderer.render(self.scene, self.camera)
+        if self.render_enabled:
+            self.renderer.render(self.scene, self.camera)
 
     def _calculate_global_timeline(self):
         """Calcula tempo global da animação baseado nas cenas"""
-        
-        # Duração de cada parte
-        INITIAL_TRANSITION = 5.0
-        SCENE_DURATIONS = [30.0, 25.0, 20.0, 30.0, 25.0]  # Durações das scenes
-        TRANSITION_DURATION = 5.0
+        INITIAL_TRANSITION = self.INITIAL_TRANSITION
+        SCENE_DURATIONS = self.SCENE_DURATIONS
+        TRANSITION_DURATION = self.TRANSITION_DURATION
         
         global_time = 0.0
         
@@ -521,10 +588,115 @@ class SceneManager(Base):
         
         return global_time
 
+    def _build_seek_table(self):
+        """
+        Início de cada parte do clip, em segundos de clip (o tempo que passa na
+        exportação): transição inicial, cada cena com a sua duração real e as
+        transições entre elas. O seek encontra a parte por pesquisa binária
+        """
+        self.scene_durations = [scene.get_duration() for scene in self.scenes]
+        self.seek_parts = []  # (início, tipo, índice da cena)
+        start = 0.0
+        self.seek_parts.append((start, "initial", 0))
+        start += self.INITIAL_TRANSITION
+        for index, duration in enumerate(self.scene_durations):
+            if index > 0:
+                # A transição leva o índice da cena que vem a seguir
+                self.seek_parts.append((start, "transition", index))
+                start += self.TRANSITION_DURATION
+            self.seek_parts.append((start, "scene", index))
+            start += duration
+        self.seek_starts = [part[0] for part in self.seek_parts]
+        self.clip_length = start
+
+    def _reset_scene(self, index):
+        """Cena nova no estado inicial (o seek não reaproveita o estado de antes)"""
+        scene = self.scenes[index]
+        self.scenes[index] = type(scene)(self.scene, self.camera, self.renderer, self)
+        return self.scenes[index]
+
+    def seek(self, global_time):
+        """
+        Salta para global_time (segundos de clip) sem reproduzir o que vem antes:
+        escolhe a parte do clip pela tabela de inícios, carrega os assets da cena e
+        a cena calcula o waypoint, a posição do humano, o frame da animação e a
+        câmera desse instante. A música salta para a entrada da timeline musical.
+        Devolve (tipo da parte, índice da cena, tempo dentro da parte)
+        """
+        global_time = min(max(0.0, global_time), self.clip_length)
+        part_index = max(0, bisect.bisect_right(self.seek_starts, global_time) - 1)
+        part_start, kind, index = self.seek_parts[part_index]
+        local_time = global_time - part_start
+        print(f"⏩ SEEK para {global_time:.2f}s: {kind} {index + 1} (+{local_time:.2f}s)")
+
+        # 🧹 Esquece o estado atual
+        self.stop_movement()
+        self.transitions.transition_active = False
+        self.pending_scene_change = None
+        self._clean_scene_completely()
+        self.humano = None
+        self.human_scene_reference = None
+        self.clip_finished = False
+        self.time = global_time
+
+        if kind == "initial":
+            self.current_scene_index = 0
+            self.current_scene = None
+            self.initial_transition_active = True
+            self.initial_transition_timer = local_time
+            self._prefetch_scene_assets(0)
+        elif kind == "transition":
+            # A cena anterior acabou: conta a duração inteira no tempo global da música
+            self.initial_transition_active = False
+            self.current_scene_index = index - 1
+            self.current_scene = self._reset_scene(index - 1)
+            self.current_scene.manual_timeline = self.scene_durations[index - 1]
+            self.current_scene.is_finished = True
+            self.transitions.seek(local_time)
+            self._prefetch_scene_assets(index)
+            self.pending_scene_change = index
+        else:
+            self.initial_transition_active = False
+            self._reset_scene(index)
+            self._prefetch_scene_assets(index)
+            self._direct_scene_change(index)
+            self.current_scene.seek(local_time)
+            self.transitions.scene_cleaned = False
+
+        # 🌑 Cor de fundo que a reprodução normal teria nesse instante (a da
+        # transição entre cenas é posta pelo transitions.seek)
+        if kind != "transition" and hasattr(self.renderer, 'background_color'):
+            if kind == "initial" or index == 0:
+                # A transição inicial põe o fundo preto e a Scene01 mantém-no
+                self.renderer.background_color = [0.0, 0.0, 0.0]
+            else:
+                # Cor que o SceneTransitions._finish_transition restaura
+                self.renderer.background_color = [0.1, 0.1, 0.1]
+
+        # 🎵 Música da entrada da timeline desse instante
+        if self.initial_transition_active:
+            if self.music_timeline.timeline_active:
+                self.music_timeline.stop_timeline()
+        else:
+            self.music_timeline.seek(self._calculate_global_timeline())
+        return kind, index, local_time
+
+    def seek_movement(self, start_position, start_rotation, target_position, target_rotation,
+                      duration, elapsed, auto_face_while_moving=False):
+        """Movimento suave (start_movement_to) já com elapsed segundos decorridos"""
+        self.current_human_position = list(start_position)
+        self.current_human_rotation = start_rotation
+        if not self.start_movement_to(target_position, target_rotation, duration,
+                                      auto_face_while_moving=auto_face_while_moving):
+            return
+        self.movement_progress = min(1.0, elapsed / duration)
+        self._apply_movement(self.movement_progress)
+
     def _update_initial_transition(self):
         """Atualiza transição inicial de 5s"""
         delta_time = self.delta_time
         self.initial_transition_timer += delta_time
+        self.asset_streamer.update(self.asset_upload_budget)
         
         # Debug a cada segundo
         current_second = int(self.initial_transition_timer)
@@ -974,6 +1146,34 @@ class SceneManager(Base):
         print("   🔄 BACKSPACE: Reset")
         print("   🔀 TAB: Desativar")
     
+    def pick_object(self):
+        """
+        Lança um raio do centro da câmera para a frente e mostra o objeto mais próximo
+        atingido (pelas caixas da BVH do renderer). Ignora as caixas onde a câmera está,
+        como a da sala à volta dela.
+        """
+        bvh = self.renderer.get_bvh(self.scene)
+        camera_matrix = self.camera.global_matrix
+        origin = camera_matrix[0:3, 3]
+        # A câmera olha para -Z local
+        direction = -camera_matrix[0:3, 2]
+        direction = direction / max(math.sqrt(float(direction @ direction)), 1e-12)
+        hits = [(distance, mesh) for distance, mesh in bvh.query_ray(origin, direction)
+                if distance > 0 and mesh.visible]
+        if not hits:
+            print("🎯 Nenhum objeto na mira")
+            return None
+        distance, mesh = hits[0]
+        # Objeto de topo (filho direto da cena) a que a mesh pertence
+        node = mesh
+        while node.parent is not None and node.parent is not self.scene:
+            node = node.parent
+        box_min, box_max = bvh.world_box(mesh)
+        print(f"🎯 {type(node).__name__} a {distance:.2f} m "
+              f"(caixa [{box_min[0]:.2f}, {box_min[1]:.2f}, {box_min[2]:.2f}] a "
+              f"[{box_max[0]:.2f}, {box_max[1]:.2f}, {box_max[2]:.2f}])")
+        return mesh
+
     def debug_human_reference(self):
         """Debug para verificar se humano está sincronizado"""
         if self.humano:
@@ -1128,44 +1328,45 @@ class SceneManager(Base):
                 self.movement_callback = None
             
         else:
-            # 🔄 INTERPOLAÇÃO BIFÁSICA
-            progress = self.movement_progress
-            
-            # 📍 POSIÇÃO (sempre linear)
-            for i in range(3):
-                self.current_human_position[i] = (
-                    self.movement_start_pos[i] + 
-                    (self.movement_target_pos[i] - self.movement_start_pos[i]) * progress
-                )
-            
-            # 🧭 ROTAÇÃO BIFÁSICA
-            if hasattr(self, 'auto_face_while_moving') and self.auto_face_while_moving:
-                # FASE 1 (0-80%): Vira para direção do movimento e anda
-                if progress < 0.8:
-                    # Rotação para direção do movimento
-                    rot_progress = progress / 0.8  # Normaliza para 0-1 na primeira fase
-                    rot_diff = self._calculate_rotation_difference(self.movement_start_rot, self.movement_auto_rotation)
-                    self.current_human_rotation = self.movement_start_rot + (rot_diff * rot_progress)
-                
-                # FASE 2 (80-100%): Anda e vira para rotação final
-                else:
-                    # Rotação para orientação final
-                    rot_progress = (progress - 0.8) / 0.2  # Normaliza para 0-1 na segunda fase
-                    rot_diff = self._calculate_rotation_difference(self.movement_auto_rotation, self.movement_target_rot)
-                    self.current_human_rotation = self.movement_auto_rotation + (rot_diff * rot_progress)
+            self._apply_movement(self.movement_progress)
+
+    def _apply_movement(self, progress):
+        """Posição e rotação do humano a meio do movimento (progress entre 0 e 1)"""
+        # 📍 POSIÇÃO (sempre linear)
+        for i in range(3):
+            self.current_human_position[i] = (
+                self.movement_start_pos[i] + 
+                (self.movement_target_pos[i] - self.movement_start_pos[i]) * progress
+            )
+        
+        # 🧭 ROTAÇÃO BIFÁSICA
+        if hasattr(self, 'auto_face_while_moving') and self.auto_face_while_moving:
+            # FASE 1 (0-80%): Vira para direção do movimento e anda
+            if progress < 0.8:
+                # Rotação para direção do movimento
+                rot_progress = progress / 0.8  # Normaliza para 0-1 na primeira fase
+                rot_diff = self._calculate_rotation_difference(self.movement_start_rot, self.movement_auto_rotation)
+                self.current_human_rotation = self.movement_start_rot + (rot_diff * rot_progress)
+        
+            # FASE 2 (80-100%): Anda e vira para rotação final
             else:
-                # Rotação linear tradicional
-                rot_diff = self._calculate_rotation_difference(self.movement_start_rot, self.movement_target_rot)
-                self.current_human_rotation = self.movement_start_rot + (rot_diff * progress)
-            
-            # Normaliza rotação final
-            import math
-            while self.current_human_rotation > math.pi:
-                self.current_human_rotation -= 2 * math.pi
-            while self.current_human_rotation < -math.pi:
-                self.current_human_rotation += 2 * math.pi
-            
-            self._update_human_transform()
+                # Rotação para orientação final
+                rot_progress = (progress - 0.8) / 0.2  # Normaliza para 0-1 na segunda fase
+                rot_diff = self._calculate_rotation_difference(self.movement_auto_rotation, self.movement_target_rot)
+                self.current_human_rotation = self.movement_auto_rotation + (rot_diff * rot_progress)
+        else:
+            # Rotação linear tradicional
+            rot_diff = self._calculate_rotation_difference(self.movement_start_rot, self.movement_target_rot)
+            self.current_human_rotation = self.movement_start_rot + (rot_diff * progress)
+        
+        # Normaliza rotação final
+        import math
+        while self.current_human_rotation > math.pi:
+            self.current_human_rotation -= 2 * math.pi
+        while self.current_human_rotation < -math.pi:
+            self.current_human_rotation += 2 * math.pi
+        
+        self._update_human_transform()
 
     def _calculate_distance(self, pos1, pos2):
         """Calcula distância euclidiana entre duas posições"""
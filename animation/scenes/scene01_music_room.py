@@ -2,6 +2,7 @@ import math
 from animation.base_scene import BaseScene
 
 class MusicRoomScene(BaseScene):
+    ASSETS = ["sala_musica", "levantar_frames", "andar_frames", "olhar_frames"]
     
     def __init__(self, scene, camera, renderer, scene_manager):
         super().__init__(scene, camera, renderer)
@@ -14,7 +15,12 @@ class MusicRoomScene(BaseScene):
         # 🎭 SISTEMA DE ESTADOS DE ANIMAÇÃO
         self.animation_state = "WAITING"
         self.frame_index = 0
-        self.frame_count = 0
+        # Tempo desde a última troca de frame (a animação avança pelo tempo, não por ticks)
+        self.frame_time = 0.0
+        # Duração de cada frame das animações (s)
+        self.levantar_frame_duration = 10 / 60
+        self.andar_frame_duration = 6 / 60
+        self.olhar_frame_duration = 8 / 60
 
         # 🗺️ SISTEMA DE WAYPOINTS - PERCURSO DO HUMANO
         self.waypoints = [
@@ -170,6 +176,20 @@ class MusicRoomScene(BaseScene):
         self.camera_keyframe_start_time = 0
         self.camera_system_active = False
 
+        # ⏱️ TABELAS DE TEMPOS ACUMULADOS (seek por pesquisa binária)
+        self._build_time_tables()
+
+    def _build_time_tables(self):
+        """Início de cada waypoint, keyframe de câmera e animação, em tempo da cena"""
+        self.waypoint_starts = self.cumulative_starts(self.waypoints)
+        self.camera_keyframe_starts = self.cumulative_starts(self.camera_keyframes)
+        # Waypoints seguidos com a mesma animação não a reiniciam: os frames contam desde o primeiro
+        self.animation_starts = []
+        for index, waypoint in enumerate(self.waypoints):
+            if index > 0 and waypoint["animation"] == self.waypoints[index - 1]["animation"]:
+                self.animation_starts.append(self.animation_starts[-1])
+            else:
+                self.animation_starts.append(self.waypoint_starts[index])
         
     def get_duration(self):
         total_duration = sum(waypoint["duration"] for waypoint in self.waypoints)
@@ -189,7 +209,7 @@ class MusicRoomScene(BaseScene):
         
         # 🎭 ADICIONAR HUMANO (primeiro frame de levantar)
         if hasattr(self.scene_manager, 'levantar_frames') and self.scene_manager.levantar_frames:
-            self.scene_manager.humano = self.scene_manager.levantar_frames[0]
+            self.scene_manager.humano = self.scene_manager.levantar_frames.show_frame(0)
             
             # 🧪 POSIÇÃO INICIAL
             initial_position = [1.7, 0.09, 0.5]
@@ -281,6 +301,7 @@ class MusicRoomScene(BaseScene):
                          not self.scene_manager.free_camera_mode)
         
         if should_animate:
+            self.frame_time += delta_time * self.time_scale
             self._update_animation_state()
 
         if self.manual_timeline > 20.0 and not hasattr(self, 'played_applause'):
@@ -300,6 +321,81 @@ class MusicRoomScene(BaseScene):
             else:
                 print(f"⏰ {int(self.manual_timeline)}s - {status}")
 
+    def seek(self, scene_time):
+        """Estado da cena no instante scene_time, pelas tabelas de tempos (sem reproduzir)"""
+        self.manual_timeline = scene_time
+        index, time_in_waypoint = self.lookup(self.waypoint_starts, scene_time)
+        self.current_waypoint_index = index
+        self.waypoint_start_time = self.waypoint_starts[index]
+        self.in_transition = False
+        if scene_time > 20.0:
+            self.played_applause = True  # Os aplausos já passaram
+        
+        # 🚶 Humano primeiro: a troca de frame e a câmera usam a posição dele
+        self._seek_human(index, time_in_waypoint)
+        self._seek_animation(index, scene_time)
+        
+        if not self.scene_manager.free_camera_mode:
+            camera_index, time_in_keyframe = self.lookup(self.camera_keyframe_starts, scene_time)
+            self.camera_system_active = True
+            self.current_camera_keyframe = camera_index
+            self.camera_keyframe_start_time = self.camera_keyframe_starts[camera_index]
+            self._update_current_camera_keyframe(time_in_keyframe)
+
+    def _seek_human(self, index, time_in_waypoint):
+        """Posição e rotação do humano: a meio do movimento suave ou no waypoint"""
+        waypoint = self.waypoints[index]
+        if waypoint.get("movement_type") == "smooth" and index > 0:
+            previous = self.waypoints[index - 1]
+            self.scene_manager.seek_movement(
+                previous["position"], previous["rotation"],
+                waypoint["position"], waypoint["rotation"],
+                waypoint["duration"], time_in_waypoint,
+                auto_face_while_moving=waypoint.get("auto_face_while_moving", False)
+            )
+        else:
+            self._move_to_waypoint(waypoint)
+
+    def _seek_animation(self, index, scene_time):
+        """Frame da animação do waypoint, contado desde o início dessa animação"""
+        animation = self.waypoints[index]["animation"]
+        self.animation_state = animation
+        animation_time = scene_time - self.animation_starts[index]
+        if hasattr(self, 'animation_phase_started'):
+            delattr(self, 'animation_phase_started')
+        
+        if animation == "STANDING":
+            frames_attr, frame_duration, loop = 'levantar_frames', self.levantar_frame_duration, False
+            # 6s parado no frame 0 antes de levantar (ver _animate_standing)
+            animation_time -= 6.0
+            if animation_time < 0:
+                self.frame_index = 0
+                self.frame_time = 0.0
+                self._switch_to_frame(frames_attr, 0)
+                return
+            self.animation_phase_started = True
+        elif animation == "WALKING":
+            frames_attr, frame_duration, loop = 'andar_frames', self.andar_frame_duration, True
+        else:
+            frames_attr, frame_duration, loop = 'olhar_frames', self.olhar_frame_duration, True
+        
+        frames = getattr(self.scene_manager, frames_attr, None)
+        if not frames:
+            return
+        switch_count = int(animation_time // frame_duration)
+        self.frame_time = animation_time - switch_count * frame_duration
+        if loop:
+            # frame_index aponta para o próximo frame do loop
+            self.frame_index = switch_count
+            shown_frame = (switch_count - 1) % len(frames) if switch_count > 0 else 0
+            next_frame = switch_count % len(frames)
+        else:
+            self.frame_index = min(switch_count, len(frames) - 1)
+            shown_frame = self.frame_index
+            next_frame = min(self.frame_index + 1, len(frames) - 1)
+        self._switch_to_frame(frames_attr, shown_frame)
+        self._blend_to_next_frame(frames_attr, next_frame, frame_duration)
+
     def _get_current_status(self):
         """Retorna status atual baseado no waypoint e estado"""
         waypoint_info = self.get_current_waypoint_info()
@@ -374,6 +470,8 @@ class MusicRoomScene(BaseScene):
                 self.frame_index = 0
                 self._switch_to_frame('levantar_frames', 0)
                 print("📍 STANDING: Esperando 5s no frame 0...")
+            # O tempo dos frames só conta a partir da fase 2
+            self.frame_time = 0.0
             return  # Para aqui, não faz mais nada
         
         # 🔧 FASE 2: Após 5s, continua animação
@@ -381,11 +479,8 @@ class MusicRoomScene(BaseScene):
             self.animation_phase_started = True
             print("🎬 Iniciando fase de animação após 5s...")
         
-        self.frame_count += 1
-        frame_speed = 10
-        
-        if self.frame_count >= frame_speed:
-            self.frame_count = 0
+        while self.frame_time >= self.levantar_frame_duration:
+            self.frame_time -= self.levantar_frame_duration
             
             if self.frame_index < len(self.scene_manager.levantar_frames) - 1:
                 self.frame_index += 1
@@ -393,6 +488,9 @@ class MusicRoomScene(BaseScene):
                 print(f"📽️ Levantar Frame {self.frame_index + 1}/{len(self.scene_manager.levantar_frames)}")
             else:
                 print("✅ Animação de levantar concluída!")
+        
+        next_frame = min(self.frame_index + 1, len(self.scene_manager.levantar_frames) - 1)
+        self._blend_to_next_frame('levantar_frames', next_frame, self.levantar_frame_duration)
 
     def _animate_walking(self):
         """Estado 3: Loop infinito de andar"""
@@ -402,11 +500,8 @@ class MusicRoomScene(BaseScene):
             self.animation_state = "IDLE"
             return
         
-        self.frame_count += 1
-        frame_speed = 6  # Velocidade do andar
-        
-        if self.frame_count >= frame_speed:
-            self.frame_count = 0
+        while self.frame_time >= self.andar_frame_duration:
+            self.frame_time -= self.andar_frame_duration
             
             # Loop infinito dos frames de andar
             current_frame = self.frame_index % len(self.scene_manager.andar_frames)
@@ -414,6 +509,10 @@ class MusicRoomScene(BaseScene):
             print(f"🚶 Andar Frame {current_frame + 1}/{len(self.scene_manager.andar_frames)}")
             
             self.frame_index += 1
+        
+        # frame_index já aponta para o próximo frame do loop
+        next_frame = self.frame_index % len(self.scene_manager.andar_frames)
+        self._blend_to_next_frame('andar_frames', next_frame, self.andar_frame_duration)
 
     def _animate_idle(self):
         """Estado 4: Loop infinito de olhar (parado)"""
@@ -421,11 +520,8 @@ class MusicRoomScene(BaseScene):
             print("❌ Frames de olhar não encontrados!")
             return
         
-        self.frame_count += 1
-        frame_speed = 8  # Velocidade do olhar
-        
-        if self.frame_count >= frame_speed:
-            self.frame_count = 0
+        while self.frame_time >= self.olhar_frame_duration:
+            self.frame_time -= self.olhar_frame_duration
             
             # Loop infinito dos frames de olhar
             current_frame = self.frame_index % len(self.scene_manager.olhar_frames)
@@ -433,6 +529,16 @@ class MusicRoomScene(BaseScene):
             print(f"👀 Olhar Frame {current_frame + 1}/{len(self.scene_manager.olhar_frames)}")
             
             self.frame_index += 1
+        
+        next_frame = self.frame_index % len(self.scene_manager.olhar_frames)
+        self._blend_to_next_frame('olhar_frames', next_frame, self.olhar_frame_duration)
+
+    def _blend_to_next_frame(self, frames_attr, next_frame_index, frame_duration):
+        """Interpola o frame mostrado com o próximo, pelo tempo desde a última troca"""
+        frames = getattr(self.scene_manager, frames_attr, None)
+        # Só depois de a animação ter o seu primeiro frame mostrado
+        if frames and self.scene_manager.humano is frames:
+            frames.set_blend(frames.current_frame, next_frame_index, self.frame_time / frame_duration)
 
     def _switch_to_frame(self, frames_attr, frame_index):
         """Utilitário para trocar frames removendo o antigo corretamente"""
@@ -440,9 +546,9 @@ class MusicRoomScene(BaseScene):
         if not frames or frame_index >= len(frames):
             return
         
-        new_humano = frames[frame_index]
+        new_humano = frames.show_frame(frame_index)
         
-        # Se é o mesmo frame, não faz nada
+        # Mesma animação: trocar de frame já só mudou os uniforms
         if self.scene_manager.humano == new_humano:
             return
         
@@ -476,7 +582,7 @@ class MusicRoomScene(BaseScene):
             old_state = self.animation_state
             self.animation_state = new_state
             self.frame_index = 0
-            self.frame_count = 0
+            self.frame_time = 0.0
             print(f"🔄 Transição forçada: {old_state} → {new_state}")
         else:
             print(f"❌ Estado inválido: {new_state}. Use: {valid_states}")
@@ -505,7 +611,8 @@ class MusicRoomScene(BaseScene):
         
         if self.current_waypoint_index < len(self.waypoints) - 1:
             self.current_waypoint_index += 1
-            self.waypoint_start_time = self.manual_timeline
+            # Início pela tabela: os atrasos de um frame não se acumulam (e o seek dá o mesmo)
+            self.waypoint_start_time = self.waypoint_starts[self.current_waypoint_index]
             
             next_waypoint = self.waypoints[self.current_waypoint_index]
             
@@ -597,8 +704,8 @@ class MusicRoomScene(BaseScene):
       old_animation = self.animation_state
       self.animation_state = target_animation
       
-      # 🔧 SEMPRE RESET FRAME_COUNT E FRAME_INDEX
-      self.frame_count = 0
+      # 🔧 SEMPRE RESET FRAME_TIME E FRAME_INDEX
+      self.frame_time = 0.0
       self.frame_index = 0
       
       print(f"🎬 Transição animação: {old_animation} → {target_animation}")
@@ -631,6 +738,7 @@ class MusicRoomScene(BaseScene):
             "description": description
         }
         self.waypoints.append(waypoint)
+        self._build_time_tables()
         print(f"➕ Waypoint adicionado: {description}")
         print(f"   📍 Posição: {position}")
         print(f"   🎭 Animação: {animation} por {duration}s")
@@ -782,7 +890,7 @@ class MusicRoomScene(BaseScene):
         """Avança para o próximo keyframe de câmera"""
         if self.current_camera_keyframe < len(self.camera_keyframes) - 1:
             self.current_camera_keyframe += 1
-            self.camera_keyframe_start_time = self.manual_timeline
+            self.camera_keyframe_start_time = self.camera_keyframe_starts[self.current_camera_keyframe]
             
             next_keyframe = self.camera_keyframes[self.current_camera_keyframe]
             
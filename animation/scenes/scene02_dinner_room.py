@@ -1,8 +1,11 @@
 import math
 import time
 from animation.base_scene import BaseScene
+from core.matrix import Matrix
 
 class KitchenDinnerScene(BaseScene):
+    ASSETS = ["cozinha", "levantar_frames"]
+
     def __init__(self, scene, camera, renderer, scene_manager):
         super().__init__(scene, camera, renderer)
         self.scene_manager = scene_manager
@@ -53,6 +56,10 @@ class KitchenDinnerScene(BaseScene):
         self.current_camera_keyframe = 0
         self.camera_keyframe_start_time = 0
         self.camera_system_active = False
+
+        # ⏱️ TABELAS DE TEMPOS ACUMULADOS (seek por pesquisa binária)
+        self.waypoint_starts = self.cumulative_starts(self.waypoints)
+        self.camera_keyframe_starts = self.cumulative_starts(self.camera_keyframes)
         
         # 🎨 SISTEMA DE ILUMINAÇÃO DINÂMICA
         self.lighting_phases = [
@@ -163,6 +170,8 @@ class KitchenDinnerScene(BaseScene):
         """Configura ambiente da cozinha"""
         if hasattr(self.scene_manager, 'cozinha') and self.scene_manager.cozinha:
             self.cozinha = self.scene_manager.cozinha
+            # A cozinha pode já ter sido usada (seek): a escala parte sempre da identidade
+            self.cozinha.local_matrix = Matrix.make_identity()
             self.cozinha.scale(0.7)
             self.scene.add(self.cozinha)
             print("✅ Cozinha adicionada à Scene02")
@@ -173,7 +182,7 @@ class KitchenDinnerScene(BaseScene):
         """Configura o humano para a cena da cozinha - APENAS levantar[0]"""
         if hasattr(self.scene_manager, 'levantar_frames') and self.scene_manager.levantar_frames:
             # 🎯 USA APENAS O FRAME levantar[0] (conforme solicitado)
-            self.humano = self.scene_manager.levantar_frames[0]
+            self.humano = self.scene_manager.levantar_frames.show_frame(0)
             
             # Define posição inicial
             initial_position = self.waypoints[0]["position"]
@@ -284,6 +293,27 @@ class KitchenDinnerScene(BaseScene):
         if self.manual_timeline >= self.scene_duration:
             self.is_finished = True
     
+    def seek(self, scene_time):
+        """Estado da cena no instante scene_time, pelas tabelas de tempos (sem reproduzir)"""
+        self.manual_timeline = scene_time
+        index, _ = self.lookup(self.waypoint_starts, scene_time)
+        self.current_waypoint_index = index
+        self.waypoint_start_time = self.waypoint_starts[index]
+        # O humano fica parado no levantar[0]: só muda de posição entre waypoints
+        waypoint = self.waypoints[index]
+        self.scene_manager.set_human_position(waypoint["position"])
+        self.scene_manager.set_human_rotation(waypoint["rotation"])
+        
+        if not self.scene_manager.free_camera_mode:
+            camera_index, time_in_keyframe = self.lookup(self.camera_keyframe_starts, scene_time)
+            self.current_camera_keyframe = camera_index
+            self.camera_keyframe_start_time = self.camera_keyframe_starts[camera_index]
+            self._update_current_camera_keyframe(time_in_keyframe)
+            self.camera_system_active = time_in_keyframe < self.camera_keyframes[camera_index]["duration"]
+        
+        if self.manual_timeline >= self.scene_duration:
+            self.is_finished = True
+
     def _update_human_waypoints(self, delta_time):
         """Atualiza movimento do humano pelos waypoints"""
         if self.current_waypoint_index >= len(self.waypoints):
@@ -303,7 +333,7 @@ class KitchenDinnerScene(BaseScene):
         """Avança para o próximo waypoint"""
         if self.current_waypoint_index < len(self.waypoints) - 1:
             self.current_waypoint_index += 1
-            self.waypoint_start_time = self.manual_timeline
+            self.waypoint_start_time = self.waypoint_starts[self.current_waypoint_index]
             
             next_waypoint = self.waypoints[self.current_waypoint_index]
             
@@ -380,7 +410,7 @@ class KitchenDinnerScene(BaseScene):
     def _advance_to_next_camera_keyframe(self):
         if self.current_camera_keyframe < len(self.camera_keyframes) - 1:
             self.current_camera_keyframe += 1
-            self.camera_keyframe_start_time = self.manual_timeline
+            self.camera_keyframe_start_time = self.camera_keyframe_starts[self.current_camera_keyframe]
             
             next_keyframe = self.camera_keyframes[self.current_camera_keyframe]
             print(f"📷 INICIANDO MOVIMENTO DE CÂMERA:")
@@ -2,6 +2,8 @@ from animation.base_scene import BaseScene
 import math
 
 class BedroomScene(BaseScene):
+    ASSETS = ["quarto", "dormir_frames"]
+
     def __init__(self, scene, camera, renderer, scene_manager):
         super().__init__(scene, camera, renderer)
         self.scene_manager = scene_manager
@@ -85,6 +87,9 @@ class BedroomScene(BaseScene):
         
         # 📊 DEBUG
         self.last_debug_second = -1
+
+        # ⏱️ TABELA DE TEMPOS ACUMULADOS (seek por pesquisa binária)
+        self.camera_keyframe_starts = self.cumulative_starts(self.camera_keyframes)
     
     def initialize(self):
         """Inicializa a cena do quarto"""
@@ -152,8 +157,8 @@ class BedroomScene(BaseScene):
     def _setup_human_sleeping(self):
         """Configura humano com animação de dormir"""
         if hasattr(self.scene_manager, 'dormir_frames') and self.scene_manager.dormir_frames:
-            # Inicia com dormir_frames[0]
-            self.humano = self.scene_manager.dormir_frames[0]
+            # Inicia com o frame 0 de dormir
+            self.humano = self.scene_manager.dormir_frames.show_frame(0)
             
             # Posição temporária
             humano_position = self.waypoints[0]["position"]
@@ -247,6 +252,43 @@ class BedroomScene(BaseScene):
             self.is_finished = True
             print("🛏️ Scene03 concluída!")
     
+    def seek(self, scene_time):
+        """Estado da cena no instante scene_time, sem reproduzir"""
+        self.manual_timeline = scene_time
+        self._seek_sleeping_animation(scene_time)
+        
+        if not self.scene_manager.free_camera_mode:
+            camera_index, time_in_keyframe = self.lookup(self.camera_keyframe_starts, scene_time)
+            self.current_camera_keyframe = camera_index
+            self.camera_keyframe_start_time = self.camera_keyframe_starts[camera_index]
+            self._update_current_camera_keyframe(time_in_keyframe)
+            last_keyframe = camera_index == len(self.camera_keyframes) - 1
+            self.camera_system_active = not (last_keyframe and
+                                             time_in_keyframe >= self.camera_keyframes[camera_index]["duration"])
+        
+        if self.manual_timeline >= self.scene_duration:
+            self.is_finished = True
+
+    def _seek_sleeping_animation(self, scene_time):
+        """Frame de dormir: parado até dormir_static_duration, depois frames 1..último e loop desde o 4"""
+        if not getattr(self, 'humano', None) or scene_time < self.dormir_static_duration:
+            return
+        self.dormir_animation_started = True
+        total_frames = len(self.scene_manager.dormir_frames)
+        animation_time = scene_time - self.dormir_static_duration
+        switch_count = int(animation_time // self.dormir_frame_duration)
+        self.dormir_frame_time = animation_time - switch_count * self.dormir_frame_duration
+        if switch_count < total_frames:
+            frame = switch_count
+        else:
+            loop_length = total_frames - self.dormir_loop_start_frame
+            frame = self.dormir_loop_start_frame + (switch_count - total_frames) % loop_length
+        self._change_sleeping_frame(frame)
+        next_frame = frame + 1
+        if next_frame >= total_frames:
+            next_frame = self.dormir_loop_start_frame
+        self.humano.set_blend(frame, next_frame, self.dormir_frame_time / self.dormir_frame_duration)
+
     def _update_sleeping_animation(self, delta_time):
         """Atualiza animação de dormir do humano"""
         if not hasattr(self, 'humano') or not self.humano:
@@ -277,8 +319,8 @@ class BedroomScene(BaseScene):
             # Atualiza frame da animação
             self.dormir_frame_time += delta_time
             
-            if self.dormir_frame_time >= self.dormir_frame_duration:
-                self.dormir_frame_time = 0.0
+            while self.dormir_frame_time >= self.dormir_frame_duration:
+                self.dormir_frame_time -= self.dormir_frame_duration
                 
                 # Próximo frame
                 old_frame = self.dormir_current_frame
@@ -294,6 +336,13 @@ class BedroomScene(BaseScene):
                 
                 print(f"😴 Mudando frame dormir: {old_frame} -> {self.dormir_current_frame}")
                 self._change_sleeping_frame(self.dormir_current_frame)
+            
+            # Interpola até ao próximo frame (depois do último volta ao início do loop)
+            next_frame = self.dormir_current_frame + 1
+            if next_frame >= len(self.scene_manager.dormir_frames):
+                next_frame = self.dormir_loop_start_frame
+            self.humano.set_blend(self.dormir_current_frame, next_frame,
+                                  self.dormir_frame_time / self.dormir_frame_duration)
     
     def _change_sleeping_frame(self, new_frame_index):
         """Troca frame do humano dormindo"""
@@ -303,16 +352,16 @@ class BedroomScene(BaseScene):
         
         print(f"🔄 Trocando frame dormir: {getattr(self, 'dormir_current_frame', '?')} -> {new_frame_index}")
         
-        # Remove frame atual
-        if hasattr(self, 'humano') and self.humano:
+        # Mostra o novo frame; o humano só sai da cena quando muda de animação
+        new_humano = self.scene_manager.dormir_frames.show_frame(new_frame_index)
+        if hasattr(self, 'humano') and self.humano and self.humano is not new_humano:
             try:
                 self.scene.remove(self.humano)
                 print(f"   ✅ Frame anterior removido")
             except:
                 print(f"   ⚠️ Frame anterior já estava removido")
         
-        # Adiciona novo frame
-        self.humano = self.scene_manager.dormir_frames[new_frame_index]
+        self.humano = new_humano
         
         # Mantém posição e rotação
         humano_position = self.waypoints[0]["position"]
@@ -322,7 +371,8 @@ class BedroomScene(BaseScene):
         self.humano.set_rotation_y(humano_rotation)
         
         # Adiciona à scene
-        self.scene.add(self.humano)
+        if self.humano.parent is not self.scene:
+            self.scene.add(self.humano)
         print(f"   ✅ Novo frame {new_frame_index} adicionado")
         
         # Atualiza referência no scene_manager
@@ -355,7 +405,7 @@ class BedroomScene(BaseScene):
       if time_in_keyframe >= current_keyframe["duration"]:
           if self.current_camera_keyframe < len(self.camera_keyframes) - 1:
               self.current_camera_keyframe += 1
-              self.camera_keyframe_start_time = self.manual_timeline
+              self.camera_keyframe_start_time = self.camera_keyframe_starts[self.current_camera_keyframe]
               print(f"📷 MUDANDO PARA CÂMERA {self.current_camera_keyframe + 1}")
           else:
               print("📷 TODAS AS CÂMERAS CONCLUÍDAS")
@@ -124,6 +124,12 @@ class RallyScene(BaseScene):
                 self.is_finished = True
                 print(f"\n🚀 TELA PRETA PULADA aos {self.manual_timeline:.1f}s")
 
+    def seek(self, scene_time):
+        """Tela preta: só o tempo da cena muda"""
+        self.manual_timeline = scene_time
+        self.debug_timer = scene_time % self.debug_interval
+        self.is_finished = scene_time >= self.scene_duration
+
     def _debug_camera(self):
         """Debug da câmera"""
         remaining = self.scene_duration - self.manual_timeline
@@ -2,6 +2,8 @@ from animation.base_scene import BaseScene
 import math
 
 class WakeUpScene(BaseScene):
+    ASSETS = ["quarto", "acordar_frames", "andar_frames", "olhar_frames"]
+
     def __init__(self, scene, camera, renderer, scene_manager):
         super().__init__(scene, camera, renderer)
         self.scene_manager = scene_manager
@@ -127,6 +129,10 @@ class WakeUpScene(BaseScene):
         self.second_movement_started = False
         self.second_movement_start_time = 15.0
         self.second_movement_duration = 5.0
+
+        # ⏱️ TABELAS DE TEMPOS ACUMULADOS (seek por pesquisa binária)
+        self.waypoint_starts = self.cumulative_starts(self.waypoints)
+        self.camera_keyframe_starts = self.cumulative_starts(self.camera_keyframes)
     
     def initialize(self):
         """Inicializa a cena de acordar"""
@@ -184,8 +190,8 @@ class WakeUpScene(BaseScene):
     def _setup_human_waking_up(self):
         """Configura humano com animação de acordar"""
         if hasattr(self.scene_manager, 'acordar_frames') and self.scene_manager.acordar_frames:
-            # Inicia com acordar_frames[0]
-            self.humano = self.scene_manager.acordar_frames[0]
+            # Inicia com o frame 0 de acordar
+            self.humano = self.scene_manager.acordar_frames.show_frame(0)
             
             # Calcula duração de cada frame para animação
             self.acordar_total_frames = len(self.scene_manager.acordar_frames)
@@ -302,6 +308,96 @@ class WakeUpScene(BaseScene):
             self.is_finished = True
             print("🌅 Scene05 concluída - Pronto para o próximo desafio!")
     
+    def seek(self, scene_time):
+        """Estado da cena no instante scene_time, pelas tabelas de tempos (sem reproduzir)"""
+        self.manual_timeline = scene_time
+        index, time_in_waypoint = self.lookup(self.waypoint_starts, scene_time)
+        self.current_waypoint_index = index
+        self.waypoint_start_time = self.waypoint_starts[index]
+        if index == 0:
+            # Parado no acordar[0] e depois a animação de acordar
+            if time_in_waypoint >= self.acordar_static_duration:
+                self._seek_waking(time_in_waypoint - self.acordar_static_duration)
+        elif index == 1:
+            self._seek_waking_finished()
+            self._seek_parado(time_in_waypoint)
+        else:
+            self._seek_waking_finished()
+            self._seek_walking(scene_time, time_in_waypoint)
+        
+        if not self.scene_manager.free_camera_mode:
+            camera_index, time_in_keyframe = self.lookup(self.camera_keyframe_starts, scene_time)
+            self.current_camera_keyframe = camera_index
+            self.camera_keyframe_start_time = self.camera_keyframe_starts[camera_index]
+            self._update_current_camera_keyframe(time_in_keyframe)
+            last_keyframe = camera_index == len(self.camera_keyframes) - 1
+            self.camera_system_active = not (last_keyframe and
+                                             time_in_keyframe >= self.camera_keyframes[camera_index]["duration"])
+        
+        if self.manual_timeline >= self.scene_duration:
+            self.is_finished = True
+
+    def _seek_waking(self, animation_time):
+        """Frame de acordar e posição a caminho do waypoint 2"""
+        if not getattr(self, 'humano', None) or self.acordar_frame_duration <= 0:
+            return
+        self.acordar_animation_started = True
+        self.movement_started = True
+        switch_count = int(animation_time // self.acordar_frame_duration)
+        frame = min(switch_count, self.acordar_total_frames - 1)
+        self.acordar_frame_time = animation_time - switch_count * self.acordar_frame_duration
+        # Como no update, o frame novo fica na posição calculada com o frame anterior
+        self.acordar_current_frame = max(frame - 1, 0)
+        self._update_movement_during_animation()
+        self._change_waking_frame(frame)
+        self._update_movement_during_animation()
+        next_frame = min(frame + 1, self.acordar_total_frames - 1)
+        self.humano.set_blend(frame, next_frame, self.acordar_frame_time / self.acordar_frame_duration)
+
+    def _seek_waking_finished(self):
+        """Estado depois da animação de acordar (já no último frame)"""
+        self.acordar_animation_started = True
+        self.movement_started = True
+        self.acordar_current_frame = max(self.acordar_total_frames - 1, 0)
+        self._update_movement_during_animation()
+
+    def _seek_parado(self, animation_time):
+        """Loop de olhar no waypoint 2"""
+        self.reflection_started = True
+        olhar_frames = getattr(self.scene_manager, 'olhar_frames', None)
+        if not olhar_frames:
+            return
+        self.parado_loop_started = True
+        switch_count = int(animation_time // self.parado_frame_duration)
+        self.parado_frame_time = animation_time - switch_count * self.parado_frame_duration
+        frame = switch_count % len(olhar_frames)
+        self._change_to_parado_frame(frame)
+        self.humano.set_blend(frame, (frame + 1) % len(olhar_frames),
+                              self.parado_frame_time / self.parado_frame_duration)
+
+    def _seek_walking(self, scene_time, animation_time):
+        """Loop de andar a caminho do waypoint 3"""
+        self.andar_animation_started = True
+        self.second_movement_started = True
+        switch_count = int(animation_time // self.andar_frame_duration) if self.andar_total_frames else 0
+        if switch_count == 0:
+            # Ainda não trocou para o andar: fica o olhar do fim do waypoint 2
+            self._seek_parado(self.andar_start_time - self.reflection_start_time)
+        else:
+            # O frame de andar fica na posição do instante em que foi mostrado
+            self.manual_timeline = self.second_movement_start_time + switch_count * self.andar_frame_duration
+            self._update_second_movement_during_animation()
+            self._change_andar_frame(switch_count % self.andar_total_frames)
+        self.parado_loop_started = False
+        self.manual_timeline = scene_time
+        self._update_second_movement_during_animation()
+        self.andar_current_frame = switch_count % self.andar_total_frames if self.andar_total_frames else 0
+        self.andar_frame_time = animation_time - switch_count * self.andar_frame_duration
+        if self.humano is self.scene_manager.andar_frames:
+            next_frame = (self.andar_current_frame + 1) % self.andar_total_frames
+            self.humano.set_blend(self.andar_current_frame, next_frame,
+                                  self.andar_frame_time / self.andar_frame_duration)
+
     def _update_waking_animation(self, delta_time):
       if not hasattr(self, 'humano') or not self.humano:
           return
@@ -328,8 +424,8 @@ class WakeUpScene(BaseScene):
           
           self.acordar_frame_time += delta_time
           
-          if self.acordar_frame_time >= self.acordar_frame_duration:
-              self.acordar_frame_time = 0.0
+          while self.acordar_frame_time >= self.acordar_frame_duration:
+              self.acordar_frame_time -= self.acordar_frame_duration
               
               old_frame = self.acordar_current_frame
               
@@ -339,6 +435,11 @@ class WakeUpScene(BaseScene):
                   self._change_waking_frame(self.acordar_current_frame)
               else:
                   print(f"✅ Transição para WAYPOINT 2 concluída (frame {self.acordar_current_frame})")
+          
+          # Interpola até ao próximo frame (o último fica parado)
+          next_frame = min(self.acordar_current_frame + 1, self.acordar_total_frames - 1)
+          self.humano.set_blend(self.acordar_current_frame, next_frame,
+                                self.acordar_frame_time / self.acordar_frame_duration)
       
       # 🤔 FASE 3: WAYPOINT 2 - LOOP OLHAR (10-15s)
       elif self.manual_timeline < 15.0:  # ← CORRETO: Até 15s
@@ -386,8 +487,8 @@ class WakeUpScene(BaseScene):
           # 🎭 ATUALIZA LOOP DE FRAMES DE ANDAR (INDEPENDENTE DO MOVIMENTO)
           self.andar_frame_time += delta_time
           
-          if self.andar_frame_time >= self.andar_frame_duration:
-              self.andar_frame_time = 0.0
+          while self.andar_frame_time >= self.andar_frame_duration:
+              self.andar_frame_time -= self.andar_frame_duration
               
               old_frame = self.andar_current_frame
               self.andar_current_frame += 1
@@ -399,6 +500,12 @@ class WakeUpScene(BaseScene):
               
               # 🎭 TROCA FRAME DE ANDAR (COM POSIÇÃO INTERPOLADA)
               self._change_andar_frame(self.andar_current_frame)
+          
+          # Interpola até ao próximo frame do loop (só depois do primeiro frame de andar)
+          if self.humano is self.scene_manager.andar_frames:
+              next_frame = (self.andar_current_frame + 1) % self.andar_total_frames
+              self.humano.set_blend(self.andar_current_frame, next_frame,
+                                    self.andar_frame_time / self.andar_frame_duration)
 
     def _update_movement_during_animation(self):
       if not self.movement_started:
@@ -430,16 +537,16 @@ class WakeUpScene(BaseScene):
       
       print(f"🔄 Trocando frame acordar: {getattr(self, 'acordar_current_frame', '?')} → {new_frame_index}")
       
-      # Remove frame atual
-      if hasattr(self, 'humano') and self.humano:
+      # Mostra o novo frame; o humano só sai da cena quando muda de animação
+      new_humano = self.scene_manager.acordar_frames.show_frame(new_frame_index)
+      if hasattr(self, 'humano') and self.humano and self.humano is not new_humano:
           try:
               self.scene.remove(self.humano)
               print(f"   ✅ Frame anterior removido")
           except:
               print(f"   ⚠️ Frame anterior já estava removido")
       
-      # Adiciona novo frame
-      self.humano = self.scene_manager.acordar_frames[new_frame_index]
+      self.humano = new_humano
       
       # 🎮 VERIFICA SE CONTROLES MANUAIS ESTÃO ATIVOS
       if self.scene_manager.manual_control_enabled:
@@ -463,7 +570,8 @@ class WakeUpScene(BaseScene):
       self.humano.set_rotation_y(humano_rotation)
       
       # Adiciona à scene
-      self.scene.add(self.humano)
+      if self.humano.parent is not self.scene:
+          self.scene.add(self.humano)
       print(f"   ✅ Novo frame {new_frame_index} adicionado")
       
       # 🔧 ATUALIZA REFERÊNCIAS DO SCENE_MANAGER
@@ -503,7 +611,7 @@ class WakeUpScene(BaseScene):
         if time_in_keyframe >= current_keyframe["duration"]:
             if self.current_camera_keyframe < len(self.camera_keyframes) - 1:
                 self.current_camera_keyframe += 1
-                self.camera_keyframe_start_time = self.manual_timeline
+                self.camera_keyframe_start_time = self.camera_keyframe_starts[self.current_camera_keyframe]
                 print(f"📷 MUDANDO PARA CÂMERA {self.current_camera_keyframe + 1}")
             else:
                 print("📷 TODAS AS CÂMERAS CONCLUÍDAS")
@@ -601,8 +709,8 @@ class WakeUpScene(BaseScene):
       
       self.parado_frame_time += delta_time
       
-      if self.parado_frame_time >= self.parado_frame_duration:
-          self.parado_frame_time = 0.0
+      while self.parado_frame_time >= self.parado_frame_duration:
+          self.parado_frame_time -= self.parado_frame_duration
           
           # Próximo frame do loop
           old_frame = self.parado_current_frame
@@ -615,6 +723,10 @@ class WakeUpScene(BaseScene):
           
           print(f"🧍 Frame parado: {old_frame} -> {self.parado_current_frame}")
           self._change_to_parado_frame(self.parado_current_frame)
+      
+      next_frame = (self.parado_current_frame + 1) % len(self.scene_manager.olhar_frames)
+      self.humano.set_blend(self.parado_current_frame, next_frame,
+                            self.parado_frame_time / self.parado_frame_duration)
 
     def _change_to_parado_frame(self, new_frame_index):
       if not hasattr(self.scene_manager, 'olhar_frames') or new_frame_index >= len(self.scene_manager.olhar_frames):
@@ -623,16 +735,16 @@ class WakeUpScene(BaseScene):
       
       print(f"🔄 Trocando para frame parado: {getattr(self, 'parado_current_frame', '?')} → {new_frame_index}")
       
-      # Remove frame atual
-      if hasattr(self, 'humano') and self.humano:
+      # Mostra o novo frame; o humano só sai da cena quando muda de animação
+      new_humano = self.scene_manager.olhar_frames.show_frame(new_frame_index)
+      if hasattr(self, 'humano') and self.humano and self.humano is not new_humano:
           try:
               self.scene.remove(self.humano)
               print(f"   ✅ Frame anterior removido")
           except:
               print(f"   ⚠️ Frame anterior já estava removido")
       
-      # Adiciona novo frame parado
-      self.humano = self.scene_manager.olhar_frames[new_frame_index]
+      self.humano = new_humano
       
       # 🎮 VERIFICA SE CONTROLES MANUAIS ESTÃO ATIVOS
       if self.scene_manager.manual_control_enabled:
@@ -652,7 +764,8 @@ class WakeUpScene(BaseScene):
       self.humano.set_rotation_y(humano_rotation)
       
       # Adiciona à scene
-      self.scene.add(self.humano)
+      if self.humano.parent is not self.scene:
+          self.scene.add(self.humano)
       print(f"   ✅ Novo frame parado {new_frame_index} adicionado")
       
       # 🔧 ATUALIZA REFERÊNCIAS DO SCENE_MANAGER
@@ -708,15 +821,15 @@ class WakeUpScene(BaseScene):
       
       print(f"🔄 Trocando para frame andar: {getattr(self, 'andar_current_frame', '?')} → {new_frame_index}")
       
-      # Remove frame atual
-      if hasattr(self, 'humano') and self.humano:
+      # Mostra o novo frame; o humano só sai da cena quando muda de animação
+      new_humano = self.scene_manager.andar_frames.show_frame(new_frame_index)
+      if hasattr(self, 'humano') and self.humano and self.humano is not new_humano:
           try:
               self.scene.remove(self.humano)
           except:
               pass
       
-      # Adiciona novo frame de andar
-      self.humano = self.scene_manager.andar_frames[new_frame_index]
+      self.humano = new_humano
       
       # 🎮 VERIFICA SE CONTROLES MANUAIS ESTÃO ATIVOS
       if self.scene_manager.manual_control_enabled:
@@ -740,7 +853,8 @@ class WakeUpScene(BaseScene):
       self.humano.set_rotation_y(humano_rotation)
       
       # Adiciona à scene
-      self.scene.add(self.humano)
+      if self.humano.parent is not self.scene:
+          self.scene.add(self.humano)
       print(f"   ✅ Frame andar {new_frame_index} adicionado")
       
       # 🔧 ATUALIZA REFERÊNCIAS DO SCENE_MANAGER
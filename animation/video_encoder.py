@@ -0,0 +1,135 @@
+"""
+Codificação de vídeo num processo separado.
+
+O processo principal copia cada frame para um slot de memória partilhada e envia
+o número do slot por uma fila; o codificador grava o frame (ffmpeg para vídeo,
+PNG para sequências de imagens) e devolve o slot. Quando o codificador está
+atrasado, o processo principal espera por um slot livre.
+
+Este módulo não importa OpenGL: é importado de novo pelo processo filho.
+"""
+import multiprocessing
+import os
+import shutil
+import subprocess
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Extensões gravadas com o ffmpeg; o resto é uma pasta para a sequência de PNGs
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".mov", ".avi", ".webm")
+
+
+def is_video(output):
+    return os.path.splitext(output)[1].lower() in VIDEO_EXTENSIONS
+
+
+def ffmpeg_command(output, width, height, fps):
+    """Frames RGB crus pelo stdin -> H.264 (yuv420p, compatível com qualquer leitor)"""
+    return ["ffmpeg", "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps),
+            "-i", "-",
+            "-c:v", "libx264", "-preset", "medium", "-pix_fmt", "yuv420p",
+            output]
+
+
+def _encoder_main(memory_name, output, width, height, fps, slot_count, first_frame,
+                  filled_queue, free_queue, result_queue):
+    """Processo codificador: grava os slots pela ordem em que chegam até receber None"""
+    # Com spawn o filho usa o resource tracker do pai: quem apaga a memória é o pai (close)
+    memory = shared_memory.SharedMemory(name=memory_name)
+    frames = np.ndarray((slot_count, height, width, 3), dtype=np.uint8, buffer=memory.buf)
+    encoder = None
+    if is_video(output):
+        encoder = subprocess.Popen(ffmpeg_command(output, width, height, fps), stdin=subprocess.PIPE)
+    else:
+        import pygame
+        os.makedirs(output, exist_ok=True)
+    frame_count = 0
+    encode_time = 0.0
+    wait_time = 0.0
+    while True:
+        wait_start = time.perf_counter()
+        slot = filled_queue.get()
+        wait_time += time.perf_counter() - wait_start
+        if slot is None:
+            break
+        encode_start = time.perf_counter()
+        if encoder is not None:
+            encoder.stdin.write(frames[slot].data)
+        else:
+            image = pygame.image.frombuffer(frames[slot].tobytes(), (width, height), "RGB")
+            pygame.image.save(image, os.path.join(output, f"frame_{first_frame + frame_count:06d}.png"))
+        encode_time += time.perf_counter() - encode_start
+        free_queue.put(slot)
+        frame_count += 1
+    if encoder is not None:
+        encode_start = time.perf_counter()
+        encoder.stdin.close()
+        encoder.wait()
+        encode_time += time.perf_counter() - encode_start
+    del frames
+    memory.close()
+    result_queue.put({"frames": frame_count, "encode": encode_time, "wait": wait_time})
+
+
+class VideoEncoder:
+    """
+    Grava frames (height, width, 3) RGB num vídeo ou numa pasta de PNGs, num processo
+    separado, para que a codificação não atrase o render.
+    first_frame: número do primeiro PNG (para juntar sequências renderizadas por partes)
+    """
+    def __init__(self, output, width, height, fps, slot_count=8, first_frame=0):
+        if is_video(output) and shutil.which("ffmpeg") is None:
+            raise Exception("O ffmpeg não está instalado: use uma pasta para gravar PNGs")
+        self._output = output
+        self._frame_shape = (height, width, 3)
+        self._memory = shared_memory.SharedMemory(create=True, size=slot_count * height * width * 3)
+        self._frames = np.ndarray((slot_count,) + self._frame_shape, dtype=np.uint8, buffer=self._memory.buf)
+        # spawn: o processo principal tem um contexto OpenGL, que não pode ser copiado por fork
+        context = multiprocessing.get_context("spawn")
+        self._filled_queue = context.Queue()
+        self._free_queue = context.Queue()
+        self._result_queue = context.Queue()
+        for slot in range(slot_count):
+            self._free_queue.put(slot)
+        self._process = context.Process(
+            target=_encoder_main,
+            args=(self._memory.name, output, width, height, fps, slot_count, first_frame,
+                  self._filled_queue, self._free_queue, self._result_queue),
+            daemon=True
+        )
+        self._process.start()
+        self._frame_count = 0
+        # Tempo à espera de um slot livre (codificador atrasado) e a copiar os frames
+        self.wait_time = 0.0
+        self.copy_time = 0.0
+
+    @property
+    def output(self):
+        return self._output
+
+    @property
+    def frame_count(self):
+        return self._frame_count
+
+    def write(self, frame):
+        wait_start = time.perf_counter()
+        slot = self._free_queue.get()
+        copy_start = time.perf_counter()
+        self._frames[slot] = frame
+        self._filled_queue.put(slot)
+        self.wait_time += copy_start - wait_start
+        self.copy_time += time.perf_counter() - copy_start
+        self._frame_count += 1
+
+    def close(self):
+        """Espera que o codificador termine; devolve as estatísticas dele"""
+        self._filled_queue.put(None)
+        result = self._result_queue.get()
+        self._process.join()
+        del self._frames
+        self._memory.close()
+        self._memory.unlink()
+        return result
@@ -0,0 +1,192 @@
+#!/usr/bin/python3
+"""
+Exportação offline do clip completo (transição inicial, cinco cenas e transições)
+para MP4 ou para uma sequência de PNGs, na resolução e FPS escolhidos.
+
+O SceneManager avança com um delta_time fixo (1 / fps) em vez do relógio, por isso
+o resultado é sempre igual e o render corre tão depressa quanto o hardware deixar
+(mais depressa que o tempo real, se puder). Em cada frame:
+  - update + render do SceneManager;
+  - leitura do frame por um anel de pixel buffer objects (core/pixel_reader.py):
+    o glReadPixels não espera pela GPU e o frame só é copiado uns frames depois;
+  - cópia para a memória partilhada do codificador, que corre noutro processo
+    (animation/video_encoder.py).
+No fim mostra os FPS conseguidos e o tempo de cada etapa.
+
+Sem ecrã, correr com PYOPENGL_PLATFORM=egl (ou osmesa) para um contexto headless.
+
+Uso (a partir da raiz do projeto):
+    python -m animation.video_export saida.mp4 [--fps 30] [--size 1280x720] [--start segundos [--seek]] [--duration segundos]
+    python -m animation.video_export pasta_de_frames/ ...
+"""
+import os
+
+# Sem som: a exportação corre à velocidade do render, não do clip, e a música e os
+# efeitos tocariam desfasados. O mixer do pygame é iniciado quando o
+# animation.effects.audio é importado, por isso tem de ser antes dos imports
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import time
+
+import OpenGL.GL as GL
+
+from animation.scene_manager import SceneManager
+from animation.video_encoder import VideoEncoder
+from core.pixel_reader import PixelReader
+
+DEFAULT_FPS = 30
+DEFAULT_SIZE = (1280, 720)
+# Pixel buffers no anel de leitura (o frame é lido PBO_RING_SIZE - 1 frames depois)
+PBO_RING_SIZE = 3
+# Frames que cabem na memória partilhada do codificador
+ENCODER_SLOTS = 8
+
+
+class ExportTiming:
+    """Tempo de cada etapa da exportação, em segundos"""
+    STAGES = ["update", "render", "leitura", "entrega", "codificação"]
+
+    def __init__(self):
+        self.seconds = {stage: 0.0 for stage in ExportTiming.STAGES}
+        self.frames = 0
+        self.total = 0.0
+
+    def report(self, label):
+        fps = self.frames / self.total if self.total > 0 else 0.0
+        print(f"🎬 {label}: {self.frames} frames em {self.total:.1f}s ({fps:.1f} FPS)")
+        for stage in ExportTiming.STAGES:
+            seconds = self.seconds[stage]
+            per_frame = seconds / max(self.frames, 1) * 1000
+            share = seconds / self.total * 100 if self.total > 0 else 0.0
+            print(f"   {stage:12s} {seconds:8.2f}s {per_frame:8.2f} ms/frame {share:5.1f}%")
+        print("   (a codificação corre noutro processo, em paralelo com as outras etapas)")
+
+
+class OfflineExporter:
+    """
+    Avança o SceneManager com passo fixo e entrega cada frame a um VideoEncoder.
+    Pode exportar o clip inteiro ou só um intervalo de frames (run com start_frame
+    e end_frame, como nos segmentos do animation/render_farm.py).
+    """
+    def __init__(self, manager, fps=DEFAULT_FPS):
+        self.manager = manager
+        self.fps = fps
+        self.delta_time = 1.0 / fps
+        self.frame_index = 0
+        self.timing = ExportTiming()
+        width, height = manager.context.size
+        self.reader = PixelReader(width, height, PBO_RING_SIZE)
+
+    def step(self, encoder=None):
+        """Avança um frame; o frame lido (de há uns frames) vai para o encoder, se houver"""
+        manager = self.manager
+        timing = self.timing.seconds
+        context = manager.context
+        render_count = manager.renderer.render_count
+        # Durante as transições o SceneManager não renderiza: fica o ecrã preto
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, context.framebuffer_ref)
+        GL.glClearBufferfv(GL.GL_COLOR, 0, (0.0, 0.0, 0.0, 1.0))
+        step_start = time.perf_counter()
+        manager.step(self.delta_time)
+        step_time = time.perf_counter() - step_start
+        render_time = manager.renderer.stats["renderTime"] if manager.renderer.render_count > render_count else 0.0
+        timing["update"] += step_time - render_time
+        timing["render"] += render_time
+        read_start = time.perf_counter()
+        context.resolve()
+        frame = self.reader.read(context.read_framebuffer_ref)
+        timing["leitura"] += time.perf_counter() - read_start
+        # Numa janela, mostra o frame enquanto exporta
+        context.swap_buffers()
+        self.frame_index += 1
+        self.timing.frames += 1
+        if frame is not None and encoder is not None:
+            self._deliver(encoder, frame)
+
+    def finish(self, encoder):
+        """Entrega os frames que ainda estão no anel de pixel buffers e fecha o encoder"""
+        read_start = time.perf_counter()
+        frames = list(self.reader.flush())
+        self.timing.seconds["leitura"] += time.perf_counter() - read_start
+        for frame in frames:
+            self._deliver(encoder, frame)
+        result = encoder.close()
+        self.timing.seconds["codificação"] += result["encode"]
+        return result
+
+    def skip_to(self, frame_index, replay=True):
+        """
+        Chega a frame_index sem renderizar os frames de antes. Por omissão (replay)
+        avança só a lógica com o mesmo passo fixo, o que deixa o estado exatamente
+        igual ao da exportação sequencial; sem replay salta com o SceneManager.seek
+        (para a frente ou para trás), mais depressa mas sem essa garantia
+        """
+        manager = self.manager
+        if frame_index == self.frame_index:
+            return
+        if not replay:
+            manager.seek(frame_index * self.delta_time)
+            self.frame_index = frame_index
+            return
+        if frame_index < self.frame_index:
+            raise Exception("Sem seek só se pode avançar: use replay=False para voltar atrás")
+        manager.render_enabled = False
+        while self.frame_index < frame_index and not manager.clip_finished:
+            manager.step(self.delta_time)
+            self.frame_index += 1
+        manager.render_enabled = True
+
+    def _deliver(self, encoder, frame):
+        deliver_start = time.perf_counter()
+        encoder.write(frame)
+        self.timing.seconds["entrega"] += time.perf_counter() - deliver_start
+
+    def run(self, output, duration=None, start_frame=0, end_frame=None, replay=True):
+        """
+        Exporta os frames [start_frame, end_frame) do clip; por omissão até o clip
+        terminar (ou durante duration segundos de clip). replay: ver skip_to.
+        Devolve o número de frames gravados
+        """
+        width, height = self.manager.context.size
+        if duration is not None:
+            end_frame = start_frame + round(duration * self.fps)
+        self.skip_to(start_frame, replay)
+        encoder = VideoEncoder(output, width, height, self.fps, ENCODER_SLOTS, first_frame=start_frame)
+        start = time.perf_counter()
+        while not self.manager.clip_finished and (end_frame is None or self.frame_index < end_frame):
+            self.step(encoder)
+            if self.frame_index % (self.fps * 10) == 0:
+                print(f"🎞️ Exportados {self.frame_index / self.fps:.0f}s de clip")
+        result = self.finish(encoder)
+        self.timing.total += time.perf_counter() - start
+        self.timing.report(output)
+        return result["frames"]
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta o clip completo para vídeo ou PNGs")
+    parser.add_argument("output", help="ficheiro de vídeo (.mp4, .mkv, ...) ou pasta para PNGs")
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS)
+    parser.add_argument("--size", type=parse_size, default=DEFAULT_SIZE, help="LARGURAxALTURA")
+    parser.add_argument("--duration", type=float, default=None, help="segundos de clip (por omissão, tudo)")
+    parser.add_argument("--start", type=float, default=0.0, help="começa neste segundo do clip")
+    parser.add_argument("--seek", dest="replay", action="store_false",
+                        help="chega ao --start com seek em vez de avançar a lógica")
+    arguments = parser.parse_args()
+    manager = SceneManager(screen_size=arguments.size)
+    manager.initialize()
+    exporter = OfflineExporter(manager, arguments.fps)
+    exporter.run(arguments.output, arguments.duration, start_frame=round(arguments.start * arguments.fps),
+                 replay=arguments.replay)
+    manager.asset_streamer.shutdown()
+    manager.context.delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""
+Benchmark de Geometry.apply_matrix e Geometry.merge numa geometria com 100k vértices
+(posições, normais por vértice e por face, UVs).
+
+Compara as versões originais (ciclo Python por vértice sobre listas, merge com
+list.extend) com as versões com arrays NumPy. Os tempos incluem o upload para a GPU,
+por isso é preciso um contexto OpenGL (abre uma janela pygame escondida).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.apply_matrix_benchmark [número de vértices]
+"""
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.attribute_upload_benchmark import create_context
+from core.matrix import Matrix
+from geometry.geometry import Geometry
+
+DEFAULT_VERTEX_COUNT = 100_000
+REPEATS = 3
+
+
+def legacy_apply_matrix(geometry, matrix):
+    """Geometry.apply_matrix original (só muda a representação das listas)"""
+    new_position_data = []
+    for old_pos in geometry.attribute_dict["vertexPosition"].data.tolist():
+        new_pos = old_pos.copy()
+        new_pos.append(1)
+        new_pos = matrix @ new_pos
+        new_position_data.append(list(new_pos[0:3]))
+    geometry.attribute_dict["vertexPosition"].data = new_position_data
+    geometry.attribute_dict["vertexPosition"].upload_data()
+    rotation_matrix = np.array([matrix[0][0:3], matrix[1][0:3], matrix[2][0:3]]).astype(float)
+    for variable_name in ["vertexNormal", "faceNormal"]:
+        new_normal_data = []
+        for old_normal in geometry.attribute_dict[variable_name].data.tolist():
+            new_normal_data.append(rotation_matrix @ old_normal.copy())
+        geometry.attribute_dict[variable_name].data = new_normal_data
+        geometry.attribute_dict[variable_name].upload_data()
+
+
+def legacy_merge(geometry, other_geometry):
+    """Geometry.merge original: list.extend e upload de tudo"""
+    for variable_name, attribute_instance in geometry.attribute_dict.items():
+        data = attribute_instance.data.tolist()
+        data.extend(other_geometry.attribute_dict[variable_name].data.tolist())
+        attribute_instance.data = data
+        attribute_instance.upload_data()
+
+
+def build_geometry(vertex_count):
+    rng = np.random.default_rng(0)
+    normals = rng.normal(size=(vertex_count, 3)).astype(np.float32)
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    geometry = Geometry()
+    geometry.add_attribute("vec3", "vertexPosition", rng.random((vertex_count, 3), dtype=np.float32))
+    geometry.add_attribute("vec3", "vertexNormal", normals)
+    geometry.add_attribute("vec3", "faceNormal", normals.copy())
+    geometry.add_attribute("vec2", "vertexUV", rng.random((vertex_count, 2), dtype=np.float32))
+    return geometry
+
+
+def best_time(function, vertex_count):
+    best = float("inf")
+    for _ in range(REPEATS):
+        geometry, other_geometry = build_geometry(vertex_count), build_geometry(vertex_count)
+        start = time.perf_counter()
+        function(geometry, other_geometry)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv):
+    vertex_count = int(argv[0]) if argv else DEFAULT_VERTEX_COUNT
+    create_context()
+    matrix = Matrix.make_translation(1, 2, 3) @ Matrix.make_rotation_y(0.3) @ Matrix.make_scale(0.1)
+    print(f"📐 Geometria com {vertex_count} vértices")
+    cases = [
+        ("apply_matrix", lambda g, _: legacy_apply_matrix(g, matrix), lambda g, _: g.apply_matrix(matrix)),
+        ("merge", legacy_merge, lambda g, other: g.merge(other)),
+    ]
+    for label, legacy, vectorized in cases:
+        legacy_time = best_time(legacy, vertex_count)
+        vectorized_time = best_time(vectorized, vertex_count)
+        print(f"   {label:13s} original: {legacy_time * 1000:9.1f} ms   NumPy: {vectorized_time * 1000:7.1f} ms "
+              f"({legacy_time / vectorized_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
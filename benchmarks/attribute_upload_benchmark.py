@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Benchmark de upload de vértices para a GPU com a geometria da cozinha.
+
+Compara três caminhos, em MB/s:
+  - original: listas Python -> np.array(...).astype(np.float32) -> glBufferData
+    (realoca o buffer em cada upload);
+  - arrays: Attribute com arrays float32 contíguos (sem cópia) -> glBufferSubData
+    sobre o buffer já alocado;
+  - parcial: update_range de 10% dos vértices (ex.: animação), só esse intervalo.
+
+Precisa de um contexto OpenGL (abre uma janela pygame escondida; sem ecrã, correr
+com PYOPENGL_PLATFORM=egl ou osmesa para um contexto headless).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.attribute_upload_benchmark [ficheiro.obj]
+"""
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+import pygame
+import OpenGL.GL as GL
+
+from core import context
+from core.attribute import Attribute
+from core.obj_reader import my_obj_reader_arrays
+
+KITCHEN_OBJ = "scenes/kitchen_scene/cozinha.obj"
+# Alternativas quando a cozinha não está no repositório
+FALLBACK_FILES = ["scenes/rally/rally.obj", "scenes/objects/flauta.obj"] + sorted(glob.glob("scenes/mom/*.obj"))
+REPEATS = 20
+PARTIAL_FRACTION = 0.1
+
+
+def find_obj(argv):
+    for path in (argv[:1] or [KITCHEN_OBJ]) + FALLBACK_FILES:
+        if os.path.exists(path):
+            return path
+    raise SystemExit("❌ Nenhum .obj encontrado")
+
+
+def create_context():
+    """Contexto pequeno numa janela escondida (ou headless com PYOPENGL_PLATFORM=egl/osmesa)"""
+    return context.create_context((64, 64), hidden=True)
+
+
+def legacy_upload(buffer_ref, data):
+    """Attribute.upload_data original"""
+    array = np.array(data).astype(np.float32)
+    GL.glBindBuffer(GL.GL_ARRAY_BUFFER, buffer_ref)
+    GL.glBufferData(GL.GL_ARRAY_BUFFER, array.ravel(), GL.GL_STATIC_DRAW)
+
+
+def timed(function):
+    """Melhor tempo de REPEATS execuções, esperando que a GPU termine"""
+    best = float("inf")
+    for _ in range(REPEATS):
+        GL.glFinish()
+        start = time.perf_counter()
+        function()
+        GL.glFinish()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv):
+    obj_path = find_obj(argv)
+    groups = my_obj_reader_arrays(obj_path)
+    positions = [np.ascontiguousarray(group_positions, dtype=np.float32) for _, group_positions, _ in groups]
+    position_lists = [array.tolist() for array in positions]
+    total_bytes = sum(array.nbytes for array in positions)
+    print(f"🍽️ {obj_path}: {len(groups)} objetos, {sum(len(a) for a in positions)} vértices, "
+          f"{total_bytes / 2**20:.2f} MB de posições")
+
+    create_context()
+    legacy_buffers = [GL.glGenBuffers(1) for _ in positions]
+    attributes = [Attribute("vec3", array, usage="dynamic") for array in positions]
+
+    legacy_time = timed(lambda: [legacy_upload(buffer_ref, data)
+                                 for buffer_ref, data in zip(legacy_buffers, position_lists)])
+    array_time = timed(lambda: [attribute.upload_data() for attribute in attributes])
+
+    partial_counts = [max(1, int(len(array) * PARTIAL_FRACTION)) for array in positions]
+    partial_bytes = sum(count * 12 for count in partial_counts)
+    partial_time = timed(lambda: [attribute.upload_range(0, count)
+                                  for attribute, count in zip(attributes, partial_counts)])
+
+    def throughput(byte_count, seconds):
+        return byte_count / 2**20 / seconds
+
+    print(f"   original: {legacy_time * 1000:8.2f} ms  {throughput(total_bytes, legacy_time):9.1f} MB/s")
+    print(f"   arrays:   {array_time * 1000:8.2f} ms  {throughput(total_bytes, array_time):9.1f} MB/s "
+          f"({legacy_time / array_time:.1f}x)")
+    print(f"   parcial:  {partial_time * 1000:8.2f} ms  {throughput(partial_bytes, partial_time):9.1f} MB/s "
+          f"({PARTIAL_FRACTION:.0%} dos vértices)")
+
+    GL.glDeleteBuffers(len(legacy_buffers), legacy_buffers)
+    for attribute in attributes:
+        attribute.delete()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""
+Benchmark da BVH (core_ext/bvh.py) numa cena sintética com 10 000 meshes espalhadas
+por uma área de 200 x 200, com tamanhos variados, e uma câmara em perspectiva.
+
+Mede:
+  - construção da árvore;
+  - refit sem alterações, com 1% das meshes movidas e com todas movidas;
+  - consultas: frustum (BVH vs teste linear de todas as caixas, em NumPy e mesh a
+    mesh), raio e esfera.
+As meshes são Object3D com uma caixa local (é o que a BVH lê de uma Mesh), por
+isso não precisa de OpenGL.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.bvh_benchmark [número de meshes]
+"""
+import sys
+import time
+
+import numpy as np
+
+from core.frustum import Frustum
+from core.matrix import Matrix
+from core_ext.bvh import BoundingVolumeHierarchy
+from core_ext.object3d import Object3D
+
+DEFAULT_MESH_COUNT = 10000
+WORLD_SIZE = 200
+REPEATS = 20
+
+
+class SyntheticMesh(Object3D):
+    """Só o que a BVH usa de uma Mesh: matriz global e caixa local"""
+    def __init__(self, bounding_box):
+        super().__init__()
+        self.bounding_box = bounding_box
+
+
+def build_scene(mesh_count, rng):
+    scene = Object3D()
+    mesh_list = []
+    for _ in range(mesh_count):
+        half_size = rng.uniform(0.2, 2.0, 3)
+        mesh = SyntheticMesh((-half_size, half_size))
+        mesh.set_position(rng.uniform(-WORLD_SIZE / 2, WORLD_SIZE / 2, 3) * [1, 0.05, 1])
+        mesh.rotate_y(rng.uniform(0, np.pi))
+        scene.add(mesh)
+        mesh_list.append(mesh)
+    return scene, mesh_list
+
+
+def timed(function, repeats=REPEATS):
+    """Melhor tempo de várias execuções"""
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def linear_frustum(frustum, mesh_list):
+    """Sem árvore: caixa de cada mesh no mundo (todas de uma vez) e teste de todas"""
+    matrices = np.array([mesh.global_matrix for mesh in mesh_list])
+    box_mins = np.array([mesh.bounding_box[0] for mesh in mesh_list])
+    box_maxs = np.array([mesh.bounding_box[1] for mesh in mesh_list])
+    world_mins, world_maxs = Frustum.world_boxes(matrices, box_mins, box_maxs)
+    inside = frustum.classify_boxes(world_mins, world_maxs) != Frustum.OUTSIDE
+    return [mesh for mesh, keep in zip(mesh_list, inside) if keep]
+
+
+def per_mesh_frustum(frustum, mesh_list):
+    """Sem árvore nem vetorização: uma esfera por mesh, testada à vez"""
+    result = []
+    for mesh in mesh_list:
+        box_min, box_max = mesh.bounding_box
+        matrix = mesh.global_matrix
+        center = matrix[0:3, 0:3] @ ((box_min + box_max) / 2) + matrix[0:3, 3]
+        radius = float(np.linalg.norm(box_max - box_min)) / 2
+        if frustum.contains_sphere(center, radius):
+            result.append(mesh)
+    return result
+
+
+def main(mesh_count):
+    rng = np.random.default_rng(0)
+    scene, mesh_list = build_scene(mesh_count, rng)
+    camera = Object3D()
+    camera.set_position([0, 2, 60])
+    frustum = Frustum(Matrix.make_perspective(60, 4 / 3, 0.1, 100) @ np.linalg.inv(camera.global_matrix))
+    print(f"🌳 {mesh_count} meshes sintéticas")
+
+    build_time, bvh = timed(lambda: BoundingVolumeHierarchy(mesh_list), repeats=3)
+    print(f"   construção:            {build_time * 1000:8.2f} ms "
+          f"({bvh.node_count} nós, profundidade {bvh.depth})")
+
+    refit_time, _ = timed(bvh.refit)
+    print(f"   refit sem alterações:  {refit_time * 1000:8.2f} ms")
+    moved_list = mesh_list[::100]
+
+    def move_some():
+        for mesh in moved_list:
+            mesh.translate(0.1, 0, 0)
+        return bvh.refit()
+    refit_time, moved = timed(move_some)
+    print(f"   refit ({moved} movidas): {refit_time * 1000:8.2f} ms (inclui mover)")
+
+    def move_all():
+        scene.translate(0.01, 0, 0)
+        return bvh.refit()
+    refit_time, moved = timed(move_all, repeats=3)
+    print(f"   refit (todas movidas): {refit_time * 1000:8.2f} ms")
+
+    bvh_time, bvh_result = timed(lambda: bvh.query_frustum(frustum))
+    linear_time, linear_result = timed(lambda: linear_frustum(frustum, mesh_list))
+    per_mesh_time, per_mesh_result = timed(lambda: per_mesh_frustum(frustum, mesh_list), repeats=3)
+    if bvh_result != linear_result:
+        print("   ❌ A BVH e o teste linear não concordam!")
+    print(f"   frustum BVH:           {bvh_time * 1000:8.2f} ms ({len(bvh_result)} visíveis)")
+    print(f"   frustum linear NumPy:  {linear_time * 1000:8.2f} ms ({linear_time / bvh_time:.1f}x)")
+    print(f"   frustum mesh a mesh:   {per_mesh_time * 1000:8.2f} ms "
+          f"({per_mesh_time / bvh_time:.1f}x, {len(per_mesh_result)} esferas visíveis)")
+
+    ray_time, hits = timed(lambda: bvh.query_ray([0, 2, 60], [0, 0, -1]))
+    print(f"   raio:                  {ray_time * 1000:8.2f} ms ({len(hits)} caixas atingidas)")
+    sphere_time, overlaps = timed(lambda: bvh.query_sphere([0, 0, 0], 10))
+    print(f"   esfera (raio 10):      {sphere_time * 1000:8.2f} ms ({len(overlaps)} caixas)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MESH_COUNT)
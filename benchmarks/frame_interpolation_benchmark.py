@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+"""
+Custo de CPU por frame interpolado de uma animação do humano (a 60 FPS há um
+frame interpolado por render).
+
+Compara:
+  - interpolação na GPU (AnimationClip.set_blend): só escreve uniforms; o vertex
+    shader lê os dois frames da textura de frames;
+  - interpolação com NumPy num buffer dinâmico: mistura as posições de todos os
+    vértices no CPU (linear ou Catmull-Rom) e envia o buffer para a GPU.
+Os tempos incluem os uploads, por isso é preciso um contexto OpenGL (abre uma
+janela pygame escondida).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.frame_interpolation_benchmark [pasta de frames]
+"""
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.attribute_upload_benchmark import create_context
+from benchmarks.morph_clip_benchmark import frame_number
+from core.attribute import Attribute
+from core.morph_frames import pack_frames
+from core.obj_reader import my_obj_reader_arrays
+from core_ext.animation_clip import AnimationClip
+
+DEFAULT_FOLDER = "scenes/mom"
+# Frames interpolados medidos (1 segundo a 60 FPS)
+FRAME_COUNT = 60
+FRAME_DURATION = 0.2
+
+
+def frame_blends(frame_count):
+    """(frame, próximo frame, blend) de cada render, a 60 FPS"""
+    for render in range(FRAME_COUNT):
+        position = render / 60 / FRAME_DURATION
+        frame = int(position) % frame_count
+        yield frame, (frame + 1) % frame_count, position - int(position)
+
+
+def numpy_linear(positions, attribute):
+    result = np.empty_like(positions[0])
+    for frame_a, frame_b, blend in frame_blends(len(positions)):
+        np.subtract(positions[frame_b], positions[frame_a], out=result)
+        result *= blend
+        result += positions[frame_a]
+        attribute.update_range(0, result)
+
+
+def numpy_catmull_rom(positions, attribute):
+    frame_count = len(positions)
+    for frame_a, frame_b, t in frame_blends(frame_count):
+        p0 = positions[(frame_a - 1) % frame_count]
+        p1 = positions[frame_a]
+        p2 = positions[frame_b]
+        p3 = positions[(frame_b + 1) % frame_count]
+        result = 0.5 * (2.0 * p1 + (p2 - p0) * t
+                        + (2.0 * p0 - 5.0 * p1 + 4.0 * p2 - p3) * t * t
+                        + (3.0 * (p1 - p2) + p3 - p0) * t * t * t)
+        attribute.update_range(0, result)
+
+
+def gpu_blend(clip):
+    for frame_a, frame_b, blend in frame_blends(len(clip)):
+        clip.set_blend(frame_a, frame_b, blend)
+
+
+def timed(function):
+    """Melhor tempo de 3 execuções, por frame interpolado"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best / FRAME_COUNT
+
+
+def main(folder):
+    files = sorted(glob.glob(os.path.join(folder, "*.obj")), key=frame_number)
+    if not files:
+        print(f"⏭️ {folder}: sem frames")
+        return
+    create_context()
+    frame_data_list = [my_obj_reader_arrays(f) for f in files]
+    _, positions, _ = pack_frames(frame_data_list)
+    clip = AnimationClip(frame_data_list)
+    attribute = Attribute("vec3", positions[0], usage="dynamic")
+    print(f"🎞️ {folder}: {len(clip)} frames x {clip.vertex_count} vértices")
+    cases = [
+        ("GPU (uniforms)", lambda: gpu_blend(clip), 0),
+        ("NumPy linear", lambda: numpy_linear(positions, attribute), attribute.nbytes),
+        ("NumPy Catmull-Rom", lambda: numpy_catmull_rom(positions, attribute), attribute.nbytes),
+    ]
+    for label, function, upload_bytes in cases:
+        frame_time = timed(function)
+        print(f"   {label:18s} {frame_time * 1e6:9.1f} µs/frame   upload {upload_bytes / 1024:8.1f} KB/frame")
+    attribute.delete()
+    clip.delete()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FOLDER)
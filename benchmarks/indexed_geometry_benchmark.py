@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""
+Ganho da geometria indexada em cada sala: memória de vértices na GPU (VRAM) e
+número de execuções do vertex shader.
+
+Para cada .obj constrói os vértices como os builders das salas (posição + uv por
+grupo) e compara:
+  - glDrawArrays: um vértice por canto de face, cada um processado pelo shader;
+  - glDrawElements: vértices únicos + índices, com uma cache FIFO pós-transformação;
+  - glDrawElements com os triângulos reordenados para a cache (Tipsify).
+Não precisa de OpenGL.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.indexed_geometry_benchmark [ficheiros.obj ...]
+"""
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+from core.obj_reader import my_obj_reader_arrays
+from core.vertex_index import (DEFAULT_CACHE_SIZE, index_vertices, optimize_vertex_cache,
+                               reorder_vertices, simulate_vertex_cache)
+
+DEFAULT_FILES = [
+    "scenes/music_scene/salamusica.obj",
+    "scenes/kitchen_scene/cozinha.obj",
+    "scenes/bedroom_scene/quarto.obj",
+    "scenes/rally/rally.obj",
+    "scenes/objects/flauta.obj",
+] + sorted(glob.glob("scenes/mom/*.obj"))
+
+
+def measure(filename):
+    totals = {"cantos": 0, "vértices": 0, "vram_arrays": 0, "vram_indexado": 0,
+              "vs_arrays": 0, "vs_indexado": 0, "vs_otimizado": 0, "tempo": 0.0}
+    for name, positions, uvs in my_obj_reader_arrays(filename):
+        if len(uvs) != len(positions):
+            uvs = np.zeros((len(positions), 2), dtype=np.float32)
+        start = time.perf_counter()
+        arrays, indices = index_vertices([positions, uvs])
+        optimized = optimize_vertex_cache(indices, len(arrays[0]))
+        arrays, optimized = reorder_vertices(arrays, optimized)
+        totals["tempo"] += time.perf_counter() - start
+        stride = 4 * (3 + 2)
+        index_size = 2 if len(arrays[0]) <= 65536 else 4
+        totals["cantos"] += len(positions)
+        totals["vértices"] += len(arrays[0])
+        totals["vram_arrays"] += stride * len(positions)
+        totals["vram_indexado"] += stride * len(arrays[0]) + index_size * len(indices)
+        totals["vs_arrays"] += len(positions)
+        totals["vs_indexado"] += simulate_vertex_cache(indices)
+        totals["vs_otimizado"] += simulate_vertex_cache(optimized)
+    return totals
+
+
+def main(files):
+    print(f"Cache pós-transformação simulada: FIFO de {DEFAULT_CACHE_SIZE} vértices")
+    for filename in files:
+        if not os.path.exists(filename):
+            print(f"⏭️ {filename}: não encontrado")
+            continue
+        t = measure(filename)
+        if t["cantos"] == 0:
+            continue
+        print(f"🏠 {filename}")
+        print(f"   vértices:  {t['cantos']:9d} cantos -> {t['vértices']:9d} únicos "
+              f"({t['vértices'] / t['cantos']:.0%})")
+        print(f"   VRAM:      {t['vram_arrays'] / 2**20:9.2f} MB -> {t['vram_indexado'] / 2**20:9.2f} MB "
+              f"(-{1 - t['vram_indexado'] / t['vram_arrays']:.0%})")
+        print(f"   shader:    {t['vs_arrays']:9d} -> {t['vs_indexado']:9d} indexado "
+              f"(-{1 - t['vs_indexado'] / t['vs_arrays']:.0%}), {t['vs_otimizado']:9d} com Tipsify "
+              f"(-{1 - t['vs_otimizado'] / t['vs_arrays']:.0%})")
+        print(f"   tempo de indexação + Tipsify: {t['tempo']:.3f}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_FILES)
@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+"""
+Memória na GPU (VRAM) das animações do humano: um objeto por frame vs AnimationClip.
+
+Para cada pasta de frames compara:
+  - um humanoGeometry por frame: para cada grupo, vértices indexados (posição + uv)
+    e índices, repetidos em todos os frames (e sem indexação, como antes);
+  - AnimationClip: as posições de todos os frames numa textura (half float ou
+    float), e uma só vez os índices, as posições do frame 0 e as cores.
+Não precisa de OpenGL.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.morph_clip_benchmark [pastas de frames ...]
+"""
+import glob
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+from core.morph_frames import HALF_FLOAT_TOLERANCE, frame_texture_data, half_float_error, pack_frames
+from core.obj_reader import my_obj_reader_arrays
+from core.vertex_index import index_vertices
+
+DEFAULT_FOLDERS = [
+    "scenes/human_body/andar",
+    "scenes/human_body/olhar",
+    "scenes/human_body/sitStand",
+    "scenes/human_body/dormir",
+    "scenes/human_body/acordar",
+    "scenes/mom",
+]
+
+
+def frame_number(filename):
+    numbers = re.findall(r"\d+", os.path.basename(filename))
+    return int(numbers[0]) if numbers else 0
+
+
+def index_size(vertex_count):
+    return 2 if vertex_count <= 65536 else 4
+
+
+def per_frame_bytes(frame_data):
+    """VRAM de um frame como objeto próprio: (sem índices, indexado)"""
+    arrays_bytes = 0
+    indexed_bytes = 0
+    for _, positions, uvs in frame_data:
+        if len(uvs) != len(positions):
+            uvs = np.zeros((len(positions), 2), dtype=np.float32)
+        arrays, indices = index_vertices([positions, uvs])
+        arrays_bytes += 4 * (3 + 2) * len(positions)
+        indexed_bytes += 4 * (3 + 2) * len(arrays[0]) + index_size(len(arrays[0])) * len(indices)
+    return arrays_bytes, indexed_bytes
+
+
+def clip_bytes(frame_data_list):
+    """VRAM do AnimationClip: textura de frames + posições do frame 0 e cores + índices"""
+    part_list, positions, used_frames = pack_frames(frame_data_list)
+    half_float = half_float_error(positions) <= HALF_FLOAT_TOLERANCE
+    width, height, _ = frame_texture_data(positions)
+    vertex_count = positions.shape[1]
+    index_count = sum(len(indices) for _, indices, _, _ in part_list)
+    total = (width * height * 3 * (2 if half_float else 4) + 4 * (3 + 3) * vertex_count
+             + index_size(vertex_count) * index_count)
+    return total, len(used_frames), vertex_count, half_float
+
+
+def main(folders):
+    for folder in folders:
+        files = sorted(glob.glob(os.path.join(folder, "*.obj")), key=frame_number)
+        if not files:
+            print(f"⏭️ {folder}: sem frames")
+            continue
+        frame_data_list = [my_obj_reader_arrays(f) for f in files]
+        arrays_total = 0
+        indexed_total = 0
+        for frame_data in frame_data_list:
+            arrays_bytes, indexed_bytes = per_frame_bytes(frame_data)
+            arrays_total += arrays_bytes
+            indexed_total += indexed_bytes
+        start = time.perf_counter()
+        total, frame_count, vertex_count, half_float = clip_bytes(frame_data_list)
+        pack_time = time.perf_counter() - start
+        print(f"🎞️ {folder}: {frame_count} frames x {vertex_count} vértices "
+              f"({'half float' if half_float else 'float'})")
+        print(f"   frames sem índices: {arrays_total / 2**20:8.2f} MB")
+        print(f"   frames indexados:   {indexed_total / 2**20:8.2f} MB")
+        print(f"   AnimationClip:      {total / 2**20:8.2f} MB "
+              f"({arrays_total / total:.1f}x / {indexed_total / total:.1f}x menos)")
+        print(f"   tempo de empacotamento: {pack_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_FOLDERS)
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""
+Benchmark do leitor de OBJ: compara o leitor original (linha a linha) com o
+leitor vetorizado e com a leitura da cache binária, em tempo e pico de memória.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.obj_reader_benchmark [ficheiros.obj ...]
+"""
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from core import mesh_cache
+from core.obj_reader import OBJ_READER_VERSION, my_obj_reader, my_obj_reader_arrays, my_obj_reader_legacy
+
+DEFAULT_FILES = [
+    "scenes/music_scene/salamusica.obj",
+    "scenes/bedroom_scene/quarto.obj",
+    "scenes/kitchen_scene/cozinha.obj",
+    "scenes/rally/rally.obj",
+    "scenes/objects/flauta.obj",
+] + sorted(glob.glob("scenes/human_body/*/*.obj")) + sorted(glob.glob("scenes/mom/*.obj"))
+
+
+def measure(reader, filename, repeats=3):
+    """Devolve (melhor tempo em segundos, pico de memória em bytes, resultado)."""
+    best_time = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = reader(filename)
+        best_time = min(best_time, time.perf_counter() - start)
+    tracemalloc.start()
+    reader(filename)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best_time, peak, result
+
+
+def same_data(reference, candidate):
+    """Compara os grupos ao nível de float32 (o que é enviado para a GPU)."""
+    if [name for name, _, _ in reference] != [name for name, _, _ in candidate]:
+        return False
+    for (_, ref_pos, ref_uv), (_, pos, uv) in zip(reference, candidate):
+        if not np.array_equal(np.asarray(ref_pos, dtype=np.float32), np.asarray(pos, dtype=np.float32)):
+            return False
+        if not np.array_equal(np.asarray(ref_uv, dtype=np.float32), np.asarray(uv, dtype=np.float32)):
+            return False
+    return True
+
+
+def main(files):
+    files = [f for f in files if os.path.exists(f)]
+    if not files:
+        print("❌ Nenhum ficheiro .obj encontrado")
+        return
+    readers = [
+        ("legacy", my_obj_reader_legacy),
+        ("listas", lambda f: my_obj_reader(f, use_cache=False)),
+        ("arrays", lambda f: my_obj_reader_arrays(f, use_cache=False)),
+        ("cache", lambda f: my_obj_reader_arrays(f, use_cache=True)),
+    ]
+    # Garante que a leitura "cache" mede só o mapeamento dos ficheiros
+    for filename in files:
+        if mesh_cache.load(filename, OBJ_READER_VERSION) is None:
+            my_obj_reader_arrays(filename, use_cache=True)
+    totals = {name: [0.0, 0] for name, _ in readers}
+    print(f"{'ficheiro':40s} {'leitor':>8s} {'tempo (ms)':>11s} {'pico (MB)':>10s} {'speedup':>8s}")
+    for filename in files:
+        reference_time = None
+        reference = None
+        for name, reader in readers:
+            elapsed, peak, result = measure(reader, filename)
+            if reference is None:
+                reference_time, reference = elapsed, result
+            elif not same_data(reference, result):
+                print(f"⚠️ {name} devolveu dados diferentes para {filename}")
+            totals[name][0] += elapsed
+            totals[name][1] = max(totals[name][1], peak)
+            print(f"{os.path.basename(filename):40s} {name:>8s} {elapsed * 1000:11.1f} "
+                  f"{peak / 2**20:10.1f} {reference_time / elapsed:7.1f}x")
+    print("-" * 81)
+    for name, (elapsed, peak) in totals.items():
+        print(f"{'TOTAL':40s} {name:>8s} {elapsed * 1000:11.1f} {peak / 2**20:10.1f} "
+              f"{totals['legacy'][0] / elapsed:7.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_FILES)
@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+"""
+Benchmark da construção das listas de render (meshes e luzes) em função do número
+de nós da cena: compara a travessia original (pop(0) + concatenação de listas,
+feita duas vezes por frame e filtrada com isinstance) com as listas em cache do
+Object3D, e mede também o custo de reconstruir a cache depois de um add/remove.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.render_list_benchmark [número de nós ...]
+"""
+import sys
+import time
+
+from core_ext.object3d import Object3D
+
+DEFAULT_NODE_COUNTS = [100, 500, 1000, 5000, 20000]
+
+
+class FakeMesh(Object3D):
+    """Folha da cena (não precisa de OpenGL)"""
+
+
+class FakeLight(Object3D):
+    pass
+
+
+def legacy_descendant_list(root):
+    """Travessia original de Object3D.descendant_list"""
+    descendant_list = []
+    nodes_to_process = [root]
+    while len(nodes_to_process) > 0:
+        node = nodes_to_process.pop(0)
+        descendant_list.append(node)
+        nodes_to_process = node.children_list + nodes_to_process
+    return descendant_list
+
+
+def legacy_render_lists(scene):
+    """O que o Renderer.render fazia por frame: duas travessias e três filtros"""
+    descendant_list = legacy_descendant_list(scene)
+    mesh_list = list(filter(lambda x: isinstance(x, FakeMesh), descendant_list))
+    descendant_list = legacy_descendant_list(scene)
+    mesh_list = list(filter(lambda x: isinstance(x, FakeMesh), descendant_list))
+    light_list = list(filter(lambda x: isinstance(x, FakeLight), descendant_list))
+    return mesh_list, light_list
+
+
+def cached_render_lists(scene):
+    return scene.get_descendants_by_type(FakeMesh), scene.get_descendants_by_type(FakeLight)
+
+
+def build_scene(node_count):
+    """Cena parecida com as salas: grupos com dezenas de meshes e algumas luzes"""
+    scene = Object3D()
+    for light_number in range(4):
+        scene.add(FakeLight())
+    group = None
+    for mesh_number in range(node_count):
+        if mesh_number % 50 == 0:
+            group = Object3D()
+            scene.add(group)
+        group.add(FakeMesh())
+    return scene
+
+
+def best_time(function, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(node_counts):
+    print(f"{'nós':>8s} {'original (ms)':>14s} {'cache (µs)':>11s} {'rebuild (ms)':>13s} {'speedup':>9s}")
+    for node_count in node_counts:
+        scene = build_scene(node_count)
+        legacy = legacy_render_lists(scene)
+        assert cached_render_lists(scene) == (legacy[0], legacy[1])
+        repeats = 3 if node_count > 5000 else 10
+        legacy_time = best_time(lambda: legacy_render_lists(scene), repeats)
+        cached_time = best_time(lambda: cached_render_lists(scene), 100)
+
+        # Custo de um frame em que a árvore mudou (ex.: troca de frame do humano)
+        def rebuild():
+            extra = FakeMesh()
+            scene.add(extra)
+            cached_render_lists(scene)
+            scene.remove(extra)
+        rebuild_time = best_time(rebuild, repeats)
+        print(f"{node_count:8d} {legacy_time * 1000:14.2f} {cached_time * 1e6:11.2f} "
+              f"{rebuild_time * 1000:13.2f} {legacy_time / cached_time:8.0f}x")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or DEFAULT_NODE_COUNTS)
@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+"""
+Benchmark do trabalho de matrizes por frame numa cena como a da cozinha: a sala
+(centenas de meshes estáticas), o humano a mexer-se e a câmara a mover-se.
+
+Compara o Object3D.global_matrix original (multiplicação recursiva até à raiz em
+cada acesso) com as matrizes globais em cache com dirty flags. Por frame simula o
+que o Renderer faz: modelMatrix de cada mesh na passagem de sombras e na principal,
+e a posição da câmara (viewPosition) para cada mesh iluminada.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.world_matrix_benchmark [ficheiro.obj | número de meshes]
+"""
+import math
+import os
+import sys
+import time
+
+from core_ext.object3d import Object3D
+
+KITCHEN_OBJ = "scenes/kitchen_scene/cozinha.obj"
+# Nº de objetos da cozinha quando o .obj não está disponível
+DEFAULT_MESH_COUNT = 400
+HUMAN_PART_COUNT = 10
+FRAMES = 200
+
+
+def legacy_global_matrix(node):
+    """Object3D.global_matrix original"""
+    if node.parent is None:
+        return node.local_matrix
+    return legacy_global_matrix(node.parent) @ node.local_matrix
+
+
+def legacy_global_position(node):
+    """Object3D.global_position original: três acessos à matriz global"""
+    return [legacy_global_matrix(node).item((0, 3)),
+            legacy_global_matrix(node).item((1, 3)),
+            legacy_global_matrix(node).item((2, 3))]
+
+
+def cached_global_matrix(node):
+    return node.global_matrix
+
+
+def cached_global_position(node):
+    return node.global_position
+
+
+def mesh_count_from_args(argv):
+    if argv and argv[0].isdigit():
+        return int(argv[0]), "argumento"
+    obj_path = argv[0] if argv else KITCHEN_OBJ
+    if os.path.exists(obj_path):
+        from core.obj_reader import my_obj_reader_arrays
+        return len(my_obj_reader_arrays(obj_path)), obj_path
+    return DEFAULT_MESH_COUNT, "estimativa (sem .obj)"
+
+
+def build_scene(mesh_count):
+    """Cena -> cozinha (escala 0.1) -> meshes; cena -> humano -> partes; rig -> câmara"""
+    scene = Object3D()
+    kitchen = Object3D()
+    kitchen.scale(0.1)
+    scene.add(kitchen)
+    meshes = []
+    for mesh_number in range(mesh_count):
+        mesh = Object3D()
+        mesh.translate(mesh_number % 20, 0, mesh_number // 20)
+        kitchen.add(mesh)
+        meshes.append(mesh)
+    human = Object3D()
+    scene.add(human)
+    for _ in range(HUMAN_PART_COUNT):
+        part = Object3D()
+        human.add(part)
+        meshes.append(part)
+    rig = Object3D()
+    camera = Object3D()
+    rig.add(camera)
+    scene.add(rig)
+    return scene, meshes, human, rig, camera
+
+
+def run_frames(mesh_count, global_matrix, global_position):
+    scene, meshes, human, rig, camera = build_scene(mesh_count)
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        # Animação: o humano anda e roda, a câmara segue-o
+        human.set_position([math.sin(frame * 0.05), 0.09, frame * 0.01])
+        human.set_rotation_y(frame * 0.02)
+        rig.translate(0, 0, 0.01)
+        # Renderer: inversa da matriz da câmara
+        global_matrix(camera)
+        # Passagem de sombras
+        for mesh in meshes:
+            global_matrix(mesh)
+        # Passagem principal: modelMatrix + viewPosition
+        for mesh in meshes:
+            global_matrix(mesh)
+            global_position(camera)
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main(argv):
+    mesh_count, source = mesh_count_from_args(argv)
+    print(f"🍽️ Cozinha: {mesh_count} meshes ({source}) + humano com {HUMAN_PART_COUNT} partes, "
+          f"{FRAMES} frames")
+    legacy_time = run_frames(mesh_count, legacy_global_matrix, legacy_global_position)
+    cached_time = run_frames(mesh_count, cached_global_matrix, cached_global_position)
+    print(f"   original: {legacy_time * 1000:8.3f} ms/frame")
+    print(f"   cache:    {cached_time * 1000:8.3f} ms/frame ({legacy_time / cached_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,15 +1,46 @@
+import ctypes
+
 import OpenGL.GL as GL
 import numpy as np
 
+from core.buffer_store import buffer_store
 
 class Attribute:
-    def __init__(self, data_type, data):
-        # type of elements in data array: int | float | vec2 | vec3 | vec4
+    # Buffer usage hints: "static" (uploaded once), "dynamic" (updated often),
+    # "stream" (replaced every frame)
+    USAGE_DICT = {
+        "static": GL.GL_STATIC_DRAW,
+        "dynamic": GL.GL_DYNAMIC_DRAW,
+        "stream": GL.GL_STREAM_DRAW,
+    }
+    # Number of components and array type of each data type
+    FORMAT_DICT = {
+        "int": (1, np.int32),
+        "float": (1, np.float32),
+        "vec2": (2, np.float32),
+        "vec3": (3, np.float32),
+        "vec4": (4, np.float32),
+        # one 4x4 matrix per element, stored column by column (occupies four variable locations)
+        "mat4": (16, np.float32),
+    }
+
+    def __init__(self, data_type, data, usage="static", divisor=0, shared=False):
+        # type of elements in data array: int | float | vec2 | vec3 | vec4 | mat4
         self._data_type = data_type
+        # how often the data is expected to change: static | dynamic | stream
+        self._usage = usage
+        # 0: one element per vertex; 1: one element per instance (instanced drawing)
+        self._divisor = divisor
         # array of data to be stored in buffer
-        self._data = data
+        self._data = self._to_array(data)
+        # Shared: the buffer comes from the buffer store and may be used by other
+        # attributes with the same data, so it must not be changed in place
+        self._shared = shared
         # reference of available buffer from GPU
-        self._buffer_ref = GL.glGenBuffers(1)
+        self._buffer_ref = None if shared else GL.glGenBuffers(1)
+        # size (in bytes) and usage of the storage currently allocated for the buffer
+        self._buffer_size = None
+        self._buffer_usage = None
         # Upload data immediately
         self.upload_data()
 
@@ -19,16 +50,97 @@ class Attribute:
 
     @data.setter
     def data(self, data):
-        self._data = data
+        self._data = self._to_array(data)
+
+    @property
+    def data_type(self):
+        return self._data_type
+
+    @property
+    def divisor(self):
+        return self._divisor
+
+    @property
+    def usage(self):
+        return self._usage
+
+    @usage.setter
+    def usage(self, usage):
+        # Takes effect on the next upload_data
+        self._usage = usage
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    @property
+    def shared(self):
+        return self._shared
+
+    def _to_array(self, data):
+        """
+        Store data as a contiguous array of the attribute type.
+        Arrays that already have the right type and layout are used without copying.
+        """
+        if self._data_type not in Attribute.FORMAT_DICT:
+            raise Exception(f'Attribute has unknown type {self._data_type}')
+        components, dtype = Attribute.FORMAT_DICT[self._data_type]
+        array = np.ascontiguousarray(data, dtype=dtype)
+        if components > 1 and (array.ndim != 2 or array.shape[1] != components):
+            array = array.reshape(-1, components)
+        return array
 
     def upload_data(self):
-        """ Upload the data to a GPU buffer """
-        # Convert data to numpy array format; convert numbers to 32-bit floats
-        data = np.array(self._data).astype(np.float32)
+        """
+        Upload the data to a GPU buffer.
+        A shared attribute switches to the buffer holding its new data, so meshes
+        created before the change must be created again.
+        """
+        if self._shared:
+            buffer_ref = buffer_store.acquire(self._data, Attribute.USAGE_DICT[self._usage])
+            if self._buffer_ref is not None:
+                buffer_store.release(self._buffer_ref)
+            self._buffer_ref = buffer_ref
+            return
         # Select buffer used by the following functions
         GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._buffer_ref)
-        # Store data in currently bound buffer
-        GL.glBufferData(GL.GL_ARRAY_BUFFER, data.ravel(), GL.GL_STATIC_DRAW)
+        if self._buffer_size == self._data.nbytes and self._buffer_usage == self._usage:
+            # Same size: overwrite the existing storage instead of allocating a new one
+            if self._data.nbytes > 0:
+                GL.glBufferSubData(GL.GL_ARRAY_BUFFER, 0, self._data.nbytes, self._data)
+        else:
+            # Store data in currently bound buffer
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, self._data.nbytes, self._data,
+                            Attribute.USAGE_DICT[self._usage])
+            self._buffer_size = self._data.nbytes
+            self._buffer_usage = self._usage
+
+    def upload_range(self, start=0, stop=None):
+        """ Upload only elements [start, stop) of the data, which must have been changed in place """
+        if self._shared:
+            raise Exception("Shared attribute data cannot be changed in place")
+        if self._buffer_size != self._data.nbytes:
+            # The buffer does not have room for the current data yet
+            self.upload_data()
+            return
+        stop = len(self._data) if stop is None else stop
+        if stop <= start:
+            return
+        element_bytes = self._data.itemsize * (self._data.size // max(len(self._data), 1))
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._buffer_ref)
+        GL.glBufferSubData(GL.GL_ARRAY_BUFFER, start * element_bytes,
+                           (stop - start) * element_bytes, self._data[start:stop])
+
+    def update_range(self, start, data):
+        """ Replace the elements starting at index start with data and upload just that range """
+        if self._shared:
+            raise Exception("Shared attribute data cannot be changed in place")
+        data = self._to_array(data)
+        if not self._data.flags.writeable:
+            # e.g. read-only arrays mapped from the mesh cache
+            self._data = self._data.copy()
+        self._data[start:start + len(data)] = data
+        self.upload_range(start, start + len(data))
 
     def associate_variable(self, program_ref, variable_name):
         """ Associate variable in program with the buffer """
@@ -40,7 +152,7 @@ class Attribute:
             GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._buffer_ref)
             # Specify how data will be read from the currently bound buffer into the specified variable
             if self._data_type == "int":
-                GL.glVertexAttribPointer(variable_ref, 1, GL.GL_INT, False, 0, None)
+                GL.glVertexAttribIPointer(variable_ref, 1, GL.GL_INT, 0, None)
             elif self._data_type == "float":
                 GL.glVertexAttribPointer(variable_ref, 1, GL.GL_FLOAT, False, 0, None)
             elif self._data_type == "vec2":
@@ -49,7 +161,27 @@ class Attribute:
                 GL.glVertexAttribPointer(variable_ref, 3, GL.GL_FLOAT, False, 0, None)
             elif self._data_type == "vec4":
                 GL.glVertexAttribPointer(variable_ref, 4, GL.GL_FLOAT, False, 0, None)
+            elif self._data_type == "mat4":
+                # Each column is read into its own location, as a vec4
+                for column in range(4):
+                    GL.glVertexAttribPointer(variable_ref + column, 4, GL.GL_FLOAT, False, 64,
+                                             ctypes.c_void_p(16 * column))
+                    GL.glVertexAttribDivisor(variable_ref + column, self._divisor)
+                    GL.glEnableVertexAttribArray(variable_ref + column)
+                return
             else:
                 raise Exception(f'Attribute {variable_name} has unknown type {self._data_type}')
+            # Advance to the next element once per vertex or once per instance
+            if self._divisor:
+                GL.glVertexAttribDivisor(variable_ref, self._divisor)
             # Indicate that data will be streamed to this variable
             GL.glEnableVertexAttribArray(variable_ref)
+
+    def delete(self):
+        """ Free the GPU buffer; the object must not be used afterwards """
+        if self._buffer_ref is not None:
+            if self._shared:
+                buffer_store.release(self._buffer_ref)
+            else:
+                GL.glDeleteBuffers(1, [self._buffer_ref])
+            self._buffer_ref = None
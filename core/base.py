@@ -1,29 +1,19 @@
 import pygame
 import sys
 
+from core.context import create_context
 from core.input import Input
 from core.utils import Utils
 
 
 class Base:
-    def __init__(self, screen_size=(800, 600), fullscreen=False):
-        # Initialize all pygame modules
-        pygame.init()
-        if fullscreen:
-            self.screen = pygame.display.set_mode(screen_size, pygame.FULLSCREEN)
-        else:
-            self.screen = pygame.display.set_mode(screen_size)
-        # Indicate rendering details
-        display_flags = pygame.DOUBLEBUF | pygame.OPENGL
-        # Initialize buffers to perform antialiasing
-        pygame.display.gl_set_attribute(pygame.GL_MULTISAMPLEBUFFERS, 1)
-        pygame.display.gl_set_attribute(pygame.GL_MULTISAMPLESAMPLES, 4)
-        # Use a core OpenGL profile for cross-platform compatibility
-        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_PROFILE_MASK, pygame.GL_CONTEXT_PROFILE_CORE)
-        # Create and display the window
-        self._screen = pygame.display.set_mode(screen_size, display_flags)
-        # Set the text that appears in the title bar of the window
-        pygame.display.set_caption("Graphics Window")
+    def __init__(self, screen_size=(800, 600), fullscreen=False, headless=None):
+        """
+        headless: render offscreen, without a window (needs PYOPENGL_PLATFORM=egl or osmesa;
+        by default headless exactly when that variable is set)
+        """
+        # Window with an OpenGL context, or an offscreen context and framebuffer
+        self._context = create_context(screen_size, fullscreen, headless)
         # Determine if main loop is active
         self._running = True
         # Manage time-related data and operations
@@ -35,6 +25,10 @@ class Base:
         # Print the system information
         Utils.print_system_info()
 
+    @property
+    def context(self):
+        return self._context
+
     @property
     def delta_time(self):
         return self._delta_time
@@ -59,6 +53,18 @@ class Base:
         """ Implement by extending class """
         pass
 
+    def step(self, delta_time):
+        """
+        Advance the application by delta_time seconds (update and render one frame).
+        Called by run with the measured frame time, or from outside with a fixed
+        time step (e.g. exporting video frames)
+        """
+        self._delta_time = delta_time
+        # Increment time application has been running
+        self._time += delta_time
+        # Update #
+        self.update()
+
     def run(self):
         # Startup #
         self.initialize()
@@ -69,16 +75,13 @@ class Base:
             if self._input.quit:
                 self._running = False
             # seconds since iteration of run loop
-            self._delta_time = self._clock.get_time() / 1000
-            # Increment time application has been running
-            self._time += self._delta_time
-            # Update #
-            self.update()
+            self.step(self._clock.get_time() / 1000)
             # Render #
-            # Display image on screen
-            pygame.display.flip()
+            # Display image on screen (or finish the offscreen frame)
+            self._context.swap_buffers()
             # Pause if necessary to achieve 60 FPS
             self._clock.tick(60)
         # Shutdown #
+        self._context.delete()
         pygame.quit()
         sys.exit()
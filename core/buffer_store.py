@@ -0,0 +1,90 @@
+import hashlib
+
+import OpenGL.GL as GL
+
+
+class BufferStore:
+    """
+    Content-addressed GPU buffers: arrays with the same bytes (for example the groups
+    that do not move between the frames of an animation) are uploaded once and share
+    one buffer. Buffers are reference counted and deleted when the last user releases
+    them. Shared buffers are read-only: new contents get a different buffer.
+    """
+    def __init__(self):
+        # content key -> [buffer reference, reference count, size in bytes]
+        self._buffer_dict = {}
+        # buffer reference -> content key
+        self._key_dict = {}
+        # statistics
+        self._hits = 0
+        self._misses = 0
+        self._bytes_requested = 0
+        self._bytes_saved = 0
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def buffer_count(self):
+        return len(self._buffer_dict)
+
+    @property
+    def bytes_saved(self):
+        return self._bytes_saved
+
+    @property
+    def gpu_bytes_resident(self):
+        return sum(entry[2] for entry in self._buffer_dict.values())
+
+    @staticmethod
+    def make_key(array, usage):
+        # BLAKE2 is one of the fastest hashes in hashlib and long enough to ignore collisions
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(array)
+        return digest.hexdigest(), array.dtype.str, array.shape, usage
+
+    def acquire(self, array, usage=GL.GL_STATIC_DRAW):
+        """ Buffer holding the bytes of a contiguous array, uploaded on first use """
+        key = self.make_key(array, usage)
+        entry = self._buffer_dict.get(key)
+        if entry is None:
+            buffer_ref = GL.glGenBuffers(1)
+            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, buffer_ref)
+            GL.glBufferData(GL.GL_ARRAY_BUFFER, array.nbytes, array, usage)
+            entry = [buffer_ref, 0, array.nbytes]
+            self._buffer_dict[key] = entry
+            self._key_dict[buffer_ref] = key
+            self._misses += 1
+        else:
+            self._hits += 1
+            self._bytes_saved += array.nbytes
+        entry[1] += 1
+        self._bytes_requested += array.nbytes
+        return entry[0]
+
+    def release(self, buffer_ref):
+        """ Drop one reference; the buffer is deleted when nobody uses it """
+        key = self._key_dict[buffer_ref]
+        entry = self._buffer_dict[key]
+        entry[1] -= 1
+        if entry[1] == 0:
+            GL.glDeleteBuffers(1, [buffer_ref])
+            del self._buffer_dict[key]
+            del self._key_dict[buffer_ref]
+
+    def report(self):
+        total = self._hits + self._misses
+        ratio = self._bytes_requested / max(self._bytes_requested - self._bytes_saved, 1)
+        print(f"🧮 Buffers partilhados: {self.buffer_count} na GPU para {total} pedidos "
+              f"({self._hits} reutilizados, {ratio:.1f}x)")
+        print(f"   💾 Poupado: {self._bytes_saved / 2**20:.1f} MB | "
+              f"Residente: {self.gpu_bytes_resident / 2**20:.1f} MB")
+
+
+# Shared instance used by Attribute and IndexBuffer
+buffer_store = BufferStore()
@@ -0,0 +1,287 @@
+import os
+
+import numpy as np
+import OpenGL
+import OpenGL.GL as GL
+import pygame
+
+# PyOpenGL platforms that create contexts without a window. The platform is chosen when
+# OpenGL is first imported, so PYOPENGL_PLATFORM must be set before that (in the shell,
+# or at the top of the main script)
+HEADLESS_PLATFORMS = ("egl", "osmesa")
+
+# Context being rendered to (the Renderer reads its size and default framebuffer)
+_current_context = None
+
+
+def get_current_context():
+    if _current_context is None:
+        raise Exception("No OpenGL context: create a Base (or call create_context) first")
+    return _current_context
+
+
+def headless_requested():
+    """ True when PyOpenGL was set up for offscreen contexts (PYOPENGL_PLATFORM=egl or osmesa) """
+    return os.environ.get("PYOPENGL_PLATFORM", "").lower() in HEADLESS_PLATFORMS
+
+
+def create_context(size=(800, 600), fullscreen=False, headless=None, hidden=False):
+    """
+    Window context, or headless context when headless is True
+    (by default, when PYOPENGL_PLATFORM selects a headless platform)
+    """
+    if headless is None:
+        headless = headless_requested()
+    if headless:
+        return HeadlessContext(size)
+    return WindowContext(size, fullscreen, hidden)
+
+
+class Context:
+    """ Where frames are drawn: size, default framebuffer, presenting and reading back frames """
+    def __init__(self, size):
+        self._size = tuple(size)
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def headless(self):
+        return False
+
+    @property
+    def framebuffer_ref(self):
+        """ Framebuffer bound by the Renderer when no render target is given """
+        return 0
+
+    @property
+    def read_framebuffer_ref(self):
+        """ Framebuffer holding the finished frame (after resolve) """
+        return 0
+
+    def make_current(self):
+        global _current_context
+        _current_context = self
+
+    def resolve(self):
+        """ Make the last frame readable from read_framebuffer_ref """
+        pass
+
+    def swap_buffers(self):
+        pass
+
+    def read_pixels(self):
+        """ Last frame as an array (height, width, 3) of bytes, top row first """
+        self.resolve()
+        width, height = self._size
+        GL.glBindFramebuffer(GL.GL_READ_FRAMEBUFFER, self.read_framebuffer_ref)
+        GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 1)
+        data = GL.glReadPixels(0, 0, width, height, GL.GL_RGB, GL.GL_UNSIGNED_BYTE)
+        # OpenGL rows start at the bottom
+        return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)[::-1]
+
+    def delete(self):
+        global _current_context
+        if _current_context is self:
+            _current_context = None
+
+
+class WindowContext(Context):
+    """ A pygame window with a double-buffered OpenGL 3.3 core context """
+    def __init__(self, size=(800, 600), fullscreen=False, hidden=False):
+        super().__init__(size)
+        # Initialize all pygame modules
+        pygame.init()
+        # Indicate rendering details
+        display_flags = pygame.DOUBLEBUF | pygame.OPENGL
+        if fullscreen:
+            display_flags |= pygame.FULLSCREEN
+        if hidden:
+            display_flags |= pygame.HIDDEN
+        # Initialize buffers to perform antialiasing
+        pygame.display.gl_set_attribute(pygame.GL_MULTISAMPLEBUFFERS, 1)
+        pygame.display.gl_set_attribute(pygame.GL_MULTISAMPLESAMPLES, 4)
+        # Use a core OpenGL profile for cross-platform compatibility
+        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_PROFILE_MASK, pygame.GL_CONTEXT_PROFILE_CORE)
+        # Create and display the window
+        self._screen = pygame.display.set_mode(size, display_flags)
+        # Fullscreen windows take the size of the display
+        self._size = self._screen.get_size()
+        # Set the text that appears in the title bar of the window
+        pygame.display.set_caption("Graphics Window")
+        self.make_current()
+
+    def swap_buffers(self):
+        # Display image on screen
+        pygame.display.flip()
+
+
+class HeadlessContext(Context):
+    """
+    An OpenGL 3.3 core context without a window, through EGL (GPU drivers, or Mesa
+    llvmpipe on machines without a GPU) or OSMesa (Mesa software rendering).
+    Frames are drawn into a multisampled framebuffer object of the requested size,
+    resolved into a plain one for reading back.
+    pygame is still used for timing and (empty) input, with its dummy video driver.
+    """
+    def __init__(self, size=(800, 600), samples=4):
+        super().__init__(size)
+        platform = type(OpenGL.platform.PLATFORM).__name__.lower()
+        if "egl" in platform:
+            self._backend = "egl"
+        elif "osmesa" in platform:
+            self._backend = "osmesa"
+        else:
+            raise Exception("Headless rendering needs PYOPENGL_PLATFORM=egl or osmesa "
+                            "set before OpenGL is imported")
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.init()
+        self._samples = samples
+        if self._backend == "egl":
+            self._create_egl_context()
+        else:
+            self._create_osmesa_context()
+        self._create_framebuffers()
+        self.make_current()
+
+    @property
+    def headless(self):
+        return True
+
+    @property
+    def backend(self):
+        return self._backend
+
+    @property
+    def framebuffer_ref(self):
+        return self._framebuffer_ref
+
+    @property
+    def read_framebuffer_ref(self):
+        return self._resolve_framebuffer_ref
+
+    def _create_egl_context(self):
+        # Imported here: the EGL and OSMesa bindings only load on their own platform
+        from OpenGL import EGL
+        # Mesa picks a display server by default; without one, render to no surface at all
+        if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+            os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+        self._egl_display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+        major, minor = EGL.EGLint(), EGL.EGLint()
+        if not EGL.eglInitialize(self._egl_display, major, minor):
+            raise Exception("EGL could not be initialized")
+        config_attributes = [
+            EGL.EGL_SURFACE_TYPE, EGL.EGL_PBUFFER_BIT,
+            EGL.EGL_RED_SIZE, 8,
+            EGL.EGL_GREEN_SIZE, 8,
+            EGL.EGL_BLUE_SIZE, 8,
+            EGL.EGL_DEPTH_SIZE, 24,
+            EGL.EGL_RENDERABLE_TYPE, EGL.EGL_OPENGL_BIT,
+            EGL.EGL_NONE
+        ]
+        configs = (EGL.EGLConfig * 1)()
+        config_count = EGL.EGLint()
+        if not EGL.eglChooseConfig(self._egl_display, (EGL.EGLint * len(config_attributes))(*config_attributes),
+                                   configs, 1, config_count) or config_count.value == 0:
+            raise Exception("EGL has no configuration for OpenGL rendering")
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        context_attributes = [
+            EGL.EGL_CONTEXT_MAJOR_VERSION, 3,
+            EGL.EGL_CONTEXT_MINOR_VERSION, 3,
+            EGL.EGL_CONTEXT_OPENGL_PROFILE_MASK, EGL.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT,
+            EGL.EGL_NONE
+        ]
+        self._egl_context = EGL.eglCreateContext(self._egl_display, configs[0], EGL.EGL_NO_CONTEXT,
+                                                 (EGL.EGLint * len(context_attributes))(*context_attributes))
+        if self._egl_context == EGL.EGL_NO_CONTEXT:
+            raise Exception("EGL could not create an OpenGL 3.3 core context")
+        # No surface: everything is drawn into the framebuffer objects
+        if not EGL.eglMakeCurrent(self._egl_display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, self._egl_context):
+            raise Exception("EGL could not make the context current")
+
+    def _create_osmesa_context(self):
+        from OpenGL import arrays, osmesa
+        attributes = arrays.GLintArray.asArray([
+            osmesa.OSMESA_FORMAT, osmesa.OSMESA_RGBA,
+            osmesa.OSMESA_DEPTH_BITS, 24,
+            osmesa.OSMESA_PROFILE, osmesa.OSMESA_CORE_PROFILE,
+            osmesa.OSMESA_CONTEXT_MAJOR_VERSION, 3,
+            osmesa.OSMESA_CONTEXT_MINOR_VERSION, 3,
+            0
+        ])
+        self._osmesa_context = osmesa.OSMesaCreateContextAttribs(attributes, None)
+        if not self._osmesa_context:
+            raise Exception("OSMesa could not create an OpenGL 3.3 core context")
+        # OSMesa needs a buffer of its own, although frames go to the framebuffer objects
+        width, height = self._size
+        self._osmesa_buffer = arrays.GLubyteArray.zeros((height, width, 4))
+        if not osmesa.OSMesaMakeCurrent(self._osmesa_context, self._osmesa_buffer, GL.GL_UNSIGNED_BYTE,
+                                        width, height):
+            raise Exception("OSMesa could not make the context current")
+
+    @staticmethod
+    def _create_renderbuffer(internal_format, width, height, samples):
+        renderbuffer_ref = GL.glGenRenderbuffers(1)
+        GL.glBindRenderbuffer(GL.GL_RENDERBUFFER, renderbuffer_ref)
+        if samples > 0:
+            GL.glRenderbufferStorageMultisample(GL.GL_RENDERBUFFER, samples, internal_format, width, height)
+        else:
+            GL.glRenderbufferStorage(GL.GL_RENDERBUFFER, internal_format, width, height)
+        return renderbuffer_ref
+
+    def _create_framebuffers(self):
+        width, height = self._size
+        # Frames are drawn here (antialiased, like the window)
+        self._framebuffer_ref = GL.glGenFramebuffers(1)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self._framebuffer_ref)
+        self._renderbuffer_refs = [
+            self._create_renderbuffer(GL.GL_RGBA8, width, height, self._samples),
+            self._create_renderbuffer(GL.GL_DEPTH_COMPONENT24, width, height, self._samples),
+        ]
+        GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_COLOR_ATTACHMENT0, GL.GL_RENDERBUFFER,
+                                     self._renderbuffer_refs[0])
+        GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_DEPTH_ATTACHMENT, GL.GL_RENDERBUFFER,
+                                     self._renderbuffer_refs[1])
+        if GL.glCheckFramebufferStatus(GL.GL_FRAMEBUFFER) != GL.GL_FRAMEBUFFER_COMPLETE:
+            raise Exception("Framebuffer status error")
+        # Multisampled pixels cannot be read directly: they are resolved into this one
+        if self._samples > 0:
+            self._resolve_framebuffer_ref = GL.glGenFramebuffers(1)
+            GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self._resolve_framebuffer_ref)
+            self._renderbuffer_refs.append(self._create_renderbuffer(GL.GL_RGBA8, width, height, 0))
+            GL.glFramebufferRenderbuffer(GL.GL_FRAMEBUFFER, GL.GL_COLOR_ATTACHMENT0, GL.GL_RENDERBUFFER,
+                                         self._renderbuffer_refs[2])
+            if GL.glCheckFramebufferStatus(GL.GL_FRAMEBUFFER) != GL.GL_FRAMEBUFFER_COMPLETE:
+                raise Exception("Framebuffer status error")
+        else:
+            self._resolve_framebuffer_ref = self._framebuffer_ref
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self._framebuffer_ref)
+        GL.glViewport(0, 0, width, height)
+
+    def resolve(self):
+        if self._resolve_framebuffer_ref == self._framebuffer_ref:
+            return
+        width, height = self._size
+        GL.glBindFramebuffer(GL.GL_READ_FRAMEBUFFER, self._framebuffer_ref)
+        GL.glBindFramebuffer(GL.GL_DRAW_FRAMEBUFFER, self._resolve_framebuffer_ref)
+        GL.glBlitFramebuffer(0, 0, width, height, 0, 0, width, height, GL.GL_COLOR_BUFFER_BIT, GL.GL_NEAREST)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self._framebuffer_ref)
+
+    def swap_buffers(self):
+        # Nothing is shown; make sure the frame is submitted to the GPU
+        GL.glFlush()
+
+    def delete(self):
+        framebuffer_refs = {self._framebuffer_ref, self._resolve_framebuffer_ref}
+        GL.glDeleteFramebuffers(len(framebuffer_refs), list(framebuffer_refs))
+        GL.glDeleteRenderbuffers(len(self._renderbuffer_refs), self._renderbuffer_refs)
+        if self._backend == "egl":
+            from OpenGL import EGL
+            EGL.eglMakeCurrent(self._egl_display, EGL.EGL_NO_SURFACE, EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+            EGL.eglDestroyContext(self._egl_display, self._egl_context)
+            EGL.eglTerminate(self._egl_display)
+        else:
+            from OpenGL import osmesa
+            osmesa.OSMesaDestroyContext(self._osmesa_context)
+        super().delete()
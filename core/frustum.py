@@ -0,0 +1,93 @@
+import numpy as np
+
+
+class Frustum:
+    """
+    The six clipping planes of a camera (left, right, bottom, top, near, far), taken
+    from its combined projection and view matrix, used to skip objects that cannot
+    appear on screen. Works for perspective and orthographic projections.
+    """
+    # Results of classify_boxes
+    OUTSIDE = 0
+    INTERSECTING = 1
+    INSIDE = 2
+
+    def __init__(self, matrix):
+        # A point p is inside when -w <= x, y, z <= w for (x, y, z, w) = matrix @ p,
+        # so each plane is the last row of the matrix plus or minus another row
+        matrix = np.asarray(matrix, dtype=np.float64)
+        planes = np.array([
+            matrix[3] + matrix[0],
+            matrix[3] - matrix[0],
+            matrix[3] + matrix[1],
+            matrix[3] - matrix[1],
+            matrix[3] + matrix[2],
+            matrix[3] - matrix[2],
+        ])
+        # Normalized, so the plane equation gives the signed distance to the plane
+        planes /= np.linalg.norm(planes[:, 0:3], axis=1, keepdims=True)
+        self._planes = planes
+
+    @classmethod
+    def from_camera(cls, camera):
+        """ Frustum of the camera's current view matrix (call camera.update_view_matrix first) """
+        return cls(camera.projection_matrix @ camera.view_matrix)
+
+    @property
+    def planes(self):
+        """ One row (a, b, c, d) per plane, with ax + by + cz + d >= 0 inside """
+        return self._planes
+
+    def contains_sphere(self, center, radius):
+        """ False only if the sphere is entirely outside one of the planes """
+        distances = self._planes[:, 0:3] @ np.asarray(center, dtype=np.float64) + self._planes[:, 3]
+        return bool((distances >= -radius).all())
+
+    def contains_spheres(self, centers, radii):
+        """ contains_sphere for many spheres at once: (n, 3) centers, n radii -> n booleans """
+        distances = np.asarray(centers, dtype=np.float64) @ self._planes[:, 0:3].T + self._planes[:, 3]
+        return (distances >= -np.asarray(radii, dtype=np.float64)[:, None]).all(axis=1)
+
+    def classify_boxes(self, box_mins, box_maxs):
+        """
+        Axis-aligned boxes (n, 3) against the frustum: OUTSIDE (behind one plane),
+        INSIDE (in front of all planes) or INTERSECTING, for each box
+        """
+        box_mins = np.asarray(box_mins, dtype=np.float64)
+        box_maxs = np.asarray(box_maxs, dtype=np.float64)
+        centers = (box_mins + box_maxs) / 2
+        extents = (box_maxs - box_mins) / 2
+        # Signed distance of each center to each plane, and how far the box reaches along the normal
+        distances = centers @ self._planes[:, 0:3].T + self._planes[:, 3]
+        reaches = extents @ np.abs(self._planes[:, 0:3]).T
+        result = np.full(len(box_mins), Frustum.INTERSECTING, dtype=np.int8)
+        result[(distances >= reaches).all(axis=1)] = Frustum.INSIDE
+        result[(distances < -reaches).any(axis=1)] = Frustum.OUTSIDE
+        return result
+
+    @staticmethod
+    def world_boxes(matrices, box_mins, box_maxs):
+        """
+        Axis-aligned boxes (n, 3) enclosing local boxes moved by (n, 4, 4) world matrices:
+        the center is transformed, and the half size grows by the absolute rotation and scale
+        """
+        matrices = np.asarray(matrices, dtype=np.float64)
+        box_mins = np.asarray(box_mins, dtype=np.float64)
+        box_maxs = np.asarray(box_maxs, dtype=np.float64)
+        centers = (np.einsum("nij,nj->ni", matrices[:, 0:3, 0:3], (box_mins + box_maxs) / 2)
+                   + matrices[:, 0:3, 3])
+        extents = np.einsum("nij,nj->ni", np.abs(matrices[:, 0:3, 0:3]), (box_maxs - box_mins) / 2)
+        return centers - extents, centers + extents
+
+    @staticmethod
+    def world_spheres(matrices, centers, radii):
+        """
+        Transform local bounding spheres by (n, 4, 4) world matrices. The radius grows
+        with the largest scale of each matrix, so the sphere stays conservative
+        under non-uniform scaling.
+        """
+        matrices = np.asarray(matrices, dtype=np.float64)
+        world_centers = (np.einsum("nij,nj->ni", matrices[:, 0:3, 0:3], np.asarray(centers, dtype=np.float64))
+                         + matrices[:, 0:3, 3])
+        scales = np.linalg.norm(matrices[:, 0:3, 0:3], axis=1).max(axis=1)
+        return world_centers, np.asarray(radii, dtype=np.float64) * scales
@@ -0,0 +1,81 @@
+import OpenGL.GL as GL
+import numpy as np
+
+from core.buffer_store import buffer_store
+
+class IndexBuffer:
+    """
+    Vertex indices of a geometry, drawn with glDrawElements.
+    Stored as unsigned short when every index fits, otherwise as unsigned int.
+    Shared index buffers come from the buffer store (see Attribute).
+    """
+    def __init__(self, data, shared=False):
+        self._data = None
+        self._index_type = None
+        self.data = data
+        self._shared = shared
+        # reference of available buffer from GPU
+        self._buffer_ref = None if shared else GL.glGenBuffers(1)
+        # Upload data immediately
+        self.upload_data()
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        data = np.asarray(data).ravel()
+        if len(data) > 0 and int(data.max()) > np.iinfo(np.uint16).max:
+            self._data = np.ascontiguousarray(data, dtype=np.uint32)
+            self._index_type = GL.GL_UNSIGNED_INT
+        else:
+            self._data = np.ascontiguousarray(data, dtype=np.uint16)
+            self._index_type = GL.GL_UNSIGNED_SHORT
+
+    @property
+    def buffer_ref(self):
+        return self._buffer_ref
+
+    @property
+    def count(self):
+        return len(self._data)
+
+    @property
+    def index_type(self):
+        return self._index_type
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    def upload_data(self):
+        """ Upload the indices to a GPU buffer """
+        # Upload through the array buffer target: the element array binding belongs to
+        # whichever vertex array object is bound, and is set up in Mesh instead
+        if self._shared:
+            buffer_ref = buffer_store.acquire(self._data)
+            if self._buffer_ref is not None:
+                buffer_store.release(self._buffer_ref)
+            self._buffer_ref = buffer_ref
+            return
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._buffer_ref)
+        GL.glBufferData(GL.GL_ARRAY_BUFFER, self._data.nbytes, self._data, GL.GL_STATIC_DRAW)
+
+    def update_range(self, start, data):
+        """ Replace the indices starting at position start and upload just that range """
+        if self._shared:
+            raise Exception("Shared index buffer cannot be changed in place")
+        data = np.asarray(data, dtype=self._data.dtype).ravel()
+        self._data[start:start + len(data)] = data
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self._buffer_ref)
+        GL.glBufferSubData(GL.GL_ARRAY_BUFFER, start * self._data.itemsize, data.nbytes, data)
+
+    def delete(self):
+        """ Free the GPU buffer; the object must not be used afterwards """
+        if self._buffer_ref is not None:
+            if self._shared:
+                buffer_store.release(self._buffer_ref)
+            else:
+                GL.glDeleteBuffers(1, [self._buffer_ref])
+            self._buffer_ref = None
@@ -0,0 +1,103 @@
+#!/usr/bin/python3
+"""
+Deteção de objetos repetidos.
+
+Muitos grupos dos OBJ das salas são cópias do mesmo objeto noutra posição (cordas
+da harpa, cadeiras, pratos, copos). find_identical_groups() encontra os grupos
+geometricamente iguais a menos de uma transformação rígida (rotação + translação)
+e devolve, para cada conjunto, o grupo de referência e a matriz que leva a
+referência a cada cópia, prontos para desenhar com instancing (ver InstancedMesh).
+
+Os vértices têm de estar pela mesma ordem nas cópias (é o que acontece quando o
+objeto foi duplicado no editor); a matriz é calculada com o algoritmo de Kabsch.
+
+Uso (a partir da raiz do projeto):
+    python -m core.instance_detect [ficheiros.obj ...]
+"""
+import sys
+
+import numpy as np
+
+# Erro máximo permitido, relativo ao tamanho do objeto
+DEFAULT_TOLERANCE = 1e-4
+
+
+def rigid_transform(reference, target):
+    """
+    Matriz 4x4 (rotação + translação) que melhor leva os pontos reference aos pontos
+    target correspondentes, e o maior erro depois de a aplicar
+    """
+    reference = np.asarray(reference, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    reference_center = reference.mean(axis=0)
+    target_center = target.mean(axis=0)
+    covariance = (reference - reference_center).T @ (target - target_center)
+    u, _, vt = np.linalg.svd(covariance)
+    # Garante uma rotação própria (sem reflexão)
+    sign = np.sign(np.linalg.det(vt.T @ u.T)) or 1.0
+    rotation = vt.T @ np.diag([1.0, 1.0, sign]) @ u.T
+    matrix = np.identity(4)
+    matrix[0:3, 0:3] = rotation
+    matrix[0:3, 3] = target_center - rotation @ reference_center
+    error = np.abs(reference @ rotation.T + matrix[0:3, 3] - target).max()
+    return matrix, error
+
+
+def _shape_signature(positions):
+    """Invariante a rotações e translações: nº de vértices e extensão nos eixos principais"""
+    centered = positions - positions.mean(axis=0)
+    extents = np.linalg.svd(centered, compute_uv=False) / np.sqrt(len(positions))
+    size = max(extents[0], 1e-12)
+    # Arredondado bem acima da tolerância, para cópias com pequenos erros caírem juntas
+    return len(positions), tuple(np.round(extents / size, 3)), round(float(np.log10(size)), 1)
+
+
+def find_identical_groups(items, tolerance=DEFAULT_TOLERANCE, min_count=2):
+    """
+    items: lista de (posições (n, 3), chave), em que só itens com a mesma chave podem
+    ser instâncias uns dos outros (ex.: mesmas UVs e o mesmo material).
+    Devolve [(índice da referência, [(índice, matriz 4x4), ...]), ...] com pelo menos
+    min_count itens por conjunto (a referência aparece na lista com a identidade).
+    """
+    buckets = {}
+    for index, (positions, key) in enumerate(items):
+        positions = np.asarray(positions, dtype=np.float64)
+        if len(positions) < 3:
+            continue
+        buckets.setdefault((key, _shape_signature(positions)), []).append(index)
+    result = []
+    for indices in buckets.values():
+        remaining = list(indices)
+        while len(remaining) >= min_count:
+            reference_index = remaining[0]
+            reference = np.asarray(items[reference_index][0], dtype=np.float64)
+            scale = max(np.ptp(reference, axis=0).max(), 1e-12)
+            matches = [(reference_index, np.identity(4))]
+            unmatched = []
+            for index in remaining[1:]:
+                matrix, error = rigid_transform(reference, items[index][0])
+                if error <= tolerance * scale:
+                    matches.append((index, matrix))
+                else:
+                    unmatched.append(index)
+            if len(matches) >= min_count:
+                result.append((reference_index, matches))
+            remaining = unmatched
+    return result
+
+
+def main(files):
+    from core.obj_reader import my_obj_reader_arrays
+    for filename in files:
+        groups = my_obj_reader_arrays(filename)
+        items = [(positions, np.asarray(uvs, dtype=np.float32).tobytes()) for _, positions, uvs in groups]
+        identical_groups = find_identical_groups(items)
+        instanced = sum(len(matches) for _, matches in identical_groups)
+        print(f"🔁 {filename}: {len(groups)} grupos, {instanced} em {len(identical_groups)} conjuntos de cópias")
+        for reference_index, matches in identical_groups:
+            names = [groups[index][0] for index, _ in matches]
+            print(f"   {len(names):3d} x {names[0]} ({', '.join(names[1:4])}{', ...' if len(names) > 4 else ''})")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
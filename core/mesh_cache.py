@@ -0,0 +1,167 @@
+#!/usr/bin/python3
+"""
+Cache binária dos OBJ já lidos.
+
+Para cada ficheiro .obj guarda, numa pasta de cache, as posições e UVs de todos os
+grupos concatenadas em dois ficheiros .npy (float32) e um índice .json com os nomes
+e intervalos de cada grupo. A entrada só é válida se o caminho, mtime, tamanho do
+.obj e a versão do leitor coincidirem; a leitura usa np.load(mmap_mode='r'), por
+isso abrir uma cena em cache é só mapear ficheiros.
+
+Uso (a partir da raiz do projeto):
+    python -m core.mesh_cache build [ficheiros ou pastas ...]
+    python -m core.mesh_cache invalidate [ficheiros ou pastas ...]
+    python -m core.mesh_cache status [ficheiros ou pastas ...]
+"""
+import hashlib
+import json
+import os
+import pathlib
+import sys
+
+import numpy as np
+
+# Pasta da cache; pode ser alterada com a variável de ambiente OBJ_CACHE_DIR
+CACHE_DIR = os.environ.get(
+    "OBJ_CACHE_DIR",
+    str(pathlib.Path(__file__).resolve().parents[1] / ".mesh_cache")
+)
+# Incrementar sempre que o formato da cache mudar
+CACHE_FORMAT_VERSION = 1
+# Pastas com OBJ usadas pela animação (alvo por omissão da CLI)
+DEFAULT_SOURCES = ["scenes"]
+
+
+def _entry_paths(filename):
+    """Caminhos (índice, posições, UVs) da entrada de cache de um .obj."""
+    source = os.path.abspath(filename)
+    digest = hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+    stem = os.path.join(CACHE_DIR, f"{pathlib.Path(source).stem}-{digest}")
+    return stem + ".json", stem + ".positions.npy", stem + ".uvs.npy"
+
+
+def _cache_key(filename, reader_version):
+    stat = os.stat(filename)
+    return {
+        "source": os.path.abspath(filename),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "reader_version": reader_version,
+        "format_version": CACHE_FORMAT_VERSION,
+    }
+
+
+def load(filename, reader_version):
+    """
+    Devolve os grupos em cache [(nome, posições, uvs), ...] como vistas de arrays
+    mapeados em memória, ou None se não existir entrada válida.
+    """
+    index_path, positions_path, uvs_path = _entry_paths(filename)
+    try:
+        with open(index_path, "r") as index_file:
+            index = json.load(index_file)
+        if index["key"] != _cache_key(filename, reader_version):
+            return None
+        if index["vertex_count"] > 0:
+            positions = np.load(positions_path, mmap_mode="r")
+            uvs = np.load(uvs_path, mmap_mode="r")
+        else:
+            # Não é possível mapear um array vazio
+            positions = np.load(positions_path)
+            uvs = np.load(uvs_path)
+    except (OSError, ValueError, KeyError):
+        return None
+    if len(positions) != index["vertex_count"] or len(uvs) != index["vertex_count"]:
+        return None
+    return [(name, positions[start:end], uvs[start:end])
+            for name, start, end in index["groups"]]
+
+
+def save(filename, reader_version, grouped_data):
+    """Grava os grupos lidos de um .obj; falhas de escrita não são fatais."""
+    index_path, positions_path, uvs_path = _entry_paths(filename)
+    groups = []
+    start = 0
+    for name, positions, _ in grouped_data:
+        groups.append((name, start, start + len(positions)))
+        start += len(positions)
+    index = {
+        "key": _cache_key(filename, reader_version),
+        "vertex_count": start,
+        "groups": groups,
+    }
+    all_positions = np.concatenate(
+        [np.asarray(p, dtype=np.float32).reshape(-1, 3) for _, p, _ in grouped_data]
+        or [np.zeros((0, 3), dtype=np.float32)]
+    )
+    all_uvs = np.concatenate(
+        [np.asarray(u, dtype=np.float32).reshape(-1, 2) for _, _, u in grouped_data]
+        or [np.zeros((0, 2), dtype=np.float32)]
+    )
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Escreve primeiro os dados e só no fim o índice, de forma atómica,
+        # para que uma entrada interrompida nunca seja considerada válida
+        for path, data in ((positions_path, all_positions), (uvs_path, all_uvs)):
+            with open(path + ".tmp", "wb") as data_file:
+                np.save(data_file, data)
+            os.replace(path + ".tmp", path)
+        with open(index_path + ".tmp", "w") as index_file:
+            json.dump(index, index_file)
+        os.replace(index_path + ".tmp", index_path)
+    except OSError as e:
+        print(f"⚠️ Não foi possível gravar a cache de {filename}: {e}")
+        return False
+    return True
+
+
+def invalidate(filename):
+    """Remove a entrada de cache de um .obj; devolve True se existia."""
+    removed = False
+    for path in _entry_paths(filename):
+        if os.path.exists(path):
+            os.remove(path)
+            removed = True
+    return removed
+
+
+def find_obj_files(paths):
+    """Expande ficheiros e pastas para a lista de .obj a tratar."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names) if n.endswith(".obj"))
+        elif path.endswith(".obj") and os.path.exists(path):
+            files.append(path)
+    return files
+
+
+def main(argv):
+    from core.obj_reader import OBJ_READER_VERSION, my_obj_reader_arrays
+
+    if not argv or argv[0] not in ("build", "invalidate", "status"):
+        print(__doc__)
+        return 1
+    command = argv[0]
+    files = find_obj_files(argv[1:] or DEFAULT_SOURCES)
+    print(f"📂 Cache: {CACHE_DIR} ({len(files)} ficheiros .obj)")
+    for filename in files:
+        if command == "build":
+            if load(filename, OBJ_READER_VERSION) is not None:
+                print(f"   ✅ {filename} (já em cache)")
+                continue
+            grouped_data = my_obj_reader_arrays(filename, use_cache=False)
+            if save(filename, OBJ_READER_VERSION, grouped_data):
+                print(f"   💾 {filename}: {len(grouped_data)} grupos")
+        elif command == "invalidate":
+            if invalidate(filename):
+                print(f"   🗑️ {filename}")
+        else:
+            valid = load(filename, OBJ_READER_VERSION) is not None
+            print(f"   {'✅' if valid else '❌'} {filename}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
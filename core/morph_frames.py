@@ -0,0 +1,68 @@
+"""
+Animações por morph targets.
+
+As animações do humano são um OBJ por frame, todos com os mesmos grupos e a mesma
+topologia; só as posições mudam. pack_frames() junta os frames numa só tabela de
+posições (frame, vértice) partilhada por todos, com um único conjunto de índices
+por grupo, e frame_texture_data() arruma essa tabela numa textura RGB com
+TEXTURE_WIDTH texels por linha, que o vertex shader lê com texelFetch:
+
+    texel = frame * vértices_do_clip + offset_do_grupo + gl_VertexID
+
+Não precisa de OpenGL (ver AnimationClip em core_ext/animation_clip.py).
+"""
+import numpy as np
+
+from core.vertex_index import index_vertices
+
+# Largura da textura de frames (o mínimo garantido pelo OpenGL 3.3 é 1024; 4096 é universal)
+TEXTURE_WIDTH = 4096
+# Erro máximo do half float, relativo ao tamanho do modelo; acima disto usa float32
+HALF_FLOAT_TOLERANCE = 1e-3
+
+
+def pack_frames(frame_data_list):
+    """
+    frame_data_list: um resultado do leitor de OBJ por frame, [(grupo, posições, uvs), ...].
+    Os frames com grupos ou nº de cantos diferentes do primeiro são ignorados.
+    Devolve ([(grupo, índices, offset, nº de vértices), ...], posições (frames, vértices, 3),
+    lista dos frames usados).
+    """
+    reference = [(name, len(positions)) for name, positions, _ in frame_data_list[0]]
+    used_frames = []
+    for frame_index, frame_data in enumerate(frame_data_list):
+        if [(name, len(positions)) for name, positions, _ in frame_data] == reference:
+            used_frames.append(frame_index)
+        else:
+            print(f"⚠️ Frame {frame_index} ignorado: grupos diferentes do primeiro frame")
+    part_list = []
+    position_list = []
+    vertex_offset = 0
+    for group_index, (name, _) in enumerate(reference):
+        # Um vértice é igual a outro só se coincidir em todos os frames
+        arrays = [np.asarray(frame_data_list[frame_index][group_index][1], dtype=np.float32).reshape(-1, 3)
+                  for frame_index in used_frames]
+        arrays, indices = index_vertices(arrays)
+        vertex_count = len(arrays[0])
+        part_list.append((name, indices, vertex_offset, vertex_count))
+        position_list.append(np.stack(arrays))
+        vertex_offset += vertex_count
+    return part_list, np.concatenate(position_list, axis=1), used_frames
+
+
+def frame_texture_data(positions, width=TEXTURE_WIDTH):
+    """Posições (frames, vértices, 3) -> (largura, altura, texels (altura * largura, 3))"""
+    texels = positions.reshape(-1, 3)
+    height = max(1, -(-len(texels) // width))
+    data = np.zeros((height * width, 3), dtype=np.float32)
+    data[:len(texels)] = texels
+    return width, height, data
+
+
+def half_float_error(positions):
+    """Maior erro ao guardar as posições em half float, relativo ao tamanho do modelo"""
+    if positions.size == 0:
+        return 0.0
+    flat = positions.reshape(-1, 3)
+    size = max(float(np.ptp(flat, axis=0).max()), 1e-12)
+    return float(np.abs(flat.astype(np.float16).astype(np.float32) - flat).max()) / size
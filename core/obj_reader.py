@@ -1,7 +1,262 @@
 from typing import List, Tuple
 
-def my_obj_reader(filename: str) -> List[Tuple[str, List[List[float]], List[List[float]]]]:
+import numpy as np
+
+from core import mesh_cache
+
+# Versão do formato devolvido pelo leitor; faz parte da chave da cache binária
+OBJ_READER_VERSION = 1
+
+# Códigos ASCII usados na classificação das linhas
+_NEWLINE = ord('\n')
+_SPACE = ord(' ')
+_SLASH = ord('/')
+_WHITESPACE = np.array([ord(' '), ord('\t'), ord('\r'), ord('\n')], dtype=np.uint8)
+# Bytes de texto convertidos de cada vez: limita o tamanho dos arrays temporários
+CHUNK_BYTES = 1 << 18
+
+
+def my_obj_reader(filename: str, use_cache: bool = True) -> List[Tuple[str, List[List[float]], List[List[float]]]]:
     """Lê os vértices e UVs do ficheiro .obj e agrupa-os por nome de material."""
+    if use_cache:
+        grouped_data = mesh_cache.load(filename, OBJ_READER_VERSION)
+        if grouped_data is not None:
+            return [(name, positions.tolist(), uvs.tolist()) for name, positions, uvs in grouped_data]
+    vertex_lookup, uv_lookup, groups = _parse_obj_indices(filename)
+    # Como no leitor original, os cantos que usam o mesmo vértice partilham a mesma lista
+    vertex_list = vertex_lookup.tolist()
+    uv_list = uv_lookup.tolist()
+    grouped_data = []
+    for name, v_idx, vt_idx in groups:
+        positions = [vertex_list[i] for i in v_idx.tolist()]
+        uvs = [uv_list[i] if i >= 0 else [0.0, 0.0] for i in vt_idx.tolist()]
+        grouped_data.append((name, positions, uvs))
+    return grouped_data
+
+
+def my_obj_reader_arrays(filename: str, use_cache: bool = True) -> List[Tuple[str, np.ndarray, np.ndarray]]:
+    """
+    Versão vetorizada do leitor: devolve, por grupo, arrays float32 (N, 3) de posições
+    e (N, 2) de UVs. Os grupos seguem as mesmas regras de my_obj_reader
+    ('o' para cenas, 'usemtl' para ficheiros do humano).
+    Com use_cache, os dados vêm da cache binária (core.mesh_cache) sempre que esta
+    estiver atualizada, e a cache é criada depois de um parsing completo.
+    """
+    if use_cache:
+        grouped_data = mesh_cache.load(filename, OBJ_READER_VERSION)
+        if grouped_data is not None:
+            return grouped_data
+    grouped_data = _parse_obj_arrays(filename)
+    if use_cache:
+        mesh_cache.save(filename, OBJ_READER_VERSION, grouped_data)
+    return grouped_data
+
+
+def _parse_obj_arrays(filename):
+    """Parsing vetorizado do texto do .obj (ver my_obj_reader_arrays)."""
+    vertex_lookup, uv_lookup, groups = _parse_obj_indices(filename)
+    grouped_data = []
+    for name, v_idx, vt_idx in groups:
+        uvs = np.zeros((len(vt_idx), 2), dtype=np.float32)
+        has_uv = vt_idx >= 0
+        # fallback UV: mapeamento automático (0, 0) quando o índice não existe
+        uvs[has_uv] = uv_lookup[vt_idx[has_uv]]
+        grouped_data.append((name, vertex_lookup[v_idx], uvs))
+    return grouped_data
+
+
+def _read_chunks(filename):
+    """Lê o ficheiro em blocos de cerca de CHUNK_BYTES, cortados no fim de uma linha."""
+    with open(filename, 'rb') as in_file:
+        rest = b''
+        while True:
+            block = in_file.read(CHUNK_BYTES)
+            if not block:
+                break
+            block = rest + block
+            cut = block.rfind(b'\n') + 1
+            if cut == 0:
+                rest = block
+                continue
+            rest = block[cut:]
+            yield block[:cut]
+    if rest:
+        yield rest + b'\n'
+
+
+def _parse_obj_indices(filename):
+    """
+    Parsing vetorizado do texto do .obj, bloco a bloco (os arrays temporários ficam
+    limitados ao tamanho do bloco, não do ficheiro).
+    Devolve as posições (V, 3) e UVs (T, 2) lidas e, por grupo, (nome, índices das
+    posições, índices das UVs ou -1) de cada canto das faces, em int32.
+    """
+    is_humano = "human" in filename or "humano" in filename
+    group_names = ["Default"]
+    vertex_blocks, uv_blocks = [], []
+    v_idx_blocks, vt_idx_blocks, group_blocks = [], [], []
+    vertex_count = 0
+    uv_count = 0
+    for text in _read_chunks(filename):
+        chunk = _parse_obj_chunk(text, is_humano)
+        # Índices e grupos do bloco passam a contar com os blocos anteriores
+        vertices_before = chunk["vertices_before"] + vertex_count
+        uvs_before = chunk["uvs_before"] + uv_count
+        corner_group = chunk["corner_group"] + (len(group_names) - 1)
+        # Só são válidos índices de vértices já lidos antes da face (como no leitor original)
+        v_idx = chunk["corners"][:, 0] - 1
+        valid = (v_idx >= 0) & (v_idx < vertices_before)
+        for bad_idx in v_idx[~valid]:
+            print(f"[Aviso] Índice fora do alcance: {bad_idx}")
+        vt_idx = np.full(int(np.count_nonzero(valid)), -1, dtype=np.int32)
+        if chunk["corners"].shape[1] > 1:
+            uv_idx = chunk["corners"][valid, 1] - 1
+            has_uv = (uv_idx >= 0) & (uv_idx < uvs_before[valid])
+            vt_idx[has_uv] = uv_idx[has_uv]
+        v_idx_blocks.append(v_idx[valid].astype(np.int32))
+        vt_idx_blocks.append(vt_idx)
+        group_blocks.append(corner_group[valid].astype(np.int32))
+        vertex_blocks.append(chunk["vertices"])
+        uv_blocks.append(chunk["uvs"])
+        vertex_count += len(chunk["vertices"])
+        uv_count += len(chunk["uvs"])
+        group_names.extend(chunk["group_names"])
+    vertex_lookup = np.concatenate(vertex_blocks) if vertex_blocks else np.zeros((0, 3), dtype=np.float32)
+    uv_lookup = np.concatenate(uv_blocks) if uv_blocks else np.zeros((0, 2), dtype=np.float32)
+    if not v_idx_blocks or sum(len(block) for block in v_idx_blocks) == 0:
+        return vertex_lookup, uv_lookup, []
+    v_idx = np.concatenate(v_idx_blocks)
+    vt_idx = np.concatenate(vt_idx_blocks)
+    corner_group = np.concatenate(group_blocks)
+
+    # Separa os cantos por grupo (os grupos aparecem por ordem no ficheiro)
+    groups = []
+    group_ids, first_corner = np.unique(corner_group, return_index=True)
+    split_points = list(first_corner[1:]) + [len(corner_group)]
+    for group_id, start, end in zip(group_ids, first_corner, split_points):
+        name = group_names[group_id]
+        # O último grupo é fechado com o nome do objeto atual, que nos ficheiros
+        # do humano nunca muda de "Default"
+        if is_humano and group_id == len(group_names) - 1:
+            name = "Default"
+        groups.append((name, v_idx[start:end], vt_idx[start:end]))
+    return vertex_lookup, uv_lookup, groups
+
+
+def _parse_obj_chunk(text, is_humano):
+    """
+    Classifica e converte as linhas de um bloco de texto (linhas completas).
+    Os contadores (vértices e UVs antes de cada canto, grupo de cada canto) são
+    relativos ao início do bloco.
+    """
+    # Dois bytes extra para poder olhar para o prefixo de linhas vazias no fim
+    buffer = np.frombuffer(text + b'\0\0', dtype=np.uint8)
+    size = len(text)
+
+    # Início e comprimento (incluindo '\n') de cada linha
+    line_ends = np.flatnonzero(buffer[:size] == _NEWLINE)
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+    line_lengths = line_ends - line_starts + 1
+
+    # Classificação das linhas pelo prefixo
+    c0 = buffer[line_starts]
+    c1 = buffer[line_starts + 1]
+    c2 = buffer[line_starts + 2]
+    is_v = (c0 == ord('v')) & (c1 == _SPACE)
+    is_vt = (c0 == ord('v')) & (c1 == ord('t')) & (c2 == _SPACE)
+    is_f = (c0 == ord('f')) & (c1 == _SPACE)
+    if is_humano:
+        candidates = np.flatnonzero(c0 == ord('u'))
+        keyword = b'usemtl '
+    else:
+        candidates = np.flatnonzero((c0 == ord('o')) & (c1 == _SPACE))
+        keyword = b'o '
+    boundary_lines = [i for i in candidates
+                      if text.startswith(keyword, line_starts[i])]
+    group_names = [
+        text[line_starts[i]:line_ends[i]].decode('utf-8', errors='replace').split()[1]
+        for i in boundary_lines
+    ]
+
+    vertices = _parse_float_section(buffer, line_starts, line_lengths, is_v, 1, 3)
+    uvs = _parse_float_section(buffer, line_starts, line_lengths, is_vt, 2, 2)
+
+    corners, corner_face = _parse_face_section(buffer, line_starts, line_lengths, is_f)
+    corner_lines = np.flatnonzero(is_f)[corner_face]
+    is_boundary = np.zeros(len(line_starts), dtype=np.int64)
+    is_boundary[boundary_lines] = 1
+    return {
+        "vertices": vertices,
+        "uvs": uvs,
+        "group_names": group_names,
+        "corners": corners,
+        "vertices_before": (np.cumsum(is_v) - is_v)[corner_lines],
+        "uvs_before": (np.cumsum(is_vt) - is_vt)[corner_lines],
+        "corner_group": np.cumsum(is_boundary)[corner_lines],
+    }
+
+
+def _section_bytes(buffer, line_starts, line_lengths, line_mask):
+    """Copia os bytes das linhas selecionadas e devolve-os com o início de cada linha."""
+    byte_mask = np.repeat(line_mask, line_lengths)
+    section = buffer[:len(byte_mask)][byte_mask]
+    selected_lengths = line_lengths[line_mask]
+    section_starts = np.concatenate(([0], np.cumsum(selected_lengths)[:-1]))
+    return section, section_starts
+
+
+def _parse_float_section(buffer, line_starts, line_lengths, line_mask, keyword_length, columns):
+    """Converte todas as linhas 'v'/'vt' de uma só vez para um array float32 (N, columns)."""
+    line_count = int(np.count_nonzero(line_mask))
+    if line_count == 0:
+        return np.zeros((0, columns), dtype=np.float32)
+    section, section_starts = _section_bytes(buffer, line_starts, line_lengths, line_mask)
+    # Apaga a palavra-chave para ficar só com números separados por espaços
+    for offset in range(keyword_length):
+        section[section_starts + offset] = _SPACE
+    values = np.fromstring(section.tobytes(), dtype=np.float64, sep=' ')
+    if len(values) == line_count * columns:
+        return values.reshape(line_count, columns).astype(np.float32)
+    # Linhas com número variável de componentes (ex.: "v x y z r g b"): linha a linha
+    rows = [line.split()[:columns] for line in section.tobytes().splitlines()]
+    return np.array(rows, dtype=np.float64).astype(np.float32)
+
+
+def _parse_face_section(buffer, line_starts, line_lengths, line_mask):
+    """
+    Devolve os índices de todos os cantos das faces, como array inteiro (N, k)
+    com k = 1 (v), 2 (v/vt) ou 3 (v/vt/vn), e a face (linha 'f') de cada canto.
+    """
+    if not np.any(line_mask):
+        return np.zeros((0, 1), dtype=np.int64), np.zeros(0, dtype=np.int64)
+    section, section_starts = _section_bytes(buffer, line_starts, line_lengths, line_mask)
+    section[section_starts] = _SPACE
+    raw = section.tobytes()
+    if not raw.strip():
+        return np.zeros((0, 1), dtype=np.int64), np.zeros(0, dtype=np.int64)
+    # Início de cada token "v/vt/vn"
+    is_token = ~np.isin(section, _WHITESPACE)
+    token_starts = np.flatnonzero(is_token & ~np.concatenate(([False], is_token[:-1])))
+    corner_face = np.searchsorted(section_starts, token_starts, side='right') - 1
+    is_slash = section == _SLASH
+    slashes = np.add.reduceat(is_slash, token_starts, dtype=np.int32)
+    uniform = slashes.min() == slashes.max() and b'//' not in raw
+    if uniform:
+        section[is_slash] = _SPACE
+        values = np.fromstring(section.tobytes(), dtype=np.int64, sep=' ')
+        columns = int(slashes[0]) + 1
+        if len(values) == len(token_starts) * columns:
+            return values.reshape(-1, columns), corner_face
+    # Formatos mistos ou "v//vn": token a token, índices em falta ficam a 0 (inválidos)
+    corners = []
+    for token in raw.split():
+        indices = token.split(b'/')
+        corners.append([int(indices[0]), int(indices[1]) if len(indices) > 1 and indices[1] else 0])
+    return np.array(corners, dtype=np.int64), corner_face
+
+
+def my_obj_reader_legacy(filename: str) -> List[Tuple[str, List[List[float]], List[List[float]]]]:
+    """Leitor original, linha a linha; mantido como referência para o benchmark."""
     grouped_data = []
     is_humano = "human" in filename or "humano" in filename
     current_object = "Default"
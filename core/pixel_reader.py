@@ -0,0 +1,80 @@
+import collections
+import ctypes
+
+import OpenGL.GL as GL
+import numpy as np
+
+
+class PixelReader:
+    """
+    Reads rendered frames back to memory without waiting for the GPU.
+    glReadPixels into a pixel buffer object returns at once (the copy happens on the
+    GPU when the frame is finished); the buffer is only mapped ring_size - 1 frames
+    later, so rendering the next frames overlaps the readback.
+    """
+    def __init__(self, width, height, ring_size=3):
+        if ring_size < 2:
+            raise Exception("PixelReader needs at least two pixel buffers")
+        self._width = width
+        self._height = height
+        self._frame_bytes = width * height * 3
+        self._buffer_refs = [GL.glGenBuffers(1) for _ in range(ring_size)]
+        for buffer_ref in self._buffer_refs:
+            GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, buffer_ref)
+            GL.glBufferData(GL.GL_PIXEL_PACK_BUFFER, self._frame_bytes, None, GL.GL_STREAM_READ)
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+        # Buffers written by glReadPixels and not read yet, oldest first
+        self._pending = collections.deque()
+        self._next_buffer = 0
+
+    @property
+    def ring_size(self):
+        return len(self._buffer_refs)
+
+    @property
+    def pending_count(self):
+        return len(self._pending)
+
+    def read(self, framebuffer_ref):
+        """
+        Start reading the frame in the framebuffer; returns the frame started
+        ring_size - 1 reads ago as an array (height, width, 3) of bytes, top row
+        first, or None while the ring is filling up
+        """
+        buffer_index = self._next_buffer
+        self._next_buffer = (self._next_buffer + 1) % len(self._buffer_refs)
+        GL.glBindFramebuffer(GL.GL_READ_FRAMEBUFFER, framebuffer_ref)
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, self._buffer_refs[buffer_index])
+        GL.glPixelStorei(GL.GL_PACK_ALIGNMENT, 1)
+        # With a pack buffer bound, the last argument is an offset into it
+        GL.glReadPixels(0, 0, self._width, self._height, GL.GL_RGB, GL.GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+        self._pending.append(buffer_index)
+        # Keep one buffer free for the next read
+        if len(self._pending) == len(self._buffer_refs):
+            return self._map(self._pending.popleft())
+        return None
+
+    def flush(self):
+        """ The frames still in the ring, oldest first """
+        while self._pending:
+            yield self._map(self._pending.popleft())
+
+    def _map(self, buffer_index):
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, self._buffer_refs[buffer_index])
+        # Waits only if the GPU has not finished this (old) frame yet
+        address = GL.glMapBufferRange(GL.GL_PIXEL_PACK_BUFFER, 0, self._frame_bytes, GL.GL_MAP_READ_BIT)
+        if not address:
+            GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+            raise Exception("Could not map the pixel buffer")
+        mapped = np.ctypeslib.as_array((ctypes.c_ubyte * self._frame_bytes).from_address(address))
+        # OpenGL rows start at the bottom; copy before the mapping goes away
+        frame = mapped.reshape(self._height, self._width, 3)[::-1].copy()
+        GL.glUnmapBuffer(GL.GL_PIXEL_PACK_BUFFER)
+        GL.glBindBuffer(GL.GL_PIXEL_PACK_BUFFER, 0)
+        return frame
+
+    def delete(self):
+        GL.glDeleteBuffers(len(self._buffer_refs), self._buffer_refs)
+        self._buffer_refs = []
+        self._pending.clear()
@@ -0,0 +1,90 @@
+import hashlib
+
+import OpenGL.GL as GL
+
+from core.utils import Utils
+
+
+class ProgramCache:
+    """
+    Compiles and links each distinct (vertex, fragment) shader source pair once.
+    Materials with identical shader code share the same program reference and
+    uniform locations; uniform values stay in each material's own Uniform objects.
+    """
+    def __init__(self):
+        # source hash -> program reference
+        self._program_dict = {}
+        # program reference -> {variable name: uniform location}
+        self._location_dict = {}
+        # program reference -> {uniform location: last value uploaded to it}
+        self._uploaded_value_dict = {}
+        # statistics
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def program_count(self):
+        return len(self._program_dict)
+
+    @staticmethod
+    def make_key(vertex_shader_code, fragment_shader_code):
+        digest = hashlib.sha1()
+        digest.update(vertex_shader_code.encode('utf-8'))
+        # Separator so that moving text between the two sources changes the key
+        digest.update(b'\0')
+        digest.update(fragment_shader_code.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get_program(self, vertex_shader_code, fragment_shader_code):
+        """ Return the program for this source pair, compiling it on first use """
+        key = self.make_key(vertex_shader_code, fragment_shader_code)
+        program_ref = self._program_dict.get(key)
+        if program_ref is None:
+            program_ref = Utils.initialize_program(vertex_shader_code, fragment_shader_code)
+            self._program_dict[key] = program_ref
+            self._location_dict[program_ref] = {}
+            self._misses += 1
+        else:
+            self._hits += 1
+        return program_ref
+
+    def get_uniform_location(self, program_ref, variable_name):
+        """ Location of a uniform variable, queried from OpenGL only once per program """
+        location_dict = self._location_dict.setdefault(program_ref, {})
+        location = location_dict.get(variable_name)
+        if location is None:
+            location = GL.glGetUniformLocation(program_ref, variable_name)
+            location_dict[variable_name] = location
+        return location
+
+    def get_uploaded_values(self, program_ref):
+        """
+        Last value uploaded to each uniform location of a program. Uniform values are
+        stored in the program, so this is shared by every material using it.
+        """
+        return self._uploaded_value_dict.setdefault(program_ref, {})
+
+    def clear(self):
+        """ Delete every cached program (the OpenGL context must still be current) """
+        for program_ref in self._program_dict.values():
+            GL.glDeleteProgram(program_ref)
+        self._program_dict.clear()
+        self._location_dict.clear()
+        self._uploaded_value_dict.clear()
+
+    def report(self):
+        total = self._hits + self._misses
+        print(f"🧩 Cache de shaders: {self.program_count} programas compilados "
+              f"para {total} materiais ({self._hits} reutilizados)")
+
+
+# Shared instance used by Material and Uniform
+program_cache = ProgramCache()
@@ -1,7 +1,22 @@
 import OpenGL.GL as GL
+import numpy as np
+
+from core.program_cache import program_cache
+
+# Marks a location to which nothing has been uploaded yet
+_NOT_UPLOADED = object()
 
 
 class Uniform:
+    # Counters of uniform / texture binding GL calls issued and skipped because the
+    # value had not changed; reset by reset_frame_state() at the start of each render
+    upload_count = 0
+    skip_count = 0
+    # Texture bound to each texture unit and active texture unit; unlike uniform values
+    # this is global OpenGL state, so it is forgotten at the start of each render
+    _bound_texture_dict = {}
+    _active_texture_unit = None
+
     def __init__(self, data_type, data):
         # type of data:
         # int | bool | float | vec2 | vec3 | vec4
@@ -10,78 +25,148 @@ class Uniform:
         self._data = data
         # reference for variable location in program
         self._variable_ref = None
+        # last values uploaded to the program, indexed by location (see ProgramCache)
+        self._uploaded_values = None
 
     @property
     def data(self):
         return self._data
 
+    @property
+    def data_type(self):
+        return self._data_type
+
     @data.setter
     def data(self, data):
         self._data = data
 
+    @staticmethod
+    def reset_frame_state():
+        """ Reset counters and texture binding tracking (call once per render) """
+        Uniform.upload_count = 0
+        Uniform.skip_count = 0
+        Uniform._bound_texture_dict = {}
+        Uniform._active_texture_unit = None
+
     def locate_variable(self, program_ref, variable_name):
         """ Get and store reference for program variable with given name """
+        # Locations are shared by every material that uses the same program
+        locate = program_cache.get_uniform_location
+        self._uploaded_values = program_cache.get_uploaded_values(program_ref)
         if self._data_type == 'Light':
             self._variable_ref = {
-                "lightType":    GL.glGetUniformLocation(program_ref, variable_name + ".lightType"),
-                "color":        GL.glGetUniformLocation(program_ref, variable_name + ".color"),
-                "direction":    GL.glGetUniformLocation(program_ref, variable_name + ".direction"),
-                "position":     GL.glGetUniformLocation(program_ref, variable_name + ".position"),
-                "attenuation":  GL.glGetUniformLocation(program_ref, variable_name + ".attenuation"),
+                "lightType":    locate(program_ref, variable_name + ".lightType"),
+                "color":        locate(program_ref, variable_name + ".color"),
+                "direction":    locate(program_ref, variable_name + ".direction"),
+                "position":     locate(program_ref, variable_name + ".position"),
+                "attenuation":  locate(program_ref, variable_name + ".attenuation"),
             }
         elif self._data_type == "Shadow":
             self._variable_ref = {
-                "lightDirection": GL.glGetUniformLocation(program_ref, variable_name + ".lightDirection"),
-                "projectionMatrix": GL.glGetUniformLocation(program_ref, variable_name + ".projectionMatrix"),
-                "viewMatrix": GL.glGetUniformLocation(program_ref, variable_name + ".viewMatrix"),
-                "depthTextureSampler": GL.glGetUniformLocation(program_ref, variable_name + ".depthTextureSampler"),
-                "strength": GL.glGetUniformLocation(program_ref, variable_name + ".strength"),
-                "bias": GL.glGetUniformLocation(program_ref, variable_name + ".bias"),
+                "lightDirection": locate(program_ref, variable_name + ".lightDirection"),
+                "projectionMatrix": locate(program_ref, variable_name + ".projectionMatrix"),
+                "viewMatrix": locate(program_ref, variable_name + ".viewMatrix"),
+                "depthTextureSampler": locate(program_ref, variable_name + ".depthTextureSampler"),
+                "strength": locate(program_ref, variable_name + ".strength"),
+                "bias": locate(program_ref, variable_name + ".bias"),
             }
         else:
-            self._variable_ref = GL.glGetUniformLocation(program_ref, variable_name)
+            self._variable_ref = locate(program_ref, variable_name)
 
     def upload_data(self):
-        """ Store data in uniform variable previously located """
+        """
+        Store data in uniform variable previously located.
+        GL calls are skipped when the program already holds the same value.
+        """
         # If the program does not reference the variable, then exit
         if self._variable_ref != -1:
             if self._data_type == 'int':
-                GL.glUniform1i(self._variable_ref, self._data)
+                if self._changed(self._variable_ref, self._data):
+                    GL.glUniform1i(self._variable_ref, self._data)
             elif self._data_type == 'bool':
-                GL.glUniform1i(self._variable_ref, self._data)
+                if self._changed(self._variable_ref, self._data):
+                    GL.glUniform1i(self._variable_ref, self._data)
             elif self._data_type == 'float':
-                GL.glUniform1f(self._variable_ref, self._data)
+                if self._changed(self._variable_ref, self._data):
+                    GL.glUniform1f(self._variable_ref, self._data)
             elif self._data_type == 'vec2':
-                GL.glUniform2f(self._variable_ref, *self._data)
+                if self._changed(self._variable_ref, tuple(self._data)):
+                    GL.glUniform2f(self._variable_ref, *self._data)
             elif self._data_type == 'vec3':
-                GL.glUniform3f(self._variable_ref, *self._data)
+                if self._changed(self._variable_ref, tuple(self._data)):
+                    GL.glUniform3f(self._variable_ref, *self._data)
             elif self._data_type == 'vec4':
-                GL.glUniform4f(self._variable_ref, *self._data)
+                if self._changed(self._variable_ref, tuple(self._data)):
+                    GL.glUniform4f(self._variable_ref, *self._data)
             elif self._data_type == 'mat4':
-                GL.glUniformMatrix4fv(self._variable_ref, 1, GL.GL_TRUE, self._data)
+                if self._changed(self._variable_ref, np.asarray(self._data).tobytes()):
+                    GL.glUniformMatrix4fv(self._variable_ref, 1, GL.GL_TRUE, self._data)
             elif self._data_type == "sampler2D":
                 texture_object_ref, texture_unit_ref = self._data
-                # Activate texture unit
-                GL.glActiveTexture(GL.GL_TEXTURE0 + texture_unit_ref)
-                # Associate texture object reference to currently active texture unit
-                GL.glBindTexture(GL.GL_TEXTURE_2D, texture_object_ref)
+                # Associate texture object reference to the texture unit
+                self._bind_texture(texture_object_ref, texture_unit_ref)
                 # Upload texture unit number (0...15) to uniform variable in shader
-                GL.glUniform1i(self._variable_ref, texture_unit_ref)
+                if self._changed(self._variable_ref, texture_unit_ref):
+                    GL.glUniform1i(self._variable_ref, texture_unit_ref)
             elif self._data_type == "Light":
-                GL.glUniform1i(self._variable_ref["lightType"], self._data.light_type)
-                GL.glUniform3f(self._variable_ref["color"], *self._data.color)
-                GL.glUniform3f(self._variable_ref["direction"], *self._data.direction)
-                GL.glUniform3f(self._variable_ref["position"], *self._data.local_position)
-                GL.glUniform3f(self._variable_ref["attenuation"], *self._data.attenuation)
+                ref = self._variable_ref
+                if self._changed(ref["lightType"], self._data.light_type):
+                    GL.glUniform1i(ref["lightType"], self._data.light_type)
+                if self._changed(ref["color"], tuple(self._data.color)):
+                    GL.glUniform3f(ref["color"], *self._data.color)
+                direction = self._data.direction
+                if self._changed(ref["direction"], tuple(direction)):
+                    GL.glUniform3f(ref["direction"], *direction)
+                position = self._data.local_position
+                if self._changed(ref["position"], tuple(position)):
+                    GL.glUniform3f(ref["position"], *position)
+                if self._changed(ref["attenuation"], tuple(self._data.attenuation)):
+                    GL.glUniform3f(ref["attenuation"], *self._data.attenuation)
             elif self._data_type == "Shadow":
-                GL.glUniform3f(self._variable_ref["lightDirection"], *self._data.light_source.direction)
-                GL.glUniformMatrix4fv(self._variable_ref["projectionMatrix"], 1, GL.GL_TRUE, self._data.camera.projection_matrix)
-                GL.glUniformMatrix4fv(self._variable_ref["viewMatrix"], 1, GL.GL_TRUE, self._data.camera.view_matrix)
+                ref = self._variable_ref
+                direction = self._data.light_source.direction
+                if self._changed(ref["lightDirection"], tuple(direction)):
+                    GL.glUniform3f(ref["lightDirection"], *direction)
+                projection_matrix = self._data.camera.projection_matrix
+                if self._changed(ref["projectionMatrix"], np.asarray(projection_matrix).tobytes()):
+                    GL.glUniformMatrix4fv(ref["projectionMatrix"], 1, GL.GL_TRUE, projection_matrix)
+                view_matrix = self._data.camera.view_matrix
+                if self._changed(ref["viewMatrix"], np.asarray(view_matrix).tobytes()):
+                    GL.glUniformMatrix4fv(ref["viewMatrix"], 1, GL.GL_TRUE, view_matrix)
                 # Configure depth texture
                 texture_object_ref = self._data.render_target.texture.texture_ref
                 texture_unit_ref = 3
-                GL.glActiveTexture(GL.GL_TEXTURE0 + texture_unit_ref)
-                GL.glBindTexture(GL.GL_TEXTURE_2D, texture_object_ref)
-                GL.glUniform1i(self._variable_ref["depthTextureSampler"], texture_unit_ref)
-                GL.glUniform1f(self._variable_ref["strength"], self._data.strength)
-                GL.glUniform1f(self._variable_ref["bias"], self._data.bias)
+                self._bind_texture(texture_object_ref, texture_unit_ref)
+                if self._changed(ref["depthTextureSampler"], texture_unit_ref):
+                    GL.glUniform1i(ref["depthTextureSampler"], texture_unit_ref)
+                if self._changed(ref["strength"], self._data.strength):
+                    GL.glUniform1f(ref["strength"], self._data.strength)
+                if self._changed(ref["bias"], self._data.bias):
+                    GL.glUniform1f(ref["bias"], self._data.bias)
+
+    def _changed(self, location, value):
+        """ Record value as uploaded to location; False if the program already holds it """
+        if location == -1:
+            # Struct field not used by the shader
+            return False
+        if self._uploaded_values.get(location, _NOT_UPLOADED) == value:
+            Uniform.skip_count += 1
+            return False
+        self._uploaded_values[location] = value
+        Uniform.upload_count += 1
+        return True
+
+    @staticmethod
+    def _bind_texture(texture_object_ref, texture_unit_ref):
+        """ Bind texture object to texture unit, unless it is already bound there """
+        if Uniform._bound_texture_dict.get(texture_unit_ref) == texture_object_ref:
+            Uniform.skip_count += 1
+            return
+        # Activate texture unit
+        if Uniform._active_texture_unit != texture_unit_ref:
+            GL.glActiveTexture(GL.GL_TEXTURE0 + texture_unit_ref)
+            Uniform._active_texture_unit = texture_unit_ref
+        # Associate texture object reference to currently active texture unit
+        GL.glBindTexture(GL.GL_TEXTURE_2D, texture_object_ref)
+        Uniform._bound_texture_dict[texture_unit_ref] = texture_object_ref
+        Uniform.upload_count += 1
@@ -0,0 +1,160 @@
+"""
+Geometria indexada.
+
+O leitor de OBJ expande cada canto de cada face num vértice próprio, por isso os
+vértices partilhados entre triângulos ficam repetidos no VBO e são processados
+várias vezes pelo vertex shader. index_vertices() junta os vértices com os mesmos
+atributos (posição, uv, normal, ...) e devolve os vértices únicos e um índice por
+canto, para desenhar com glDrawElements.
+
+optimize_vertex_cache() reordena os triângulos para aproveitar a cache de vértices
+pós-transformação da GPU (algoritmo Tipsify, Sander et al. 2007) e
+simulate_vertex_cache() estima quantas vezes o vertex shader corre para uma dada
+ordem de índices.
+"""
+from collections import deque
+
+import numpy as np
+
+# Tamanho típico da cache pós-transformação (em vértices)
+DEFAULT_CACHE_SIZE = 16
+
+
+def index_vertices(arrays):
+    """
+    arrays: lista de arrays (n_vértices, componentes), um por atributo.
+    Devolve (arrays só com os vértices únicos, índices uint32). Os vértices únicos
+    ficam pela ordem do primeiro uso, o que mantém a localidade dos acessos.
+    """
+    arrays = [np.asarray(array, dtype=np.float32) for array in arrays]
+    vertex_count = len(arrays[0])
+    if vertex_count == 0:
+        return arrays, np.zeros(0, dtype=np.uint32)
+    # Somar 0 transforma -0.0 em 0.0 (senão os bytes diferem)
+    combined = np.ascontiguousarray(np.hstack([array.reshape(vertex_count, -1) for array in arrays]) + np.float32(0))
+    # Cada vértice como um único valor de bytes, para o np.unique comparar linhas inteiras
+    rows = combined.view(np.dtype((np.void, combined.itemsize * combined.shape[1]))).ravel()
+    _, first_use, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    indices, unique_rows = _first_use_order(inverse.ravel(), first_use)
+    return [array[unique_rows] for array in arrays], indices
+
+
+def _first_use_order(indices, source_rows):
+    """Renumera os vértices pela ordem em que os índices os usam pela primeira vez"""
+    vertex_count = len(source_rows)
+    first_position = np.full(vertex_count, len(indices), dtype=np.int64)
+    np.minimum.at(first_position, indices, np.arange(len(indices)))
+    order = np.argsort(first_position, kind="stable")
+    remap = np.empty(vertex_count, dtype=np.uint32)
+    remap[order] = np.arange(vertex_count, dtype=np.uint32)
+    return remap[indices], np.asarray(source_rows)[order]
+
+
+def reorder_vertices(arrays, indices):
+    """Reordena os vértices pela ordem de uso dos índices (depois de reordenar triângulos)"""
+    indices, rows = _first_use_order(np.asarray(indices), np.arange(len(arrays[0])))
+    return [array[rows] for array in arrays], indices
+
+
+def optimize_vertex_cache(indices, vertex_count, cache_size=DEFAULT_CACHE_SIZE):
+    """Devolve os índices com os triângulos reordenados (Tipsify)"""
+    triangles = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+    if len(triangles) == 0:
+        return np.asarray(indices, dtype=np.uint32)
+    corners = triangles.ravel()
+    # Triângulos de cada vértice (formato CSR)
+    use_count = np.bincount(corners, minlength=vertex_count)
+    offsets = np.concatenate([[0], np.cumsum(use_count)]).tolist()
+    vertex_triangles = (np.argsort(corners, kind="stable") // 3).tolist()
+    live = use_count.tolist()
+    triangle_list = triangles.tolist()
+    emitted = [False] * len(triangle_list)
+    cache_time = [-cache_size - 1] * vertex_count
+    dead_end = []
+    output = []
+    time = 0
+    cursor = 0
+
+    def skip_dead_end():
+        nonlocal cursor
+        while dead_end:
+            vertex = dead_end.pop()
+            if live[vertex] > 0:
+                return vertex
+        while cursor < vertex_count and live[cursor] == 0:
+            cursor += 1
+        return cursor if cursor < vertex_count else -1
+
+    fan_vertex = skip_dead_end()
+    while fan_vertex >= 0:
+        candidates = []
+        # Emite todos os triângulos ainda não emitidos à volta do vértice
+        for triangle in vertex_triangles[offsets[fan_vertex]:offsets[fan_vertex + 1]]:
+            if emitted[triangle]:
+                continue
+            emitted[triangle] = True
+            for vertex in triangle_list[triangle]:
+                output.append(vertex)
+                dead_end.append(vertex)
+                candidates.append(vertex)
+                live[vertex] -= 1
+                if time - cache_time[vertex] > cache_size:
+                    cache_time[vertex] = time
+                    time += 1
+        # Próximo vértice: o que ainda está na cache há mais tempo e continuará lá
+        # depois de emitir os seus triângulos restantes
+        fan_vertex = -1
+        best_priority = -1
+        for vertex in candidates:
+            if live[vertex] > 0:
+                priority = 0
+                if time - cache_time[vertex] + 2 * live[vertex] <= cache_size:
+                    priority = time - cache_time[vertex]
+                if priority > best_priority:
+                    best_priority = priority
+                    fan_vertex = vertex
+        if fan_vertex == -1:
+            fan_vertex = skip_dead_end()
+    return np.asarray(output, dtype=np.uint32)
+
+
+def simulate_vertex_cache(indices, cache_size=DEFAULT_CACHE_SIZE):
+    """Nº de execuções do vertex shader com uma cache FIFO de cache_size vértices"""
+    cache = deque()
+    cached = set()
+    misses = 0
+    for vertex in np.asarray(indices).tolist():
+        if vertex in cached:
+            continue
+        misses += 1
+        cache.append(vertex)
+        cached.add(vertex)
+        if len(cache) > cache_size:
+            cached.discard(cache.popleft())
+    return misses
+
+
+def indexing_report(name, geometries):
+    """Memória dos vértices (VRAM) sem e com índices para as geometrias de uma sala"""
+    expanded_bytes = 0
+    indexed_bytes = 0
+    corner_count = 0
+    vertex_count = 0
+    for geometry in geometries:
+        vertex_bytes = sum(attribute.nbytes for attribute in geometry.attribute_dict.values())
+        if geometry.index_buffer is None:
+            expanded_bytes += vertex_bytes
+            indexed_bytes += vertex_bytes
+            corner_count += geometry.vertex_count
+            vertex_count += geometry.vertex_count
+            continue
+        stride = vertex_bytes / max(geometry.vertex_count, 1)
+        expanded_bytes += stride * geometry.index_buffer.count
+        indexed_bytes += vertex_bytes + geometry.index_buffer.nbytes
+        corner_count += geometry.index_buffer.count
+        vertex_count += geometry.vertex_count
+    if corner_count == 0:
+        return
+    print(f"🔢 {name}: {corner_count} cantos -> {vertex_count} vértices únicos "
+          f"({vertex_count / corner_count:.0%}); VRAM {expanded_bytes / 2**20:.2f} MB -> "
+          f"{indexed_bytes / 2**20:.2f} MB")
@@ -0,0 +1,126 @@
+import OpenGL.GL as GL
+import numpy as np
+
+from core.morph_frames import HALF_FLOAT_TOLERANCE, frame_texture_data, half_float_error, pack_frames
+from core_ext.mesh import Mesh
+from core_ext.object3d import Object3D
+from core_ext.texture import Texture
+from geometry.geometry import Geometry
+from material.morph import MorphMaterial
+
+# Color of groups missing from the .mtl file (easy to spot while debugging)
+MISSING_COLOR = [1.0, 0.0, 1.0]
+
+
+class AnimationClip(Object3D):
+    """
+    An animation stored as morph targets: the vertex positions of every frame live
+    in one float texture on the GPU, and a single mesh (all groups, colored per vertex
+    from the .mtl file) reads the current frame from it in the vertex shader, so the
+    whole character is one draw call. Changing frame only changes uniforms;
+    the clip stays in the scene graph and is placed like any other object.
+    Between two frames the positions are interpolated on the GPU (see set_blend),
+    so playback driven by elapsed time is smooth at any render rate.
+    """
+    def __init__(self, frame_data_list, mtl_colors=None, half_float=True, catmull_rom=False):
+        """
+        frame_data_list: one OBJ reader result per frame, [(group, positions, uvs), ...]
+        half_float: store positions as 16-bit floats when the error is small enough
+        catmull_rom: interpolate along a spline through the neighbouring frames instead of linearly
+        """
+        super().__init__()
+        mtl_colors = mtl_colors or {}
+        part_list, positions, used_frames = pack_frames(frame_data_list)
+        self._frame_count = len(used_frames)
+        self._vertex_count = positions.shape[1]
+        self._half_float = half_float and half_float_error(positions) <= HALF_FLOAT_TOLERANCE
+        width, height, data = frame_texture_data(positions)
+        # Vertex data, not an image: no filtering between neighbouring texels
+        self._frame_texture = Texture(property_dict={
+            "magFilter": GL.GL_NEAREST,
+            "minFilter": GL.GL_NEAREST,
+            "wrap": GL.GL_CLAMP_TO_EDGE
+        })
+        self._frame_texture.upload_float_data(width, height, data, self._half_float)
+        self._current_frame = 0
+        # All groups in one geometry: vertices are already numbered clip-wide (as in the texture)
+        index_list = []
+        color_list = []
+        for name, indices, vertex_offset, vertex_count in part_list:
+            index_list.append(indices + vertex_offset)
+            color_list.append(np.tile(np.asarray(mtl_colors.get(name, MISSING_COLOR), dtype=np.float32),
+                                      (vertex_count, 1)))
+        geometry = Geometry()
+        # Only used for the vertex count; the shader reads the frame texture
+        geometry.add_attribute("vec3", "vertexPosition", positions[0], shared=True)
+        # The vertices move between frames: bound them in all of them, for frustum culling
+        geometry.compute_bounds(positions)
+        geometry.add_attribute("vec3", "vertexColor", np.concatenate(color_list), shared=True)
+        geometry.set_indices(np.concatenate(index_list), shared=True)
+        material = MorphMaterial(self._frame_texture.texture_ref, width, self._vertex_count)
+        material.uniform_dict["useCatmullRom"].data = catmull_rom
+        self._mesh = Mesh(geometry, material)
+        self.add(self._mesh)
+
+    def __len__(self):
+        return self._frame_count
+
+    @property
+    def frame_count(self):
+        return self._frame_count
+
+    @property
+    def current_frame(self):
+        return self._current_frame
+
+    @property
+    def vertex_count(self):
+        """ Vertices of one frame (shared by all frames) """
+        return self._vertex_count
+
+    @property
+    def gpu_bytes(self):
+        """ GPU memory used by the frame texture, vertex buffers and index buffers """
+        geometry = self._mesh.geometry
+        return (self._frame_texture.gpu_bytes + geometry.index_buffer.nbytes
+                + sum(attribute.nbytes for attribute in geometry.attribute_dict.values()))
+
+    def set_blend(self, frame_a, frame_b, blend, frame_previous=None, frame_next=None):
+        """
+        Show frame_a blended towards frame_b (blend between 0 and 1, for example the time
+        since frame_a was reached divided by the frame duration).
+        The spline interpolation also uses the frames before frame_a and after frame_b;
+        by default the neighbours in the clip (pass them explicitly for loops).
+        """
+        if frame_previous is None:
+            frame_previous = max(frame_a - 1, 0)
+        if frame_next is None:
+            frame_next = min(frame_b + 1, self._frame_count - 1)
+        blend = min(max(float(blend), 0.0), 1.0)
+        uniform_dict = self._mesh.material.uniform_dict
+        uniform_dict["frameA"].data = frame_a
+        uniform_dict["frameB"].data = frame_b
+        uniform_dict["framePrevious"].data = frame_previous
+        uniform_dict["frameNext"].data = frame_next
+        uniform_dict["frameBlend"].data = blend
+        self._current_frame = frame_a
+
+    def set_frame(self, index):
+        if not 0 <= index < self._frame_count:
+            raise Exception(f"Animation clip has no frame {index} (frames: {self._frame_count})")
+        self.set_blend(index, index, 0.0)
+
+    def show_frame(self, index):
+        """ Set the frame and return the clip, to use where a frame object is expected """
+        self.set_frame(index)
+        return self
+
+    def delete(self):
+        """ Free the mesh and the frame texture; the clip must not be used afterwards """
+        self._mesh.delete()
+        self._frame_texture.delete()
+
+    def report(self, label):
+        precision = "half float" if self._half_float else "float"
+        print(f"🎞️ {label}: {self._frame_count} frames x {self._vertex_count} vértices, "
+              f"{self.gpu_bytes / 1e6:.2f} MB ({precision})")
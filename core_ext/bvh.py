@@ -0,0 +1,254 @@
+import numpy as np
+
+from core.frustum import Frustum
+
+# Most meshes stored in one leaf
+LEAF_SIZE = 4
+
+
+def _expand_ranges(starts, counts):
+    """ All positions of the ranges [start, start + count), concatenated """
+    counts = np.asarray(counts, dtype=np.int64)
+    offsets = np.repeat(np.asarray(starts, dtype=np.int64) - np.cumsum(counts) + counts, counts)
+    return offsets + np.arange(counts.sum())
+
+
+class BoundingVolumeHierarchy:
+    """
+    Binary tree of world-space axis-aligned boxes over a list of meshes, so frustum,
+    ray and sphere queries only visit the branches that can contain an answer.
+    Built top-down (median split along the longest axis); when meshes move, refit()
+    updates the boxes of the moved meshes and their ancestors without rebuilding.
+    The tree is stored as flat arrays and every query visits one tree level at a time,
+    testing all the boxes of that level at once.
+    Meshes without bounds (no vertex positions) are not in the tree.
+    """
+    def __init__(self, mesh_list, leaf_size=LEAF_SIZE):
+        self._mesh_list = mesh_list
+        self._leaf_size = leaf_size
+        self._build()
+
+    @property
+    def mesh_list(self):
+        return self._mesh_list
+
+    @property
+    def node_count(self):
+        return len(self._node_min)
+
+    @property
+    def depth(self):
+        return int(self._node_depth.max()) + 1 if len(self._node_depth) else 0
+
+    def __len__(self):
+        """ Number of meshes in the tree """
+        return len(self._item_list)
+
+    def __contains__(self, mesh):
+        return id(mesh) in self._item_index_dict
+
+    def _snapshot(self):
+        """ World matrix and local box of every mesh, as last seen (to detect changes) """
+        return [(mesh.global_matrix, mesh.bounding_box) for mesh in self._mesh_list]
+
+    def _build(self):
+        snapshot = self._snapshot()
+        self._item_list = [mesh for mesh, (_, box) in zip(self._mesh_list, snapshot) if box is not None]
+        self._item_index_dict = {id(mesh): index for index, mesh in enumerate(self._item_list)}
+        self._snapshot_list = snapshot
+        item_count = len(self._item_list)
+        if item_count:
+            matrices = np.array([matrix for matrix, box in snapshot if box is not None])
+            box_mins = np.array([box[0] for _, box in snapshot if box is not None])
+            box_maxs = np.array([box[1] for _, box in snapshot if box is not None])
+            self._item_min, self._item_max = Frustum.world_boxes(matrices, box_mins, box_maxs)
+        else:
+            self._item_min = np.zeros((0, 3))
+            self._item_max = np.zeros((0, 3))
+        # Items sorted so that every node covers a contiguous range of this order
+        self._order = np.arange(item_count)
+        centroids = (self._item_min + self._item_max) / 2
+        node_list = []
+        # (start, count, parent, depth); node 0 is the root
+        pending = [(0, item_count, -1, 0)] if item_count else []
+        while pending:
+            start, count, parent, depth = pending.pop()
+            node = len(node_list)
+            node_list.append([start, count, parent, depth, -1, -1])
+            if parent >= 0:
+                # The left child is always created first
+                node_list[parent][4 if node_list[parent][4] < 0 else 5] = node
+            if count <= self._leaf_size:
+                continue
+            items = self._order[start:start + count]
+            item_centroids = centroids[items]
+            axis = int(np.argmax(item_centroids.max(axis=0) - item_centroids.min(axis=0)))
+            half = count // 2
+            split = np.argpartition(item_centroids[:, axis], half)
+            self._order[start:start + count] = items[split]
+            # Popped last-in first-out: push the right half first so the left child is created first
+            pending.append((start + half, count - half, node, depth + 1))
+            pending.append((start, half, node, depth + 1))
+        nodes = np.array(node_list, dtype=np.int64).reshape(-1, 6)
+        self._node_start = nodes[:, 0]
+        self._node_count = nodes[:, 1]
+        self._node_parent = nodes[:, 2]
+        self._node_depth = nodes[:, 3]
+        self._node_left = nodes[:, 4]
+        self._node_right = nodes[:, 5]
+        self._node_min = np.zeros((len(nodes), 3))
+        self._node_max = np.zeros((len(nodes), 3))
+        # Leaf holding each item, for refitting
+        self._item_leaf = np.zeros(item_count, dtype=np.int64)
+        leaves = np.flatnonzero(self._node_left < 0)
+        self._item_leaf[self._order[_expand_ranges(self._node_start[leaves], self._node_count[leaves])]] = \
+            np.repeat(leaves, self._node_count[leaves])
+        self._refit_nodes(np.ones(len(nodes), dtype=bool))
+
+    def _refit_nodes(self, dirty):
+        """ Recalculate the boxes of the dirty nodes, deepest first (children before parents) """
+        for depth in range(self.depth - 1, -1, -1):
+            nodes = np.flatnonzero(dirty & (self._node_depth == depth))
+            if not len(nodes):
+                continue
+            leaves = nodes[self._node_left[nodes] < 0]
+            if len(leaves):
+                items = self._order[_expand_ranges(self._node_start[leaves], self._node_count[leaves])]
+                offsets = np.concatenate([[0], np.cumsum(self._node_count[leaves])[:-1]])
+                self._node_min[leaves] = np.minimum.reduceat(self._item_min[items], offsets)
+                self._node_max[leaves] = np.maximum.reduceat(self._item_max[items], offsets)
+            inner = nodes[self._node_left[nodes] >= 0]
+            if len(inner):
+                left = self._node_left[inner]
+                right = self._node_right[inner]
+                self._node_min[inner] = np.minimum(self._node_min[left], self._node_min[right])
+                self._node_max[inner] = np.maximum(self._node_max[left], self._node_max[right])
+
+    def refit(self):
+        """
+        Update the tree after meshes moved (their cached world matrices changed) or their
+        bounds changed. Rebuilds instead if a mesh gained or lost its bounds.
+        Returns the number of meshes whose box changed.
+        """
+        snapshot = self._snapshot()
+        changed = []
+        for index, ((matrix, box), (old_matrix, old_box)) in enumerate(zip(snapshot, self._snapshot_list)):
+            if matrix is not old_matrix or box is not old_box:
+                if (box is None) != (old_box is None):
+                    self._build()
+                    return len(self._item_list)
+                if box is not None:
+                    changed.append(self._item_index_dict[id(self._mesh_list[index])])
+        self._snapshot_list = snapshot
+        if not changed:
+            return 0
+        changed = np.array(changed)
+        matrices = np.array([self._item_list[item].global_matrix for item in changed])
+        box_mins = np.array([self._item_list[item].bounding_box[0] for item in changed])
+        box_maxs = np.array([self._item_list[item].bounding_box[1] for item in changed])
+        self._item_min[changed], self._item_max[changed] = Frustum.world_boxes(matrices, box_mins, box_maxs)
+        # Mark the leaves of the changed items and all their ancestors
+        dirty = np.zeros(self.node_count, dtype=bool)
+        nodes = np.unique(self._item_leaf[changed])
+        while len(nodes):
+            dirty[nodes] = True
+            nodes = np.unique(self._node_parent[nodes])
+            nodes = nodes[nodes >= 0]
+            # Ancestors of dirty nodes are already marked
+            nodes = nodes[~dirty[nodes]]
+        self._refit_nodes(dirty)
+        return len(changed)
+
+    def _query(self, node_test, item_test):
+        """
+        Visit the tree one level at a time. node_test(nodes) classifies node boxes as
+        Frustum.OUTSIDE, INSIDE (every item below is accepted without more tests) or
+        INTERSECTING; item_test(items) accepts or rejects the items of intersected leaves.
+        Returns the accepted item indices.
+        """
+        accepted = []
+        nodes = np.zeros(1 if self.node_count else 0, dtype=np.int64)
+        while len(nodes):
+            result = node_test(nodes)
+            inside = nodes[result == Frustum.INSIDE]
+            if len(inside):
+                accepted.append(self._order[_expand_ranges(self._node_start[inside], self._node_count[inside])])
+            crossing = nodes[result == Frustum.INTERSECTING]
+            leaves = crossing[self._node_left[crossing] < 0]
+            if len(leaves):
+                items = self._order[_expand_ranges(self._node_start[leaves], self._node_count[leaves])]
+                accepted.append(items[item_test(items)])
+            inner = crossing[self._node_left[crossing] >= 0]
+            nodes = np.concatenate([self._node_left[inner], self._node_right[inner]])
+        if not accepted:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(accepted)
+
+    def _meshes(self, items):
+        """ Meshes of the item indices, in the order of the mesh list """
+        return [self._item_list[item] for item in np.sort(items)]
+
+    def query_frustum(self, frustum):
+        """ Meshes whose box is at least partly inside the frustum """
+        items = self._query(
+            lambda nodes: frustum.classify_boxes(self._node_min[nodes], self._node_max[nodes]),
+            lambda items: frustum.classify_boxes(self._item_min[items], self._item_max[items]) != Frustum.OUTSIDE
+        )
+        return self._meshes(items)
+
+    def query_sphere(self, center, radius):
+        """ Meshes whose box overlaps the sphere """
+        center = np.asarray(center, dtype=np.float64)
+
+        def overlaps(box_mins, box_maxs):
+            # Distance from the center to the closest point of each box
+            closest = np.clip(center, box_mins, box_maxs)
+            return ((closest - center) ** 2).sum(axis=1) <= radius * radius
+
+        def node_test(nodes):
+            box_mins = self._node_min[nodes]
+            box_maxs = self._node_max[nodes]
+            result = np.where(overlaps(box_mins, box_maxs), Frustum.INTERSECTING, Frustum.OUTSIDE)
+            # Boxes with every corner in the sphere are entirely inside it
+            farthest = np.maximum(np.abs(box_mins - center), np.abs(box_maxs - center))
+            result[(farthest ** 2).sum(axis=1) <= radius * radius] = Frustum.INSIDE
+            return result
+
+        items = self._query(node_test, lambda items: overlaps(self._item_min[items], self._item_max[items]))
+        return self._meshes(items)
+
+    def query_ray(self, origin, direction, max_distance=np.inf):
+        """
+        Meshes whose box the ray crosses, nearest first: [(distance, mesh), ...], where
+        distance is where the ray enters the box (0 if the origin is inside), measured
+        in lengths of direction
+        """
+        origin = np.asarray(origin, dtype=np.float64)
+        with np.errstate(divide="ignore"):
+            inverse_direction = 1.0 / np.asarray(direction, dtype=np.float64)
+
+        def entry_distances(box_mins, box_maxs):
+            # Slab test: where the ray enters and leaves each pair of parallel planes
+            with np.errstate(invalid="ignore"):
+                near = (box_mins - origin) * inverse_direction
+                far = (box_maxs - origin) * inverse_direction
+            # fmin/fmax skip the NaN of a ray lying in a slab plane
+            enter = np.fmax.reduce(np.fmin(near, far), axis=1)
+            leave = np.fmin.reduce(np.fmax(near, far), axis=1)
+            hit = (enter <= leave) & (leave >= 0) & (enter <= max_distance)
+            return np.maximum(enter, 0.0), hit
+
+        def node_test(nodes):
+            _, hit = entry_distances(self._node_min[nodes], self._node_max[nodes])
+            return np.where(hit, Frustum.INTERSECTING, Frustum.OUTSIDE)
+
+        items = self._query(node_test, lambda items: entry_distances(self._item_min[items],
+                                                                     self._item_max[items])[1])
+        distances, _ = entry_distances(self._item_min[items], self._item_max[items])
+        order = np.argsort(distances, kind="stable")
+        return [(float(distances[index]), self._item_list[items[index]]) for index in order]
+
+    def world_box(self, mesh):
+        """ (min corner, max corner) of a mesh in the tree, in world space """
+        item = self._item_index_dict[id(mesh)]
+        return self._item_min[item], self._item_max[item]
@@ -0,0 +1,100 @@
+import OpenGL.GL as GL
+import numpy as np
+
+from core.attribute import Attribute
+from core.frustum import Frustum
+from core_ext.mesh import Mesh
+
+
+class InstancedMesh(Mesh):
+    """
+    Draws the same geometry many times with a single call (glDraw*Instanced).
+    Each instance has its own transform relative to this object, and optionally
+    its own color; the material must read them (see material/instanced.py).
+    """
+    def __init__(self, geometry, material, matrix_list, color_list=None):
+        super().__init__(geometry, material)
+        # Shader reads the columns of each matrix; store the transposes row by row
+        self._matrix_attribute = Attribute("mat4", self._to_columns(matrix_list), usage="dynamic", divisor=1)
+        self._color_attribute = None
+        if color_list is not None:
+            self._color_attribute = Attribute("vec3", color_list, usage="dynamic", divisor=1)
+        # Add the per-instance attributes to the vertex array object
+        GL.glBindVertexArray(self.vao_ref)
+        self._matrix_attribute.associate_variable(material.program_ref, "instanceMatrix")
+        if self._color_attribute is not None:
+            self._color_attribute.associate_variable(material.program_ref, "instanceColor")
+        GL.glBindVertexArray(0)
+        # Box and sphere around all instances, recalculated when an instance moves
+        self._bounding_box = None
+        self._bounding_sphere = None
+        self._bounds_dirty = True
+
+    @staticmethod
+    def _to_columns(matrix_list):
+        return np.asarray(matrix_list, dtype=np.float32).reshape(-1, 4, 4).transpose(0, 2, 1).reshape(-1, 16)
+
+    @property
+    def instance_count(self):
+        return len(self._matrix_attribute.data)
+
+    @property
+    def bounding_box(self):
+        """ Box enclosing the geometry's bounding box at every instance transform """
+        self._update_bounds()
+        return self._bounding_box
+
+    @property
+    def bounding_sphere(self):
+        """ Sphere enclosing the geometry's bounding sphere at every instance transform """
+        self._update_bounds()
+        return self._bounding_sphere
+
+    def _update_bounds(self):
+        if not self._bounds_dirty:
+            return
+        self._bounds_dirty = False
+        self._bounding_box = None
+        self._bounding_sphere = None
+        geometry = self.geometry
+        if geometry.bounding_box is None or self.instance_count == 0:
+            return
+        matrices = self._matrix_attribute.data.reshape(-1, 4, 4).transpose(0, 2, 1)
+        instance_count = len(matrices)
+        box_min, box_max = geometry.bounding_box
+        box_mins, box_maxs = Frustum.world_boxes(matrices, np.tile(box_min, (instance_count, 1)),
+                                                 np.tile(box_max, (instance_count, 1)))
+        self._bounding_box = (box_mins.min(axis=0), box_maxs.max(axis=0))
+        center, radius = geometry.bounding_sphere
+        centers, radii = Frustum.world_spheres(matrices, np.tile(center, (instance_count, 1)),
+                                               np.full(instance_count, radius))
+        union_center = (centers.min(axis=0) + centers.max(axis=0)) / 2
+        union_radius = float((np.linalg.norm(centers - union_center, axis=1) + radii).max())
+        self._bounding_sphere = (union_center, union_radius)
+
+    @property
+    def instance_matrices(self):
+        """ Transform of each instance (copies; use set_instance_matrix to change them) """
+        return [np.array(columns.reshape(4, 4).T) for columns in self._matrix_attribute.data]
+
+    def set_instance_matrix(self, index, matrix):
+        """ Move one instance, uploading only its matrix """
+        self._matrix_attribute.update_range(index, self._to_columns([matrix]))
+        self._bounds_dirty = True
+
+    def set_instance_color(self, index, color):
+        if self._color_attribute is None:
+            raise Exception("InstancedMesh was created without instance colors")
+        self._color_attribute.update_range(index, [color])
+
+    def set_instance_matrices(self, matrix_list):
+        """ Replace all instances (their number may change) """
+        self._matrix_attribute.data = self._to_columns(matrix_list)
+        self._matrix_attribute.upload_data()
+        self._bounds_dirty = True
+
+    def delete(self, include_geometry=True):
+        super().delete(include_geometry)
+        self._matrix_attribute.delete()
+        if self._color_attribute is not None:
+            self._color_attribute.delete()
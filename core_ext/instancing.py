@@ -0,0 +1,70 @@
+import hashlib
+
+from core.instance_detect import DEFAULT_TOLERANCE, find_identical_groups
+from core_ext.instanced_mesh import InstancedMesh
+from core_ext.mesh import Mesh
+from core_ext.static_batch import StaticBatch, material_key
+from geometry.geometry import Geometry
+from material.instanced import InstancedSurfaceMaterial, InstancedTextureMaterial
+from material.surface import SurfaceMaterial
+from material.texture import TextureMaterial
+
+# Material class -> function creating its instanced variant
+INSTANCED_MATERIAL_DICT = {
+    TextureMaterial: lambda material: InstancedTextureMaterial(material.texture),
+    SurfaceMaterial: lambda material: InstancedSurfaceMaterial(),
+}
+
+
+def make_instanced_material(material):
+    """ Instanced variant of a material, with the same uniform values and render settings """
+    instanced_material = INSTANCED_MATERIAL_DICT[type(material)](material)
+    for name, uniform_object in material.uniform_dict.items():
+        if name in instanced_material.uniform_dict and uniform_object.data is not None:
+            instanced_material.uniform_dict[name].data = uniform_object.data
+    instanced_material.setting_dict.update(material.setting_dict)
+    return instanced_material
+
+
+def _instance_key(mesh):
+    """ Meshes can only be instances of each other if everything but the placement matches """
+    geometry = mesh.geometry
+    digest = hashlib.sha1()
+    for name in sorted(geometry.attribute_dict):
+        # Positions may differ by a rigid transform; normals follow the positions
+        if name == "vertexPosition" or name in Geometry.NORMAL_NAMES:
+            continue
+        digest.update(name.encode("utf-8"))
+        digest.update(geometry.attribute_dict[name].data.tobytes())
+    if geometry.index_buffer is not None:
+        digest.update(geometry.index_buffer.data.tobytes())
+    return material_key(mesh.material), tuple(sorted(geometry.attribute_dict)), digest.hexdigest()
+
+
+def instance_identical_meshes(root, min_count=4, tolerance=DEFAULT_TOLERANCE):
+    """
+    Replace meshes below root that are copies of each other (same geometry up to a
+    rigid transform, same material) with one InstancedMesh per set of copies, added
+    to root. Returns {instanced mesh: [replaced meshes]}.
+    """
+    mesh_list = [mesh for mesh in root.get_descendants_by_type(Mesh)
+                 if not isinstance(mesh, InstancedMesh) and type(mesh.material) in INSTANCED_MATERIAL_DICT]
+    items = [(mesh.geometry.attribute_dict["vertexPosition"].data, _instance_key(mesh)) for mesh in mesh_list]
+    replaced_dict = {}
+    for reference_index, matches in find_identical_groups(items, tolerance, min_count):
+        reference_mesh = mesh_list[reference_index]
+        # Copy placement relative to root = its transform @ (reference vertices -> copy vertices)
+        matrix_list = [StaticBatch.relative_matrix(root, mesh_list[index]) @ matrix for index, matrix in matches]
+        instanced_mesh = InstancedMesh(reference_mesh.geometry, make_instanced_material(reference_mesh.material),
+                                       matrix_list)
+        root.add(instanced_mesh)
+        replaced = [mesh_list[index] for index, _ in matches]
+        for mesh in replaced:
+            mesh.parent.remove(mesh)
+            # The instanced mesh keeps drawing the reference geometry
+            mesh.delete(include_geometry=mesh is not reference_mesh)
+        replaced_dict[instanced_mesh] = replaced
+    if replaced_dict:
+        replaced_count = sum(len(replaced) for replaced in replaced_dict.values())
+        print(f"🔁 Instancing: {replaced_count} meshes -> {len(replaced_dict)} meshes instanciadas")
+    return replaced_dict
@@ -20,6 +20,9 @@ class Mesh(Object3D):
         GL.glBindVertexArray(self._vao_ref)
         for variable_name, attribute_object in geometry.attribute_dict.items():
             attribute_object.associate_variable(material.program_ref, variable_name)
+        # Indexed geometry: the element array binding is stored in the vertex array object
+        if geometry.index_buffer is not None:
+            GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, geometry.index_buffer.buffer_ref)
         # Unbind this vertex array object
         GL.glBindVertexArray(0)
 
@@ -38,3 +41,28 @@ class Mesh(Object3D):
     @property
     def visible(self):
         return self._visible
+
+    @property
+    def bounding_box(self):
+        """ (min corner, max corner) of everything this mesh draws, in its local space """
+        return self._geometry.bounding_box
+
+    @property
+    def bounding_sphere(self):
+        """ (center, radius) enclosing everything this mesh draws, in its local space """
+        return self._geometry.bounding_sphere
+
+    def delete(self, include_geometry=True):
+        """
+        Free the vertex array object and the geometry buffers on the GPU
+        (keep the geometry buffers if another mesh still draws the same geometry)
+        """
+        if self._vao_ref is not None:
+            GL.glDeleteVertexArrays(1, [self._vao_ref])
+            self._vao_ref = None
+        if not include_geometry:
+            return
+        for attribute_object in self._geometry.attribute_dict.values():
+            attribute_object.delete()
+        if self._geometry.index_buffer is not None:
+            self._geometry.index_buffer.delete()
@@ -9,6 +9,14 @@ class Object3D:
         self._matrix = Matrix.make_identity()
         self._parent = None
         self._children_list = []
+        # Cached list of descendants (None when the tree below has changed)
+        # and cached lists of descendants filtered by class
+        self._descendant_cache = None
+        self._descendant_type_cache = {}
+        # Cached transformation relative to the root, recalculated only when
+        # this node or one of its ancestors has moved (dirty flag)
+        self._world_matrix = None
+        self._world_matrix_dirty = True
 
     @property
     def children_list(self):
@@ -17,50 +25,96 @@ class Object3D:
     @children_list.setter
     def children_list(self, children_list):
         self._children_list = children_list
+        self._invalidate_descendants()
 
     @property
     def descendant_list(self):
         """ Return a single list containing all descendants """
-        # master list of all descendant nodes
-        descendant_list = []
-        # nodes to be added to descendant list,
-        # and whose children will be added to this list
-        nodes_to_process = [self]
-        # continue processing nodes while any are left
-        while len(nodes_to_process) > 0:
-            # remove first node from list
-            node = nodes_to_process.pop(0)
-            # add this node to descendant list
-            descendant_list.append(node)
-            # children of this node must also be processed
-            nodes_to_process = node._children_list + nodes_to_process
+        return list(self._get_descendant_cache())
+
+    def get_descendants_by_type(self, object_type):
+        """
+        Return the descendants that are instances of object_type (for example Mesh or Light).
+        The list is cached until the tree changes, so it must not be modified by the caller.
+        """
+        descendant_list = self._descendant_type_cache.get(object_type)
+        if descendant_list is None:
+            descendant_list = [node for node in self._get_descendant_cache()
+                               if isinstance(node, object_type)]
+            self._descendant_type_cache[object_type] = descendant_list
         return descendant_list
 
+    def _get_descendant_cache(self):
+        if self._descendant_cache is None:
+            # master list of all descendant nodes, in depth-first order
+            descendant_list = []
+            # nodes still to be processed; the next node is at the end of the list
+            nodes_to_process = [self]
+            while nodes_to_process:
+                node = nodes_to_process.pop()
+                descendant_list.append(node)
+                # children are processed next, first child first
+                nodes_to_process.extend(reversed(node._children_list))
+            self._descendant_cache = descendant_list
+        return self._descendant_cache
+
+    def mark_matrix_dirty(self):
+        """
+        The local matrix of this node changed: the cached world matrices of this node
+        and of all its descendants must be recalculated
+        """
+        nodes_to_process = [self]
+        while nodes_to_process:
+            node = nodes_to_process.pop()
+            # A dirty node only has dirty descendants, so its subtree can be skipped
+            if node._world_matrix_dirty and node is not self:
+                continue
+            node._world_matrix_dirty = True
+            nodes_to_process.extend(node._children_list)
+
+    def _invalidate_descendants(self):
+        """ The tree below this node changed: drop the cached lists here and in all ancestors """
+        node = self
+        while node is not None:
+            node._descendant_cache = None
+            node._descendant_type_cache = {}
+            node = node._parent
+
     @property
     def global_matrix(self):
         """
         Calculate the transformation of this Object3D
         relative to the root Object3D of the scene graph
+        The result is cached and must not be modified by the caller.
         """
-        if self._parent is None:
-            return self._matrix
-        else:
-            return self._parent.global_matrix @ self._matrix
+        if self._world_matrix_dirty:
+            if self._parent is None:
+                self._world_matrix = self._matrix
+            else:
+                self._world_matrix = self._parent.global_matrix @ self._matrix
+            self._world_matrix_dirty = False
+        return self._world_matrix
 
     @property
     def global_position(self):
         """ Return the global or world position of the object """
-        return [self.global_matrix.item((0, 3)),
-                self.global_matrix.item((1, 3)),
-                self.global_matrix.item((2, 3))]
+        global_matrix = self.global_matrix
+        return [global_matrix.item((0, 3)),
+                global_matrix.item((1, 3)),
+                global_matrix.item((2, 3))]
 
     @property
     def local_matrix(self):
+        """
+        Changes made in place to the returned array are not tracked;
+        assign a new matrix (or call mark_matrix_dirty) instead
+        """
         return self._matrix
 
     @local_matrix.setter
     def local_matrix(self, matrix):
         self._matrix = matrix
+        self.mark_matrix_dirty()
 
     @property
     def local_position(self):
@@ -80,6 +134,7 @@ class Object3D:
     @parent.setter
     def parent(self, parent):
         self._parent = parent
+        self.mark_matrix_dirty()
 
     @property
     def rotation_matrix(self):
@@ -101,10 +156,12 @@ class Object3D:
     def add(self, child):
         self._children_list.append(child)
         child.parent = self
+        self._invalidate_descendants()
 
     def remove(self, child):
         self._children_list.remove(child)
         child.parent = None
+        self._invalidate_descendants()
 
     # apply geometric transformations
     def apply_matrix(self, matrix, local=True):
@@ -114,6 +171,7 @@ class Object3D:
         else:
             # global transform
             self._matrix = matrix @ self._matrix
+        self.mark_matrix_dirty()
 
     def translate(self, x, y, z, local=True):
         m = Matrix.make_translation(x, y, z)
@@ -140,12 +198,14 @@ class Object3D:
         self._matrix[0,3] = position[0]
         self._matrix[1,3] = position[1]
         self._matrix[2,3] = position[2]
+        self.mark_matrix_dirty()
         #self._matrix.itemset((0, 3), position[0])
         #self._matrix.itemset((1, 3), position[1])
         #self._matrix.itemset((2, 3), position[2])
 
     def look_at(self, target_position):
         self._matrix = Matrix.make_look_at(self.global_position, target_position)
+        self.mark_matrix_dirty()
 
     def set_direction(self, direction):
         position = self.local_position
@@ -163,6 +223,7 @@ class Object3D:
         m[:3, :3] = rot[:3, :3]
         m[0, 3], m[1, 3], m[2, 3] = pos
         self._matrix = m
+        self.mark_matrix_dirty()
 
     
 
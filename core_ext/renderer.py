@@ -1,33 +1,108 @@
+import time
+
 import OpenGL.GL as GL
-import pygame
 
+from core.context import get_current_context
+from core.frustum import Frustum
+from core.uniform import Uniform
+from core_ext.bvh import BoundingVolumeHierarchy
+from core_ext.instanced_mesh import InstancedMesh
 from core_ext.mesh import Mesh
 from light.light import Light
 from light.shadow import Shadow
+from material.morph import MorphMaterial
 
 
 class Renderer:
-    def __init__(self, clear_color=(0, 0, 0)):
+    def __init__(self, clear_color=(0, 0, 0), sort_draw_calls=True, frustum_culling=True):
         GL.glEnable(GL.GL_DEPTH_TEST)
         # required for antialiasing
         GL.glEnable(GL.GL_MULTISAMPLE)
         GL.glClearColor(*clear_color, 1)
-        self._window_size = pygame.display.get_surface().get_size()
+        # Size and default framebuffer of the window, or of the offscreen context
+        context = get_current_context()
+        self._window_size = context.size
+        self._framebuffer_ref = context.framebuffer_ref
         self._shadows_enabled = False
+        # Sort opaque meshes by render state (program, textures, settings) before drawing
+        self._sort_draw_calls = sort_draw_calls
+        # Skip meshes whose bounding box is outside the camera (or shadow camera) frustum
+        self._frustum_culling = frustum_culling
+        # Bounding volume hierarchy of each scene's meshes: scene id -> hierarchy
+        self._bvh_dict = {}
+        # Cached draw order for each scene: scene id -> (mesh list, opaque meshes, transparent meshes)
+        self._draw_order_dict = {}
+        # State-change statistics of the last render
+        self._program_switch_count = 0
+        self._settings_update_count = 0
+        self._settings_skip_count = 0
+        self._draw_count = 0
+        self._culled_count = 0
+        self._shadow_draw_count = 0
+        self._shadow_culled_count = 0
+        # CPU time of the last render, in seconds (the GPU may still be drawing afterwards)
+        self._render_time = 0.0
+        # Renders since the renderer was created
+        self._render_count = 0
 
     @property
     def window_size(self):
         return self._window_size
 
+    @property
+    def render_count(self):
+        return self._render_count
+
+    @property
+    def program_switch_count(self):
+        return self._program_switch_count
+
+    @property
+    def stats(self):
+        """ State changes made by the last render """
+        return {
+            "draws": self._draw_count,
+            "culled": self._culled_count,
+            "shadowDraws": self._shadow_draw_count,
+            "shadowCulled": self._shadow_culled_count,
+            "renderTime": self._render_time,
+            "programSwitches": self._program_switch_count,
+            "settingsUpdates": self._settings_update_count,
+            "settingsSkipped": self._settings_skip_count,
+            "uniformUploads": Uniform.upload_count,
+            "uniformSkipped": Uniform.skip_count,
+        }
+
+    @property
+    def uniform_upload_count(self):
+        """ Uniform and texture binding GL calls issued by the last render """
+        return Uniform.upload_count
+
+    @property
+    def uniform_skip_count(self):
+        """ Uniform and texture binding GL calls skipped by the last render (value unchanged) """
+        return Uniform.skip_count
+
     @property
     def shadow_object(self):
         return self._shadow_object
 
     def render(self, scene, camera, clear_color=True, clear_depth=True, render_target=None):
-        # Filter descendents
-        descendant_list = scene.descendant_list
-        mesh_filter = lambda x: isinstance(x, Mesh)
-        mesh_list = list(filter(mesh_filter, descendant_list))
+        render_start = time.perf_counter()
+        # Extract list of all Mesh and Light instances in scene
+        # (cached by the scene graph until objects are added or removed)
+        mesh_list = scene.get_descendants_by_type(Mesh)
+        light_list = scene.get_descendants_by_type(Light)
+        bvh = self._get_bvh(scene, mesh_list) if self._frustum_culling else None
+        self._program_switch_count = 0
+        self._settings_update_count = 0
+        self._settings_skip_count = 0
+        self._draw_count = 0
+        self._culled_count = 0
+        self._shadow_draw_count = 0
+        self._shadow_culled_count = 0
+        # Texture bindings may have changed since the last render (e.g. texture uploads)
+        Uniform.reset_frame_state()
 
         # shadow pass
         if self._shadows_enabled:
@@ -38,31 +113,45 @@ class Renderer:
             GL.glClearColor(1, 1, 1, 1)
             GL.glClear(GL.GL_COLOR_BUFFER_BIT)
             GL.glClear(GL.GL_DEPTH_BUFFER_BIT)
-            # Everything in the scene gets rendered with depthMaterial so
-            # only need to call glUseProgram & set matrices once
-            GL.glUseProgram(self._shadow_object.material.program_ref)
+            # Everything in the scene gets rendered with depthMaterial (animated
+            # characters with its morph variant), so the matrices are set once
             self._shadow_object.update_internal()
-            for mesh in mesh_list:
-                # Skip invisible meshes
-                if not mesh.visible:
-                    continue
-                # Only triangle-based meshes cast shadows
-                if mesh.material.setting_dict["drawStyle"] != GL.GL_TRIANGLES:
-                    continue
+            caster_list = [
+                mesh for mesh in mesh_list
+                # Only visible, triangle-based meshes cast shadows;
+                # the depth material does not read per-instance transforms
+                if mesh.visible and mesh.vao_ref is not None
+                and mesh.material.setting_dict["drawStyle"] == GL.GL_TRIANGLES
+                and not isinstance(mesh, InstancedMesh)
+            ]
+            # Meshes outside the light's orthographic box are not in the shadow map
+            caster_list, self._shadow_culled_count = self._frustum_cull(caster_list, self._shadow_object.camera, bvh)
+            current_program_ref = None
+            for mesh in caster_list:
+                if isinstance(mesh.material, MorphMaterial):
+                    depth_material = self._shadow_object.morph_material
+                    depth_material.copy_frame_uniforms(mesh.material)
+                else:
+                    depth_material = self._shadow_object.material
+                if depth_material.program_ref != current_program_ref:
+                    current_program_ref = depth_material.program_ref
+                    GL.glUseProgram(current_program_ref)
+                    self._program_switch_count += 1
                 # Bind VAO
                 GL.glBindVertexArray(mesh.vao_ref)
                 # Update transform data
-                self._shadow_object.material.uniform_dict["modelMatrix"].data = mesh.global_matrix
+                depth_material.uniform_dict["modelMatrix"].data = mesh.global_matrix
                 # Update uniforms (matrix data) stored in shadow material
-                for var_name, uniform_obj in self._shadow_object.material.uniform_dict.items():
+                for var_name, uniform_obj in depth_material.uniform_dict.items():
                     uniform_obj.upload_data()
-                GL.glDrawArrays(GL.GL_TRIANGLES, 0, mesh.geometry.vertex_count)
+                self._draw_mesh(GL.GL_TRIANGLES, mesh)
+                self._shadow_draw_count += 1
 
         # Activate render target
         if render_target is None:
             # Set render target to window
-            # (the value 0 is indicating the framebuffer attached to the window)
-            GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, 0)
+            # (0 is the framebuffer attached to the window; headless contexts have their own)
+            GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self._framebuffer_ref)
             GL.glViewport(0, 0, *self._window_size)
         else:
             # Set render target properties
@@ -79,16 +168,20 @@ class Renderer:
         GL.glBlendFunc(GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA)
         # Update camera view (calculate inverse)
         camera.update_view_matrix()
-        # Extract list of all Mesh instances in scene
-        descendant_list = scene.descendant_list
-        mesh_list = list(filter(lambda x: isinstance(x, Mesh), descendant_list))
-        # Extract list of all Light instances in scene
-        light_list = list(filter(lambda x: isinstance(x, Light), descendant_list))
-        for mesh in mesh_list:
-            # If this object is not visible, continue to next object in list
-            if not mesh.visible:
-                continue
-            GL.glUseProgram(mesh.material.program_ref)
+        # Materials with the same shader code share one program (see ProgramCache),
+        # so only switch programs when it actually changes between meshes
+        current_program_ref = None
+        # Render settings applied by the previous draw (GL state may have changed before this render)
+        current_settings = None
+        # If an object is not visible, leave it out; so are meshes whose GPU data was deleted
+        draw_list = [mesh for mesh in self._get_draw_list(scene, mesh_list, camera)
+                     if mesh.visible and mesh.vao_ref is not None]
+        draw_list, self._culled_count = self._frustum_cull(draw_list, camera, bvh)
+        for mesh in draw_list:
+            if mesh.material.program_ref != current_program_ref:
+                current_program_ref = mesh.material.program_ref
+                GL.glUseProgram(current_program_ref)
+                self._program_switch_count += 1
             # Bind VAO
             GL.glBindVertexArray(mesh.vao_ref)
             # Update uniform values stored outside of material
@@ -110,9 +203,103 @@ class Renderer:
             # Update uniforms stored in material
             for uniform_object in mesh.material.uniform_dict.values():
                 uniform_object.upload_data()
-            # Update render settings
-            mesh.material.update_render_settings()
-            GL.glDrawArrays(mesh.material.setting_dict["drawStyle"], 0, mesh.geometry.vertex_count)
+            # Update render settings, unless the previous draw used the same ones
+            settings = (type(mesh.material), tuple(mesh.material.setting_dict.values()))
+            if settings != current_settings:
+                mesh.material.update_render_settings()
+                current_settings = settings
+                self._settings_update_count += 1
+            else:
+                self._settings_skip_count += 1
+            self._draw_mesh(mesh.material.setting_dict["drawStyle"], mesh)
+            self._draw_count += 1
+        self._render_time = time.perf_counter() - render_start
+        self._render_count += 1
+
+    @staticmethod
+    def _draw_mesh(draw_style, mesh):
+        """
+        Draw the vertices of the bound vertex array object, through the indices if there
+        are any, once per instance for instanced meshes
+        """
+        geometry = mesh.geometry
+        index_buffer = geometry.index_buffer
+        if isinstance(mesh, InstancedMesh):
+            if index_buffer is None:
+                GL.glDrawArraysInstanced(draw_style, 0, geometry.vertex_count, mesh.instance_count)
+            else:
+                GL.glDrawElementsInstanced(draw_style, index_buffer.count, index_buffer.index_type, None,
+                                           mesh.instance_count)
+        elif index_buffer is None:
+            GL.glDrawArrays(draw_style, 0, geometry.vertex_count)
+        else:
+            GL.glDrawElements(draw_style, index_buffer.count, index_buffer.index_type, None)
+
+    @staticmethod
+    def _frustum_cull(mesh_list, camera, bvh):
+        """
+        Meshes of the list (in the same order) whose world bounding box may be inside
+        the camera frustum, and the number left out. Meshes without bounds are always kept.
+        """
+        if bvh is None:
+            return mesh_list, 0
+        inside_set = set(bvh.query_frustum(Frustum.from_camera(camera)))
+        kept_list = [mesh for mesh in mesh_list if mesh in inside_set or mesh not in bvh]
+        return kept_list, len(mesh_list) - len(kept_list)
+
+    def _get_bvh(self, scene, mesh_list):
+        bvh = self._bvh_dict.get(id(scene))
+        # The scene graph returns a new mesh list object whenever the tree changes
+        if bvh is None or bvh.mesh_list is not mesh_list:
+            bvh = BoundingVolumeHierarchy(mesh_list)
+            self._bvh_dict[id(scene)] = bvh
+        else:
+            bvh.refit()
+        return bvh
+
+    def get_bvh(self, scene):
+        """ Bounding volume hierarchy of the scene's meshes, with their current transforms (e.g. for picking) """
+        return self._get_bvh(scene, scene.get_descendants_by_type(Mesh))
+
+    def invalidate_draw_order(self):
+        """ Sort meshes again on the next render (call after changing material textures or settings) """
+        self._draw_order_dict = {}
+
+    def _get_draw_list(self, scene, mesh_list, camera):
+        """
+        Order in which meshes are drawn: opaque meshes sorted by render state
+        (stable, so meshes with equal state keep scene graph order), then
+        transparent meshes from back to front
+        """
+        if not self._sort_draw_calls:
+            return mesh_list
+        draw_order = self._draw_order_dict.get(id(scene))
+        # The scene graph returns a new mesh list object whenever the tree changes
+        if draw_order is None or draw_order[0] is not mesh_list:
+            opaque_list = [mesh for mesh in mesh_list if not mesh.material.setting_dict.get("transparent")]
+            transparent_list = [mesh for mesh in mesh_list if mesh.material.setting_dict.get("transparent")]
+            opaque_list.sort(key=self._state_key)
+            draw_order = (mesh_list, opaque_list, transparent_list)
+            self._draw_order_dict[id(scene)] = draw_order
+        _, opaque_list, transparent_list = draw_order
+        if not transparent_list:
+            return opaque_list
+        # Farthest first, so nearer transparent surfaces blend over them
+        camera_position = camera.global_position
+        def distance_to_camera(mesh):
+            position = mesh.global_position
+            return sum((position[i] - camera_position[i]) ** 2 for i in range(3))
+        return opaque_list + sorted(transparent_list, key=distance_to_camera, reverse=True)
+
+    @staticmethod
+    def _state_key(mesh):
+        material = mesh.material
+        texture_refs = tuple(
+            int(uniform_object.data[0]) for uniform_object in material.uniform_dict.values()
+            if uniform_object.data_type == "sampler2D" and uniform_object.data is not None
+        )
+        settings = tuple(sorted((name, str(value)) for name, value in material.setting_dict.items()))
+        return int(material.program_ref), texture_refs, type(material).__name__, settings
 
     def enable_shadows(self, shadow_light, strength=0.5, resolution=(512, 512)):
         self._shadows_enabled = True
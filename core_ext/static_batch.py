@@ -0,0 +1,222 @@
+import numpy as np
+
+from core_ext.instanced_mesh import InstancedMesh
+from core_ext.mesh import Mesh
+from core_ext.object3d import Object3D
+from geometry.geometry import Geometry
+
+# Uniforms set by the renderer for every draw; they do not distinguish materials
+_PER_DRAW_UNIFORMS = {"modelMatrix", "viewMatrix", "projectionMatrix", "viewPosition"}
+
+
+def material_key(material):
+    """
+    Meshes whose materials have the same key render identically apart from their
+    vertex data: same shader program, uniform values (including textures) and settings
+    """
+    uniform_values = []
+    for name, uniform_object in sorted(material.uniform_dict.items()):
+        if name in _PER_DRAW_UNIFORMS or uniform_object.data_type in ("Light", "Shadow"):
+            continue
+        data = uniform_object.data
+        if data is not None:
+            data = tuple(np.asarray(data, dtype=float).ravel().tolist())
+        uniform_values.append((name, data))
+    settings = tuple((name, str(value)) for name, value in material.setting_dict.items())
+    return type(material), material.program_ref, tuple(uniform_values), settings
+
+
+class BatchPart:
+    """ Where one source mesh ended up inside a batched mesh """
+    def __init__(self, mesh, first_vertex, vertex_count, first_index, index_count):
+        self.mesh = mesh
+        self.first_vertex = first_vertex
+        self.vertex_count = vertex_count
+        self.first_index = first_index
+        self.index_count = index_count
+
+
+class InstancePart:
+    """ Where one source mesh ended up as an instance of an instanced mesh """
+    def __init__(self, mesh, instance_index, matrix):
+        self.mesh = mesh
+        self.instance_index = instance_index
+        # Transform of the instance, restored when the part is shown again
+        self.matrix = matrix
+
+
+class StaticBatch(Object3D):
+    """
+    Replaces a subtree of meshes that never move relative to each other with one
+    merged mesh per material: each mesh's transform relative to the subtree root is
+    baked into its vertices, so the whole group is a single draw call.
+    The parts (source meshes, by name) can still be hidden or highlighted.
+    Only meshes are kept (instanced meshes unmerged); the batch takes the local
+    transform of the subtree root.
+    """
+    def __init__(self, root, name_dict=None, delete_source=True, instanced_dict=None):
+        """
+        name_dict: source mesh -> part name (parts without a name cannot be addressed)
+        delete_source: free the GPU buffers of the source meshes once merged
+        instanced_dict: instanced mesh -> the source meshes it replaced, one per instance
+            (as returned by instance_identical_meshes), so those parts keep their names
+        """
+        super().__init__()
+        self.local_matrix = np.array(root.local_matrix)
+        name_dict = name_dict or {}
+        # part name -> [BatchPart, ...] (names may repeat)
+        self._part_dict = {}
+        # batched mesh -> its original indices (hidden parts are overwritten in the index buffer)
+        self._index_dict = {}
+        # part name -> highlight meshes drawn instead of the part
+        self._highlight_dict = {}
+        source_mesh_list = [mesh for mesh in root.get_descendants_by_type(Mesh)
+                            if not isinstance(mesh, InstancedMesh)]
+        # Instanced meshes already draw all their copies at once: they are moved, not merged
+        for instanced_mesh in [mesh for mesh in root.get_descendants_by_type(Mesh)
+                               if isinstance(mesh, InstancedMesh)]:
+            matrix = self.relative_matrix(root, instanced_mesh)
+            instanced_mesh.parent.remove(instanced_mesh)
+            instanced_mesh.local_matrix = matrix
+            self.add(instanced_mesh)
+        for instanced_mesh, replaced in (instanced_dict or {}).items():
+            matrix_list = instanced_mesh.instance_matrices
+            for instance_index, mesh in enumerate(replaced):
+                if mesh in name_dict:
+                    part = InstancePart(instanced_mesh, instance_index, matrix_list[instance_index])
+                    self._part_dict.setdefault(name_dict[mesh], []).append(part)
+        self._source_mesh_count = len(source_mesh_list)
+        # Group by material, keeping the scene graph order inside each group
+        group_dict = {}
+        for mesh in source_mesh_list:
+            attribute_names = tuple(sorted(mesh.geometry.attribute_dict.keys()))
+            key = (material_key(mesh.material), attribute_names)
+            group_dict.setdefault(key, []).append(mesh)
+        for mesh_list in group_dict.values():
+            self._add_batch(root, mesh_list, name_dict)
+        if delete_source:
+            for mesh in source_mesh_list:
+                mesh.delete()
+
+    @property
+    def source_mesh_count(self):
+        return self._source_mesh_count
+
+    @property
+    def batch_mesh_list(self):
+        return list(self._index_dict.keys())
+
+    @property
+    def part_names(self):
+        return list(self._part_dict.keys())
+
+    def get_parts(self, name):
+        """
+        Where a named part is drawn: ranges of vertices and indices in its batched
+        mesh (BatchPart) or an instance of an instanced mesh (InstancePart)
+        """
+        if name not in self._part_dict:
+            raise Exception("Static batch has no part named: " + name)
+        return self._part_dict[name]
+
+    @staticmethod
+    def relative_matrix(root, mesh):
+        """ Transform of mesh relative to root """
+        matrix = mesh.local_matrix
+        node = mesh.parent
+        while node is not None and node is not root:
+            matrix = node.local_matrix @ matrix
+            node = node.parent
+        return matrix
+
+    def _add_batch(self, root, mesh_list, name_dict):
+        arrays_dict = {name: [] for name in mesh_list[0].geometry.attribute_dict.keys()}
+        data_type_dict = {name: attribute.data_type
+                          for name, attribute in mesh_list[0].geometry.attribute_dict.items()}
+        index_list = []
+        parts = []
+        vertex_offset = 0
+        index_offset = 0
+        for mesh in mesh_list:
+            geometry = mesh.geometry
+            matrix = self.relative_matrix(root, mesh)
+            for variable_name, attribute in geometry.attribute_dict.items():
+                data = attribute.data
+                if variable_name == "vertexPosition":
+                    data = Geometry.transform_positions(data, matrix)
+                elif variable_name in Geometry.NORMAL_NAMES:
+                    data = Geometry.transform_normals(data, matrix)
+                arrays_dict[variable_name].append(data)
+            vertex_count = geometry.vertex_count
+            if geometry.index_buffer is None:
+                indices = np.arange(vertex_count, dtype=np.uint32)
+            else:
+                indices = geometry.index_buffer.data.astype(np.uint32)
+            index_list.append(indices + vertex_offset)
+            parts.append((mesh, BatchPart(None, vertex_offset, vertex_count, index_offset, len(indices))))
+            vertex_offset += vertex_count
+            index_offset += len(indices)
+        batch_geometry = Geometry()
+        for variable_name, array_list in arrays_dict.items():
+            batch_geometry.add_attribute(data_type_dict[variable_name], variable_name, np.concatenate(array_list))
+        indices = np.concatenate(index_list)
+        batch_geometry.set_indices(indices)
+        batch_mesh = Mesh(batch_geometry, mesh_list[0].material)
+        self.add(batch_mesh)
+        self._index_dict[batch_mesh] = batch_geometry.index_buffer.data.copy()
+        for mesh, part in parts:
+            part.mesh = batch_mesh
+            if mesh in name_dict:
+                self._part_dict.setdefault(name_dict[mesh], []).append(part)
+
+    def set_part_visible(self, name, visible):
+        """
+        Hide a part by turning its triangles into degenerate ones, or an instance by
+        zeroing its transform (or restore them)
+        """
+        for part in self.get_parts(name):
+            if isinstance(part, InstancePart):
+                matrix = part.matrix if visible else np.zeros((4, 4))
+                part.mesh.set_instance_matrix(part.instance_index, matrix)
+                continue
+            original_indices = self._index_dict[part.mesh][part.first_index:part.first_index + part.index_count]
+            if visible:
+                indices = original_indices
+            else:
+                indices = np.full(part.index_count, part.first_vertex)
+            part.mesh.geometry.index_buffer.update_range(part.first_index, indices)
+
+    def highlight(self, name, material):
+        """ Draw a part with another material (for example a brighter color) """
+        self.clear_highlight(name)
+        highlight_list = []
+        for part in self.get_parts(name):
+            if isinstance(part, InstancePart):
+                # Shares the instanced geometry, placed where the instance is
+                highlight_mesh = Mesh(part.mesh.geometry, material)
+                highlight_mesh.local_matrix = part.mesh.local_matrix @ part.matrix
+                self.add(highlight_mesh)
+                highlight_list.append((highlight_mesh, False))
+                continue
+            source_geometry = part.mesh.geometry
+            geometry = Geometry()
+            vertex_range = slice(part.first_vertex, part.first_vertex + part.vertex_count)
+            for variable_name, attribute in source_geometry.attribute_dict.items():
+                geometry.add_attribute(attribute.data_type, variable_name, attribute.data[vertex_range])
+            original_indices = self._index_dict[part.mesh][part.first_index:part.first_index + part.index_count]
+            geometry.set_indices(original_indices.astype(np.uint32) - part.first_vertex)
+            highlight_mesh = Mesh(geometry, material)
+            self.add(highlight_mesh)
+            highlight_list.append((highlight_mesh, True))
+        self.set_part_visible(name, False)
+        self._highlight_dict[name] = highlight_list
+
+    def clear_highlight(self, name):
+        for highlight_mesh, owns_geometry in self._highlight_dict.pop(name, []):
+            self.remove(highlight_mesh)
+            highlight_mesh.delete(include_geometry=owns_geometry)
+        self.set_part_visible(name, True)
+
+    def report(self, label):
+        print(f"🧱 {label}: {self._source_mesh_count} meshes -> {len(self.get_descendants_by_type(Mesh))} draws "
+              f"({len(self._part_dict)} partes com nome)")
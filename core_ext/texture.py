@@ -1,4 +1,5 @@
 import OpenGL.GL as GL
+import numpy as np
 import pygame
 
 
@@ -9,6 +10,8 @@ class Texture:
         self._surface = None
         # reference of available texture from GPU
         self._texture_ref = GL.glGenTextures(1)
+        # approximate GPU memory used by the uploaded image (including mipmaps)
+        self._gpu_bytes = 0
         # default property values
         self._property_dict = {
             "magFilter": GL.GL_LINEAR,
@@ -33,6 +36,10 @@ class Texture:
     def texture_ref(self):
         return self._texture_ref
 
+    @property
+    def gpu_bytes(self):
+        return self._gpu_bytes
+
     def load_image(self, file_name):
         """ Load image from file """
         self._surface = pygame.image.load(file_name)
@@ -46,17 +53,29 @@ class Texture:
                 else:  # unknown property type
                     raise Exception("Texture has no property with name: " + name)
 
+    @staticmethod
+    def decode_image(file_name):
+        """
+        Decode an image file into (width, height, RGBA bytes) without touching OpenGL,
+        so it can run in a worker thread or process
+        """
+        surface = pygame.image.load(file_name)
+        return surface.get_width(), surface.get_height(), pygame.image.tostring(surface, "RGBA", True)
+
     def upload_data(self):
         """ Upload pixel data to GPU """
-        # Store image dimensions
-        width = self._surface.get_width()
-        height = self._surface.get_height()
         # Convert image data to string buffer
         pixel_data = pygame.image.tostring(self._surface, "RGBA", True)
+        self.upload_pixels(self._surface.get_width(), self._surface.get_height(), pixel_data)
+
+    def upload_pixels(self, width, height, pixel_data):
+        """ Upload already decoded RGBA pixel data (see decode_image) to GPU """
         # Specify texture used by the following functions
         GL.glBindTexture(GL.GL_TEXTURE_2D, self._texture_ref)
         # Send pixel data to texture buffer
         GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, GL.GL_RGBA, width, height, 0, GL.GL_RGBA, GL.GL_UNSIGNED_BYTE, pixel_data)
+        # 4 bytes per pixel; the mipmap chain adds about one third
+        self._gpu_bytes = width * height * 4 * 4 // 3
         # Generate mipmap image from uploaded pixel data
         GL.glGenerateMipmap(GL.GL_TEXTURE_2D)
         # Specify technique for magnifying/minifying textures
@@ -66,4 +85,32 @@ class Texture:
         GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_S, self._property_dict["wrap"])
         GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_T, self._property_dict["wrap"])
         # Set default border color to white; important for rendering shadows
-        GL.glTexParameterfv(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_BORDER_COLOR, [1, 1, 1, 1])
\ No newline at end of file
+        GL.glTexParameterfv(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_BORDER_COLOR, [1, 1, 1, 1])
+
+    def upload_float_data(self, width, height, data, half_float=False):
+        """
+        Upload RGB float data that is not an image (for example vertex positions),
+        read in shaders with texelFetch; no mipmaps are generated
+        """
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self._texture_ref)
+        GL.glPixelStorei(GL.GL_UNPACK_ALIGNMENT, 1)
+        if half_float:
+            pixel_data = np.ascontiguousarray(data, dtype=np.float16)
+            GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, GL.GL_RGB16F, width, height, 0, GL.GL_RGB, GL.GL_HALF_FLOAT,
+                            pixel_data)
+        else:
+            pixel_data = np.ascontiguousarray(data, dtype=np.float32)
+            GL.glTexImage2D(GL.GL_TEXTURE_2D, 0, GL.GL_RGB32F, width, height, 0, GL.GL_RGB, GL.GL_FLOAT, pixel_data)
+        GL.glPixelStorei(GL.GL_UNPACK_ALIGNMENT, 4)
+        self._gpu_bytes = pixel_data.nbytes
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, self._property_dict["magFilter"])
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, self._property_dict["minFilter"])
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_S, self._property_dict["wrap"])
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_T, self._property_dict["wrap"])
+
+    def delete(self):
+        """ Free the GPU texture; the object must not be used afterwards """
+        if self._texture_ref is not None:
+            GL.glDeleteTextures([self._texture_ref])
+            self._texture_ref = None
+            self._gpu_bytes = 0
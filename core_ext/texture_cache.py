@@ -0,0 +1,126 @@
+import os
+
+from core_ext.texture import Texture
+
+
+class TextureCache:
+    """
+    Shares Texture objects between materials so each image file is decoded and
+    uploaded to the GPU only once per set of texture properties.
+    Every load() adds a reference, optionally recorded under a scope name
+    (for example the room that uses it), and the GPU texture is deleted when the
+    last reference is released.
+    """
+    def __init__(self):
+        # key -> [Texture, reference count]
+        self._entry_dict = {}
+        # scope name -> list of keys, one item per reference taken in that scope
+        self._scope_dict = {}
+        # absolute file name -> (width, height, RGBA bytes) decoded ahead of time
+        self._decoded_dict = {}
+        # statistics
+        self._hits = 0
+        self._misses = 0
+        self._bytes_saved = 0
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    @property
+    def bytes_saved(self):
+        """ GPU bytes that would have been uploaded again without the cache """
+        return self._bytes_saved
+
+    @property
+    def gpu_bytes_resident(self):
+        return sum(texture.gpu_bytes for texture, _ in self._entry_dict.values())
+
+    @property
+    def texture_count(self):
+        return len(self._entry_dict)
+
+    @staticmethod
+    def make_key(file_name, property_dict=None):
+        properties = tuple(sorted(property_dict.items())) if property_dict else ()
+        return os.path.abspath(file_name), properties
+
+    def load(self, file_name, property_dict=None, scope=None):
+        """ Return the shared texture for this file and properties, loading it if needed """
+        key = self.make_key(file_name, property_dict)
+        entry = self._entry_dict.get(key)
+        if entry is None:
+            decoded_image = self._decoded_dict.pop(key[0], None)
+            if decoded_image is None:
+                texture = Texture(file_name, property_dict)
+            else:
+                texture = Texture(None, property_dict)
+                texture.upload_pixels(*decoded_image)
+            entry = [texture, 0]
+            self._entry_dict[key] = entry
+            self._misses += 1
+        else:
+            self._hits += 1
+            self._bytes_saved += entry[0].gpu_bytes
+        entry[1] += 1
+        if scope is not None:
+            self._scope_dict.setdefault(scope, []).append(key)
+        return entry[0]
+
+    def add_decoded(self, file_name, decoded_image):
+        """
+        Provide pixels decoded elsewhere (see Texture.decode_image) so the next
+        load() of this file only has to upload them
+        """
+        key = self.make_key(file_name)
+        if not any(entry_key[0] == key[0] for entry_key in self._entry_dict):
+            self._decoded_dict[key[0]] = decoded_image
+
+    def clear_decoded(self):
+        """ Drop decoded pixels that were never loaded; return how many were dropped """
+        count = len(self._decoded_dict)
+        self._decoded_dict.clear()
+        return count
+
+    def release(self, texture):
+        """ Drop one reference to a texture; delete it from the GPU when unused """
+        for key, (cached_texture, _) in self._entry_dict.items():
+            if cached_texture is texture:
+                self._release_key(key)
+                return True
+        return False
+
+    def release_scope(self, scope):
+        """ Drop every reference taken under a scope; return number of textures deleted """
+        deleted_count = 0
+        for key in self._scope_dict.pop(scope, []):
+            if self._release_key(key):
+                deleted_count += 1
+        return deleted_count
+
+    def _release_key(self, key):
+        entry = self._entry_dict.get(key)
+        if entry is None:
+            return False
+        entry[1] -= 1
+        if entry[1] > 0:
+            return False
+        entry[0].delete()
+        del self._entry_dict[key]
+        return True
+
+    def report(self):
+        total = self._hits + self._misses
+        hit_rate = 100.0 * self._hits / total if total else 0.0
+        print(f"🖼️ Cache de texturas: {self.texture_count} texturas na GPU, "
+              f"{self._hits}/{total} pedidos servidos da cache ({hit_rate:.0f}%)")
+        print(f"   💾 Poupado: {self._bytes_saved / 2**20:.1f} MB | "
+              f"Residente: {self.gpu_bytes_resident / 2**20:.1f} MB")
+
+
+# Shared instance used by the geometry builders
+texture_cache = TextureCache()
@@ -1,3 +1,5 @@
+import numpy as np
+
 from extras.grid import GridHelper
 
 
@@ -10,6 +12,8 @@ class DirectionalLightHelper(GridHelper):
             grid_color=color,
             center_color=color
         )
-        self.geometry.attribute_dict["vertexPosition"].data.extend([[0, 0, 0], [0, 0, -10]])
-        self.geometry.attribute_dict["vertexColor"].data.extend([color, color])
+        position_attribute = self.geometry.attribute_dict["vertexPosition"]
+        position_attribute.data = np.concatenate([position_attribute.data, [[0, 0, 0], [0, 0, -10]]])
+        color_attribute = self.geometry.attribute_dict["vertexColor"]
+        color_attribute.data = np.concatenate([color_attribute.data, [color, color]])
         self.geometry.upload_data(["vertexPosition", "vertexColor"])
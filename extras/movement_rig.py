@@ -74,3 +74,4 @@ class MovementRig(Object3D):
         self._matrix[0][3] = position[0]
         self._matrix[1][3] = position[1] 
         self._matrix[2][3] = position[2]
+        self.mark_matrix_dirty()
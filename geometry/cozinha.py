@@ -1,96 +1,103 @@
 from core_ext.object3d import Object3D
 from core_ext.mesh import Mesh
+from core_ext.instancing import instance_identical_meshes
+from core_ext.static_batch import StaticBatch
 from material.texture import TextureMaterial
-from core_ext.texture import Texture
+from core_ext.texture_cache import texture_cache
 from geometry.geometry import Geometry
 from material.surface import SurfaceMaterial
 
+TEXTURE_SCOPE = "cozinha"
+
 def cozinhaGeometry(scale, verticesCozinha):
     cozinha = Object3D()
+    # Nome de cada parte, para a poder esconder/destacar depois de agrupada
+    part_names = {}
 
     # Mapeamento de texturas por nome de objeto (ajuste conforme suas texturas reais)
     texture_map = {
         # Estrutura
-        "Parede1": Texture("images/kitchen_scene/parede.jpg"),
-        "Parede2": Texture("images/kitchen_scene/parede.jpg"),
-        "Parede3": Texture("images/kitchen_scene/parede2.jpg"),
-        "Teto": Texture("images/kitchen_scene/teto.jpg"),
-        "PlacaFogao": Texture("images/kitchen_scene/fogao.jpg"),
-        "Box002": Texture("images/kitchen_scene/mesa.jpg"),
-        "Chao": Texture("images/kitchen_scene/chao.jpg"),
-        "LinhasDaCozinha": Texture("images/kitchen_scene/parede.jpg"),
+        "Parede1": texture_cache.load("images/kitchen_scene/parede.jpg", scope=TEXTURE_SCOPE),
+        "Parede2": texture_cache.load("images/kitchen_scene/parede.jpg", scope=TEXTURE_SCOPE),
+        "Parede3": texture_cache.load("images/kitchen_scene/parede2.jpg", scope=TEXTURE_SCOPE),
+        "Teto": texture_cache.load("images/kitchen_scene/teto.jpg", scope=TEXTURE_SCOPE),
+        "PlacaFogao": texture_cache.load("images/kitchen_scene/fogao.jpg", scope=TEXTURE_SCOPE),
+        "Box002": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "Chao": texture_cache.load("images/kitchen_scene/chao.jpg", scope=TEXTURE_SCOPE),
+        "LinhasDaCozinha": texture_cache.load("images/kitchen_scene/parede.jpg", scope=TEXTURE_SCOPE),
 
         # Armários
-        "BalcaoCozinha": Texture("images/kitchen_scene/fogao.jpg"),
-        "Armarios2": Texture("images/kitchen_scene/armario.jpg"),
-        "Armario1": Texture("images/kitchen_scene/armario.jpg"),
+        "BalcaoCozinha": texture_cache.load("images/kitchen_scene/fogao.jpg", scope=TEXTURE_SCOPE),
+        "Armarios2": texture_cache.load("images/kitchen_scene/armario.jpg", scope=TEXTURE_SCOPE),
+        "Armario1": texture_cache.load("images/kitchen_scene/armario.jpg", scope=TEXTURE_SCOPE),
 
         # Pias
-        "KitchenSink1": Texture("images/kitchen_scene/eletrodomestico.jpg"),
-        "KitchenSink2": Texture("images/kitchen_scene/eletrodomestico.jpg"),
-        "Door_handle_02": Texture("images/kitchen_scene/inox.jpg"),
+        "KitchenSink1": texture_cache.load("images/kitchen_scene/eletrodomestico.jpg", scope=TEXTURE_SCOPE),
+        "KitchenSink2": texture_cache.load("images/kitchen_scene/eletrodomestico.jpg", scope=TEXTURE_SCOPE),
+        "Door_handle_02": texture_cache.load("images/kitchen_scene/inox.jpg", scope=TEXTURE_SCOPE),
 
         # Eletrodomésticos
-        "electrolux_2_Part_2": Texture("images/kitchen_scene/fogao.jpg"),
-        "Technology_set_by_Miele_Part_6": Texture("images/kitchen_scene/eletrodomestico.jpg"),
-        "Technology_set_by_Miele_Part_17": Texture("images/kitchen_scene/eletrodomestico.jpg"),
-        "Frigorifico": Texture("images/kitchen_scene/eletrodomestico.jpg"),
+        "electrolux_2_Part_2": texture_cache.load("images/kitchen_scene/fogao.jpg", scope=TEXTURE_SCOPE),
+        "Technology_set_by_Miele_Part_6": texture_cache.load("images/kitchen_scene/eletrodomestico.jpg", scope=TEXTURE_SCOPE),
+        "Technology_set_by_Miele_Part_17": texture_cache.load("images/kitchen_scene/eletrodomestico.jpg", scope=TEXTURE_SCOPE),
+        "Frigorifico": texture_cache.load("images/kitchen_scene/eletrodomestico.jpg", scope=TEXTURE_SCOPE),
 
         # Decoracao
-        "Kuvshin_i_stakan_ALPHA_amethyst_Lobmeyr_Part_2": Texture("images/kitchen_scene/porcelana.jpg"),
-        "Kuvshin_i_stakan_ALPHA_amethyst_Lobmeyr_Part_3": Texture("images/kitchen_scene/porcelana.jpg"),
-        "Kuvshin_i_stakan_ALPHA_amethyst_Lobmeyr_Part_4": Texture("images/kitchen_scene/porcelana.jpg"),
-        "DecoracaoBalcao1": Texture("images/kitchen_scene/porcelana.jpg"),
+        "Kuvshin_i_stakan_ALPHA_amethyst_Lobmeyr_Part_2": texture_cache.load("images/kitchen_scene/porcelana.jpg", scope=TEXTURE_SCOPE),
+        "Kuvshin_i_stakan_ALPHA_amethyst_Lobmeyr_Part_3": texture_cache.load("images/kitchen_scene/porcelana.jpg", scope=TEXTURE_SCOPE),
+        "Kuvshin_i_stakan_ALPHA_amethyst_Lobmeyr_Part_4": texture_cache.load("images/kitchen_scene/porcelana.jpg", scope=TEXTURE_SCOPE),
+        "DecoracaoBalcao1": texture_cache.load("images/kitchen_scene/porcelana.jpg", scope=TEXTURE_SCOPE),
 
         # Apoios de pratos (Box)
-        "Box006": Texture("images/kitchen_scene/box.jpg"),
-        "Box007": Texture("images/kitchen_scene/box.jpg"),
-        "Box008": Texture("images/kitchen_scene/box.jpg"),
-        "Box009": Texture("images/kitchen_scene/box.jpg"),
-        "Box010": Texture("images/kitchen_scene/box.jpg"),
-        "Box011": Texture("images/kitchen_scene/box.jpg"),
+        "Box006": texture_cache.load("images/kitchen_scene/box.jpg", scope=TEXTURE_SCOPE),
+        "Box007": texture_cache.load("images/kitchen_scene/box.jpg", scope=TEXTURE_SCOPE),
+        "Box008": texture_cache.load("images/kitchen_scene/box.jpg", scope=TEXTURE_SCOPE),
+        "Box009": texture_cache.load("images/kitchen_scene/box.jpg", scope=TEXTURE_SCOPE),
+        "Box010": texture_cache.load("images/kitchen_scene/box.jpg", scope=TEXTURE_SCOPE),
+        "Box011": texture_cache.load("images/kitchen_scene/box.jpg", scope=TEXTURE_SCOPE),
 
         # Mesa
-        "stol_obed_170_neras_3_Part_2": Texture("images/kitchen_scene/mesa.jpg"),
-        "stol_obed_170_neras_3_Part_3": Texture("images/kitchen_scene/mesa.jpg"),
-        "stol_obed_170_neras_3_Part_4": Texture("images/kitchen_scene/mesa.jpg"),
-        "stol_obed_170_neras_3_Part_5": Texture("images/kitchen_scene/mesa.jpg"),
-        "stol_obed_170_neras_3_Part_6": Texture("images/kitchen_scene/mesa.jpg"),
-        "stol_obed_170_neras_3_Part_7": Texture("images/kitchen_scene/mesa.jpg"),
-        "stol_obed_170_neras_3_Part_8": Texture("images/kitchen_scene/mesa.jpg"),
-        "stol_obed_170_neras_3_Part_9": Texture("images/kitchen_scene/mesa.jpg"),
-        "stol_obed_170_neras_3_Part_10": Texture("images/kitchen_scene/mesa.jpg"),
-        "stol_obed_170_neras_3_Part_11": Texture("images/kitchen_scene/mesa.jpg"),
+        "stol_obed_170_neras_3_Part_2": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "stol_obed_170_neras_3_Part_3": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "stol_obed_170_neras_3_Part_4": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "stol_obed_170_neras_3_Part_5": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "stol_obed_170_neras_3_Part_6": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "stol_obed_170_neras_3_Part_7": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "stol_obed_170_neras_3_Part_8": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "stol_obed_170_neras_3_Part_9": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "stol_obed_170_neras_3_Part_10": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "stol_obed_170_neras_3_Part_11": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
 
         # Cadeiras (Douglas)
-        "Douglas_Part_4": Texture("images/kitchen_scene/mesa.jpg"),
-        "Douglas_Part_007": Texture("images/kitchen_scene/mesa.jpg"),
-        "Douglas_Part_016": Texture("images/kitchen_scene/mesa.jpg"),
-        "Douglas_Part_019": Texture("images/kitchen_scene/mesa.jpg"),
-        "Douglas_Part_022": Texture("images/kitchen_scene/mesa.jpg"),
-        "Douglas_Part_025": Texture("images/kitchen_scene/mesa.jpg"),
+        "Douglas_Part_4": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "Douglas_Part_007": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "Douglas_Part_016": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "Douglas_Part_019": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "Douglas_Part_022": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "Douglas_Part_025": texture_cache.load("images/kitchen_scene/mesa.jpg", scope=TEXTURE_SCOPE),
 
         # Utensílios (Kitchen_utensils_Part_2 a Part_16)
-        **{f"Kitchen_utensils_Part_{i}": Texture("images/kitchen_scene/inox.jpg") for i in range(2, 17)}
+        **{f"Kitchen_utensils_Part_{i}": texture_cache.load("images/kitchen_scene/inox.jpg", scope=TEXTURE_SCOPE) for i in range(2, 17)}
     }
 
     # Material genérico para o restante
-    textura_vidro = Texture("images/kitchen_scene/fogao.jpg")
-    textura_generica = Texture("images/kitchen_scene/generica.jpg")
-    textura_inox = Texture("images/kitchen_scene/inox.jpg")
-    textura_porcelana = Texture("images/kitchen_scene/porcelana.jpg")
-    textura_fogao = Texture("images/kitchen_scene/fogao.jpg")
+    textura_vidro = texture_cache.load("images/kitchen_scene/fogao.jpg", scope=TEXTURE_SCOPE)
+    textura_generica = texture_cache.load("images/kitchen_scene/generica.jpg", scope=TEXTURE_SCOPE)
+    textura_inox = texture_cache.load("images/kitchen_scene/inox.jpg", scope=TEXTURE_SCOPE)
+    textura_porcelana = texture_cache.load("images/kitchen_scene/porcelana.jpg", scope=TEXTURE_SCOPE)
+    textura_fogao = texture_cache.load("images/kitchen_scene/fogao.jpg", scope=TEXTURE_SCOPE)
 
 
     for name, group_vertices, group_uvs in verticesCozinha:
         geometry = Geometry()
-        geometry.add_attribute("vec3", "vertexPosition", group_vertices)
-
-        if not group_uvs or len(group_uvs) != len(group_vertices):
+        if len(group_uvs) != len(group_vertices):
             print(f"⚠️ UVs ausentes ou inválidas em {name}, aplicando fallback.")
             group_uvs = [[0.0, 0.0] for _ in group_vertices]
 
-        geometry.add_attribute("vec2", "vertexUV", group_uvs)
+        geometry.add_indexed_attributes([
+            ("vec3", "vertexPosition", group_vertices),
+            ("vec2", "vertexUV", group_uvs),
+        ], optimize_cache=True)
 
         # Escolha da textura
         # pratos e copos porcelana
@@ -121,7 +128,7 @@ def cozinhaGeometry(scale, verticesCozinha):
         elif name == "Lemonade_Part_126":
             material = TextureMaterial(textura_porcelana)
         elif name.startswith("Lemonade_Part_"):
-            material = TextureMaterial(Texture("images/kitchen_scene/apple.jpg"))
+            material = TextureMaterial(texture_cache.load("images/kitchen_scene/apple.jpg", scope=TEXTURE_SCOPE))
         elif name.startswith("Vinnye_bokaly_raznoj_formy_"):
             material = TextureMaterial(textura_vidro)
         elif name in texture_map:
@@ -190,8 +197,14 @@ def cozinhaGeometry(scale, verticesCozinha):
 
         mesh = Mesh(geometry, material)
         cozinha.add(mesh)
+        part_names[mesh] = name
 
     for child in cozinha.children_list:
         child.scale(scale)
 
-    return cozinha
\ No newline at end of file
+    # Objetos repetidos (cadeiras, pratos, copos...) passam a ser instâncias de uma só geometria
+    instanced_dict = instance_identical_meshes(cozinha)
+    # Os objetos da sala nunca se movem: uma mesh (um draw) por material
+    batch = StaticBatch(cozinha, part_names, instanced_dict=instanced_dict)
+    batch.report("Cozinha")
+    return batch
\ No newline at end of file
@@ -1,5 +1,7 @@
 import numpy as np
 from core.attribute import Attribute
+from core.index_buffer import IndexBuffer
+from core.vertex_index import index_vertices, optimize_vertex_cache, reorder_vertices
 
 
 class Geometry:
@@ -10,6 +12,12 @@ class Geometry:
         self._attribute_dict = {}
         # number of vertices
         self._vertex_count = None
+        # Vertex indices, if the geometry is drawn with glDrawElements
+        self._index_buffer = None
+        # Bounds of the positions in local space, updated whenever they are uploaded:
+        # axis-aligned box (min, max) and sphere (center, radius)
+        self._bounding_box = None
+        self._bounding_sphere = None
 
     @property
     def attribute_dict(self):
@@ -19,14 +27,75 @@ class Geometry:
     def vertex_count(self):
         return self._vertex_count
 
-    def add_attribute(self, data_type, variable_name, data):
-        attribute = Attribute(data_type, data)
+    @property
+    def index_buffer(self):
+        return self._index_buffer
+
+    @property
+    def bounding_box(self):
+        """ (min corner, max corner) of the vertex positions, or None without positions """
+        return self._bounding_box
+
+    @property
+    def bounding_sphere(self):
+        """ (center, radius) enclosing the vertex positions, or None without positions """
+        return self._bounding_sphere
+
+    def compute_bounds(self, position_data=None):
+        """
+        Recalculate the bounding box and sphere from the vertex positions, or from other
+        points the vertices can reach (e.g. every frame of a morph animation)
+        """
+        if position_data is None:
+            position_data = self._attribute_dict["vertexPosition"].data
+        points = np.asarray(position_data, dtype=np.float32).reshape(-1, 3)
+        if len(points) == 0:
+            self._bounding_box = None
+            self._bounding_sphere = None
+            return
+        box_min = points.min(axis=0)
+        box_max = points.max(axis=0)
+        center = (box_min + box_max) / 2
+        radius = float(np.sqrt(((points - center) ** 2).sum(axis=1).max()))
+        self._bounding_box = (box_min, box_max)
+        self._bounding_sphere = (center, radius)
+
+    def add_attribute(self, data_type, variable_name, data, usage="static", shared=False):
+        attribute = Attribute(data_type, data, usage, shared=shared)
         self._attribute_dict[variable_name] = attribute
         # Update the vertex count
         if variable_name == "vertexPosition":
             # Number of vertices may be calculated from
             # the length of any Attribute object's array of data
-            self._vertex_count = len(data)
+            self._vertex_count = len(attribute.data)
+            self.compute_bounds()
+
+    def set_indices(self, indices, shared=False):
+        """ Draw the vertices through these indices (set before creating the Mesh) """
+        if self._index_buffer is None:
+            self._index_buffer = IndexBuffer(indices, shared)
+        else:
+            self._index_buffer.data = indices
+            self._index_buffer.upload_data()
+
+    def add_indexed_attributes(self, attribute_list, optimize_cache=False, shared=False):
+        """
+        Add attributes given per triangle corner, [(data_type, variable_name, data), ...],
+        storing each distinct combination of values once plus an index buffer.
+        Optionally reorder the triangles for the GPU post-transform vertex cache.
+        shared: take the buffers from the buffer store (for data repeated in other geometries)
+        """
+        arrays = []
+        for data_type, variable_name, data in attribute_list:
+            components = Attribute.FORMAT_DICT[data_type][0]
+            arrays.append(np.asarray(data, dtype=np.float32).reshape(-1, components))
+        arrays, indices = index_vertices(arrays)
+        if optimize_cache:
+            indices = optimize_vertex_cache(indices, len(arrays[0]))
+            arrays, indices = reorder_vertices(arrays, indices)
+        for (data_type, variable_name, _), array in zip(attribute_list, arrays):
+            self.add_attribute(data_type, variable_name, array, shared=shared)
+        self.set_indices(indices, shared)
 
     def upload_data(self, variable_names=None):
         if not variable_names:
@@ -38,64 +107,67 @@ class Geometry:
                 # Number of vertices may be calculated from
                 # the length of any Attribute object's array of data
                 self._vertex_count = len(self._attribute_dict[variable_name].data)
+                self.compute_bounds()
+
+    # Attributes holding normals, which are not transformed like positions
+    NORMAL_NAMES = ["vertexNormal", "faceNormal"]
+
+    @staticmethod
+    def transform_positions(position_data, matrix):
+        """ Multiply all positions at once (homogeneous coordinate w = 1) """
+        matrix = np.asarray(matrix, dtype=np.float32)
+        return position_data @ matrix[0:3, 0:3].T + matrix[0:3, 3]
+
+    @staticmethod
+    def transform_normals(normal_data, matrix):
+        """
+        Normals are transformed by the inverse transpose of the upper-left 3x3 submatrix,
+        which keeps them perpendicular to the surface under non-uniform scaling
+        """
+        normal_matrix = np.linalg.inv(np.asarray(matrix, dtype=np.float32)[0:3, 0:3]).T
+        new_normal_data = (normal_data @ normal_matrix.T).astype(np.float32)
+        # Restore unit length (zero normals are left unchanged)
+        lengths = np.linalg.norm(new_normal_data, axis=1, keepdims=True)
+        np.divide(new_normal_data, lengths, out=new_normal_data, where=lengths > 0)
+        return new_normal_data
 
     def apply_matrix(self, matrix):
         """ Transform the data in an attribute using a matrix """
-        old_position_data = self._attribute_dict["vertexPosition"].data
-        new_position_data = []
-        for old_pos in old_position_data:
-            # Avoid changing list references
-            new_pos = old_pos.copy()
-            # Add the homogeneous fourth coordinate
-            new_pos.append(1)
-            # Multiply by matrix.
-            # No need to transform new_pos to np.array.
-            new_pos = matrix @ new_pos
-            # Remove the homogeneous coordinate
-            new_pos = list(new_pos[0:3])
-            # Add to the new data list
-            new_position_data.append(new_pos)
-        self._attribute_dict["vertexPosition"].data = new_position_data
-        # New data must be uploaded
-        self._attribute_dict["vertexPosition"].upload_data()
-        self._vertex_count = len(new_position_data)
-
-        # Extract the rotation submatrix
-        rotation_matrix = np.array(
-            [matrix[0][0:3],
-             matrix[1][0:3],
-             matrix[2][0:3]]
-        ).astype(float)
-
-        old_vertex_normal_data = self._attribute_dict["vertexNormal"].data
-        new_vertex_normal_data = []
-        for old_normal in old_vertex_normal_data:
-            # Avoid changing list references
-            new_normal = old_normal.copy()
-            new_normal = rotation_matrix @ new_normal
-            new_vertex_normal_data.append(new_normal)
-        self._attribute_dict["vertexNormal"].data = new_vertex_normal_data
-        # New data must be uploaded
-        self._attribute_dict["vertexNormal"].upload_data()
-
-        old_face_normal_data = self._attribute_dict["faceNormal"].data
-        new_face_normal_data = []
-        for old_normal in old_face_normal_data:
-            # Avoid changing list references
-            new_normal = old_normal.copy()
-            new_normal = rotation_matrix @ new_normal
-            new_face_normal_data.append(new_normal)
-        self._attribute_dict["faceNormal"].data = new_face_normal_data
-        # New data must be uploaded
-        self._attribute_dict["faceNormal"].upload_data()
+        position_attribute = self._attribute_dict["vertexPosition"]
+        # Replace (not overwrite) the arrays, which may be shared with other attributes;
+        # the size is unchanged, so the upload reuses the buffer storage
+        position_attribute.data = self.transform_positions(position_attribute.data, matrix)
+        position_attribute.upload_data()
+        self._vertex_count = len(position_attribute.data)
+        self.compute_bounds()
+        # Geometries read from OBJ files have no normals
+        for variable_name in Geometry.NORMAL_NAMES:
+            if variable_name in self._attribute_dict:
+                normal_attribute = self._attribute_dict[variable_name]
+                normal_attribute.data = self.transform_normals(normal_attribute.data, matrix)
+                normal_attribute.upload_data()
 
     def merge(self, other_geometry):
         """
         Merge data from attributes of other geometry into this object.
         Requires both geometries to have attributes with same names.
         """
+        missing_names = set(self._attribute_dict) ^ set(other_geometry.attribute_dict)
+        if missing_names:
+            raise Exception(f"Cannot merge geometries with different attributes: {sorted(missing_names)}")
+        if (self._index_buffer is None) != (other_geometry.index_buffer is None):
+            raise Exception("Cannot merge indexed and non-indexed geometry")
+        if self._index_buffer is not None:
+            # Indices of the other geometry refer to vertices appended after ours
+            self.set_indices(np.concatenate(
+                [self._index_buffer.data.astype(np.uint32),
+                 other_geometry.index_buffer.data.astype(np.uint32) + self._vertex_count]
+            ))
         for variable_name, attribute_instance in self._attribute_dict.items():
-            attribute_instance.data.extend(other_geometry.attribute_dict[variable_name].data)
+            attribute_instance.data = np.concatenate(
+                [attribute_instance.data, other_geometry.attribute_dict[variable_name].data]
+            )
             # New data must be uploaded
             attribute_instance.upload_data()
-
+        self._vertex_count = len(self._attribute_dict["vertexPosition"].data)
+        self.compute_bounds()
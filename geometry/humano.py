@@ -32,19 +32,21 @@ def parse_mtl_colors(mtl_path):
                 colors[current] = [float(parts[1]), float(parts[2]), float(parts[3])]
     return colors
 
-def humanoGeometry(verticesHumano, texture_path=None, mtl_path=None):
+def humanoGeometry(verticesHumano, texture_path=None, mtl_path=None, mtl_colors=None):
     humano = Object3D()
-    mtl_colors = {}
-    if mtl_path:
-        mtl_colors = parse_mtl_colors(mtl_path)
+    # As cores podem vir já lidas (ex.: AssetLoader lê o .mtl uma vez por animação)
+    if mtl_colors is None:
+        mtl_colors = parse_mtl_colors(mtl_path) if mtl_path else {}
 
     for name, group_vertices, group_uvs in verticesHumano:
         geometry = Geometry()
-        geometry.add_attribute("vec3", "vertexPosition", group_vertices)
-
-        if not group_uvs or len(group_uvs) != len(group_vertices):
+        if len(group_uvs) != len(group_vertices):
             group_uvs = [[0.0, 0.0] for _ in group_vertices]
-        geometry.add_attribute("vec2", "vertexUV", group_uvs)
+        # Grupos que não mudam entre frames (olhos, sapatos, ...) partilham os buffers
+        geometry.add_indexed_attributes([
+            ("vec3", "vertexPosition", group_vertices),
+            ("vec2", "vertexUV", group_uvs),
+        ], shared=True)
 
         if name in mtl_colors:
           color = mtl_colors[name]
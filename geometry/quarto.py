@@ -1,80 +1,86 @@
 from core_ext.object3d import Object3D
 from core_ext.mesh import Mesh
+from core_ext.instancing import instance_identical_meshes
+from core_ext.static_batch import StaticBatch
 from material.texture import TextureMaterial
-from core_ext.texture import Texture
+from core_ext.texture_cache import texture_cache
 from geometry.geometry import Geometry
 from material.surface import SurfaceMaterial  # Para debug
 
+TEXTURE_SCOPE = "quarto"
+
 
 def quartoGeometry(sx, sy, sz, verticesQuarto):
     quarto = Object3D()
+    part_names = {}
 
     # Texturas diretas (objetos da cena do quarto)
     texture_map = {
-        "plane.147": Texture("images/bedroom_scene/chao.jpg"),
-        "plane.002": Texture("images/bedroom_scene/parede.jpg"),
-        "plane.074": Texture("images/bedroom_scene/parede.jpg"),
-        "plane.181": Texture("images/bedroom_scene/secretaria.jpg"),
-        "plane.143": Texture("images/bedroom_scene/quadro.jpg"),
-        "plane.144": Texture("images/bedroom_scene/moldura.jpg"),
-        "Cube.003": Texture("images/bedroom_scene/parede.jpg"),
-        "Plane.019_Plane.023": Texture("images/bedroom_scene/teclado.jpg"),
-        "plane.196": Texture("images/bedroom_scene/cadeira.jpg"),
-        "cube.071": Texture("images/bedroom_scene/chapa.jpg"),
-        "cube.062": Texture("images/bedroom_scene/teclado.jpg"),
-        "plane.153": Texture("images/bedroom_scene/teclado.jpg"),
-        "circle.072": Texture("images/bedroom_scene/teclado.jpg"),
-        "plane.201": Texture("images/bedroom_scene/cordas.jpg"),
-        "plane.054": Texture("images/bedroom_scene/cabo_guitarra.jpg"),
-        "circle.078": Texture("images/bedroom_scene/botoes_guitarras.jpg"),
-        "plane.159": Texture("images/bedroom_scene/botoes_guitarras.jpg"),
+        "plane.147": texture_cache.load("images/bedroom_scene/chao.jpg", scope=TEXTURE_SCOPE),
+        "plane.002": texture_cache.load("images/bedroom_scene/parede.jpg", scope=TEXTURE_SCOPE),
+        "plane.074": texture_cache.load("images/bedroom_scene/parede.jpg", scope=TEXTURE_SCOPE),
+        "plane.181": texture_cache.load("images/bedroom_scene/secretaria.jpg", scope=TEXTURE_SCOPE),
+        "plane.143": texture_cache.load("images/bedroom_scene/quadro.jpg", scope=TEXTURE_SCOPE),
+        "plane.144": texture_cache.load("images/bedroom_scene/moldura.jpg", scope=TEXTURE_SCOPE),
+        "Cube.003": texture_cache.load("images/bedroom_scene/parede.jpg", scope=TEXTURE_SCOPE),
+        "Plane.019_Plane.023": texture_cache.load("images/bedroom_scene/teclado.jpg", scope=TEXTURE_SCOPE),
+        "plane.196": texture_cache.load("images/bedroom_scene/cadeira.jpg", scope=TEXTURE_SCOPE),
+        "cube.071": texture_cache.load("images/bedroom_scene/chapa.jpg", scope=TEXTURE_SCOPE),
+        "cube.062": texture_cache.load("images/bedroom_scene/teclado.jpg", scope=TEXTURE_SCOPE),
+        "plane.153": texture_cache.load("images/bedroom_scene/teclado.jpg", scope=TEXTURE_SCOPE),
+        "circle.072": texture_cache.load("images/bedroom_scene/teclado.jpg", scope=TEXTURE_SCOPE),
+        "plane.201": texture_cache.load("images/bedroom_scene/cordas.jpg", scope=TEXTURE_SCOPE),
+        "plane.054": texture_cache.load("images/bedroom_scene/cabo_guitarra.jpg", scope=TEXTURE_SCOPE),
+        "circle.078": texture_cache.load("images/bedroom_scene/botoes_guitarras.jpg", scope=TEXTURE_SCOPE),
+        "plane.159": texture_cache.load("images/bedroom_scene/botoes_guitarras.jpg", scope=TEXTURE_SCOPE),
 
         # Guitarras
-        "vert.044": Texture("images/bedroom_scene/guitarra_preta.jpg"),
-        "vert.035": Texture("images/bedroom_scene/guitarra_azul.jpg"),
-        "vert.014": Texture("images/bedroom_scene/guitarra_castanha.jpg"),
-        "vert.037": Texture("images/bedroom_scene/guitarra_vermelha.jpg"),
+        "vert.044": texture_cache.load("images/bedroom_scene/guitarra_preta.jpg", scope=TEXTURE_SCOPE),
+        "vert.035": texture_cache.load("images/bedroom_scene/guitarra_azul.jpg", scope=TEXTURE_SCOPE),
+        "vert.014": texture_cache.load("images/bedroom_scene/guitarra_castanha.jpg", scope=TEXTURE_SCOPE),
+        "vert.037": texture_cache.load("images/bedroom_scene/guitarra_vermelha.jpg", scope=TEXTURE_SCOPE),
 
         # Outros objetos
-        "door": Texture("images/bedroom_scene/secretaria.jpg"),
-        "cama": Texture("images/bedroom_scene/botoes_guitarras.jpg"),
+        "door": texture_cache.load("images/bedroom_scene/secretaria.jpg", scope=TEXTURE_SCOPE),
+        "cama": texture_cache.load("images/bedroom_scene/botoes_guitarras.jpg", scope=TEXTURE_SCOPE),
 
         # Adicionando texturas para os objetos que estavam sem textura
 
-        "Vert.014": Texture("images/bedroom_scene/guitarra_castanha.jpg"),
-        "Plane.054": Texture("images/bedroom_scene/cabo_guitarra.jpg"),
-        "Plane.074": Texture("images/bedroom_scene/parede.jpg"),
-        "Plane.147": Texture("images/bedroom_scene/chao.jpg"),
-        "Plane.153": Texture("images/bedroom_scene/teclado.jpg"),
-
-        "Plane.159": Texture("images/bedroom_scene/botoes_guitarras.jpg"),
-        "Vert.035": Texture("images/bedroom_scene/guitarra_azul.jpg"),
-        "Plane.181": Texture("images/bedroom_scene/secretaria.jpg"),
-        "Circle.072": Texture("images/bedroom_scene/teclado.jpg"),
-        "Cube.062": Texture("images/bedroom_scene/teclado.jpg"),
-        "Cube.071": Texture("images/bedroom_scene/chapa.jpg"),
-        "Plane.002": Texture("images/bedroom_scene/parede.jpg"),
-
-        "Plane.143": Texture("images/bedroom_scene/quadro.jpg"),
-        "Plane.144": Texture("images/bedroom_scene/moldura.jpg"),
-        "Vert.037": Texture("images/bedroom_scene/guitarra_vermelha.jpg"),
-
-        "Plane.196": Texture("images/bedroom_scene/cadeira.jpg"),
-        "Vert.044": Texture("images/bedroom_scene/guitarra_preta.jpg"),
-        "Plane.201": Texture("images/bedroom_scene/cordas.jpg"),
-        "Circle.078": Texture("images/bedroom_scene/botoes_guitarras.jpg"),
+        "Vert.014": texture_cache.load("images/bedroom_scene/guitarra_castanha.jpg", scope=TEXTURE_SCOPE),
+        "Plane.054": texture_cache.load("images/bedroom_scene/cabo_guitarra.jpg", scope=TEXTURE_SCOPE),
+        "Plane.074": texture_cache.load("images/bedroom_scene/parede.jpg", scope=TEXTURE_SCOPE),
+        "Plane.147": texture_cache.load("images/bedroom_scene/chao.jpg", scope=TEXTURE_SCOPE),
+        "Plane.153": texture_cache.load("images/bedroom_scene/teclado.jpg", scope=TEXTURE_SCOPE),
+
+        "Plane.159": texture_cache.load("images/bedroom_scene/botoes_guitarras.jpg", scope=TEXTURE_SCOPE),
+        "Vert.035": texture_cache.load("images/bedroom_scene/guitarra_azul.jpg", scope=TEXTURE_SCOPE),
+        "Plane.181": texture_cache.load("images/bedroom_scene/secretaria.jpg", scope=TEXTURE_SCOPE),
+        "Circle.072": texture_cache.load("images/bedroom_scene/teclado.jpg", scope=TEXTURE_SCOPE),
+        "Cube.062": texture_cache.load("images/bedroom_scene/teclado.jpg", scope=TEXTURE_SCOPE),
+        "Cube.071": texture_cache.load("images/bedroom_scene/chapa.jpg", scope=TEXTURE_SCOPE),
+        "Plane.002": texture_cache.load("images/bedroom_scene/parede.jpg", scope=TEXTURE_SCOPE),
+
+        "Plane.143": texture_cache.load("images/bedroom_scene/quadro.jpg", scope=TEXTURE_SCOPE),
+        "Plane.144": texture_cache.load("images/bedroom_scene/moldura.jpg", scope=TEXTURE_SCOPE),
+        "Vert.037": texture_cache.load("images/bedroom_scene/guitarra_vermelha.jpg", scope=TEXTURE_SCOPE),
+
+        "Plane.196": texture_cache.load("images/bedroom_scene/cadeira.jpg", scope=TEXTURE_SCOPE),
+        "Vert.044": texture_cache.load("images/bedroom_scene/guitarra_preta.jpg", scope=TEXTURE_SCOPE),
+        "Plane.201": texture_cache.load("images/bedroom_scene/cordas.jpg", scope=TEXTURE_SCOPE),
+        "Circle.078": texture_cache.load("images/bedroom_scene/botoes_guitarras.jpg", scope=TEXTURE_SCOPE),
     }
 
     # Construção da cena
     for name, group_vertices, group_uvs in verticesQuarto:
         geometry = Geometry()
-        geometry.add_attribute("vec3", "vertexPosition", group_vertices)
-
-        if not group_uvs or len(group_uvs) != len(group_vertices):
+        if len(group_uvs) != len(group_vertices):
             print(f"⚠️ UVs ausentes ou inválidas em {name}, aplicando fallback.")
             group_uvs = [[0.0, 0.0] for _ in group_vertices]
 
-        geometry.add_attribute("vec2", "vertexUV", group_uvs)
+        geometry.add_indexed_attributes([
+            ("vec3", "vertexPosition", group_vertices),
+            ("vec2", "vertexUV", group_uvs),
+        ], optimize_cache=True)
 
         # Escolher o material certo
         if name in texture_map:
@@ -85,9 +91,13 @@ def quartoGeometry(sx, sy, sz, verticesQuarto):
 
         mesh = Mesh(geometry, material)
         quarto.add(mesh)
+        part_names[mesh] = name
 
     # ✅ Aplica a escala a todos os filhos corretamente
     for child in quarto.children_list:
         child.scale(sx)
 
-    return quarto
\ No newline at end of file
+    instanced_dict = instance_identical_meshes(quarto)
+    batch = StaticBatch(quarto, part_names, instanced_dict=instanced_dict)
+    batch.report("Quarto")
+    return batch
\ No newline at end of file
@@ -1,83 +1,89 @@
 from core_ext.object3d import Object3D
 from core_ext.mesh import Mesh
+from core_ext.instancing import instance_identical_meshes
+from core_ext.static_batch import StaticBatch
 from material.texture import TextureMaterial
-from core_ext.texture import Texture
+from core_ext.texture_cache import texture_cache
 from geometry.geometry import Geometry
 from material.surface import SurfaceMaterial  # Para debug
 
+TEXTURE_SCOPE = "sala_musica"
+
 def sala_musicaGeometry(sx, sy, sz, verticesSala):
     sala = Object3D()
+    part_names = {}
 
     # Mapear nomes diretamente para texturas (toda a cena, flauta, cello, harpa, tuba, etc.)
     texture_map = {
         # Cena
-        "Cube": Texture("images/music_scene/piso.jpg"),
-        "Plane.004": Texture("images/music_scene/tapete.jpg"),
-        "Cube.002": Texture("images/music_scene/sofa.jpg"),
-        "Cube.003": Texture("images/music_scene/sofa.jpg"),
-        "Cube.012": Texture("images/music_scene/sofa.jpg"),
-        "Cylinder.022": Texture("images/music_scene/mesa.jpg"),
-        "Cube.001": Texture("images/music_scene/parede.jpg"),
-        "Cube.007": Texture("images/music_scene/parede.jpg"),
-        "Cube.008": Texture("images/music_scene/parede.jpg"),
-        "Cube.009": Texture("images/music_scene/teto.jpg"),
-        "Ceiling_Lamp_IKEA_NYMANE": Texture("images/music_scene/lampada.jpg"),
-        "Plane": Texture("images/music_scene/cinzento.jpg"),
-        "Plane.001": Texture("images/music_scene/cinzento.jpg"),
-        "Plane.002": Texture("images/music_scene/cinzento.jpg"),
-        "Plane.003": Texture("images/music_scene/cinzento.jpg"),
-        "Plane.005": Texture("images/music_scene/cinzento.jpg"),
-        "Cube.010": Texture("images/music_scene/parede.jpg"),
-        "OutBoddy_Cube.002": Texture("images/music_scene/madeira_corpo.jpg"),
-        "DoorBoddy_Cube.001": Texture("images/music_scene/madeira_corpo.jpg"),
+        "Cube": texture_cache.load("images/music_scene/piso.jpg", scope=TEXTURE_SCOPE),
+        "Plane.004": texture_cache.load("images/music_scene/tapete.jpg", scope=TEXTURE_SCOPE),
+        "Cube.002": texture_cache.load("images/music_scene/sofa.jpg", scope=TEXTURE_SCOPE),
+        "Cube.003": texture_cache.load("images/music_scene/sofa.jpg", scope=TEXTURE_SCOPE),
+        "Cube.012": texture_cache.load("images/music_scene/sofa.jpg", scope=TEXTURE_SCOPE),
+        "Cylinder.022": texture_cache.load("images/music_scene/mesa.jpg", scope=TEXTURE_SCOPE),
+        "Cube.001": texture_cache.load("images/music_scene/parede.jpg", scope=TEXTURE_SCOPE),
+        "Cube.007": texture_cache.load("images/music_scene/parede.jpg", scope=TEXTURE_SCOPE),
+        "Cube.008": texture_cache.load("images/music_scene/parede.jpg", scope=TEXTURE_SCOPE),
+        "Cube.009": texture_cache.load("images/music_scene/teto.jpg", scope=TEXTURE_SCOPE),
+        "Ceiling_Lamp_IKEA_NYMANE": texture_cache.load("images/music_scene/lampada.jpg", scope=TEXTURE_SCOPE),
+        "Plane": texture_cache.load("images/music_scene/cinzento.jpg", scope=TEXTURE_SCOPE),
+        "Plane.001": texture_cache.load("images/music_scene/cinzento.jpg", scope=TEXTURE_SCOPE),
+        "Plane.002": texture_cache.load("images/music_scene/cinzento.jpg", scope=TEXTURE_SCOPE),
+        "Plane.003": texture_cache.load("images/music_scene/cinzento.jpg", scope=TEXTURE_SCOPE),
+        "Plane.005": texture_cache.load("images/music_scene/cinzento.jpg", scope=TEXTURE_SCOPE),
+        "Cube.010": texture_cache.load("images/music_scene/parede.jpg", scope=TEXTURE_SCOPE),
+        "OutBoddy_Cube.002": texture_cache.load("images/music_scene/madeira_corpo.jpg", scope=TEXTURE_SCOPE),
+        "DoorBoddy_Cube.001": texture_cache.load("images/music_scene/madeira_corpo.jpg", scope=TEXTURE_SCOPE),
 
         # Flauta
-        "Cylinder.002": Texture("images/music_scene/madeira_arpa.jpg"),
-        "Cylinder.005": Texture("images/music_scene/preto.jpg"),
+        "Cylinder.002": texture_cache.load("images/music_scene/madeira_arpa.jpg", scope=TEXTURE_SCOPE),
+        "Cylinder.005": texture_cache.load("images/music_scene/preto.jpg", scope=TEXTURE_SCOPE),
 
         # Arpa – madeira
-        "Cylinder.003": Texture("images/music_scene/madeira_arpa.jpg"),
-        "Cylinder.001": Texture("images/music_scene/madeira_arpa.jpg"),
-        "Cylinder.023": Texture("images/music_scene/madeira_arpa.jpg"),
-        "Cylinder.007": Texture("images/music_scene/madeira_arpa.jpg"),
-        "Cylinder.030": Texture("images/music_scene/madeira_arpa.jpg"),
-        "Cube.004": Texture("images/music_scene/madeira_arpa.jpg"),
-        "Cube.005": Texture("images/music_scene/madeira_arpa.jpg"),
-        "Cube.006": Texture("images/music_scene/madeira_arpa.jpg"),
+        "Cylinder.003": texture_cache.load("images/music_scene/madeira_arpa.jpg", scope=TEXTURE_SCOPE),
+        "Cylinder.001": texture_cache.load("images/music_scene/madeira_arpa.jpg", scope=TEXTURE_SCOPE),
+        "Cylinder.023": texture_cache.load("images/music_scene/madeira_arpa.jpg", scope=TEXTURE_SCOPE),
+        "Cylinder.007": texture_cache.load("images/music_scene/madeira_arpa.jpg", scope=TEXTURE_SCOPE),
+        "Cylinder.030": texture_cache.load("images/music_scene/madeira_arpa.jpg", scope=TEXTURE_SCOPE),
+        "Cube.004": texture_cache.load("images/music_scene/madeira_arpa.jpg", scope=TEXTURE_SCOPE),
+        "Cube.005": texture_cache.load("images/music_scene/madeira_arpa.jpg", scope=TEXTURE_SCOPE),
+        "Cube.006": texture_cache.load("images/music_scene/madeira_arpa.jpg", scope=TEXTURE_SCOPE),
 
         # Arpa – metal
-        "Cylinder.052": Texture("images/music_scene/metal.jpg"),
-        "Cylinder.103": Texture("images/music_scene/metal.jpg"),
-        "Cylinder.113": Texture("images/music_scene/metal.jpg"),
-        **{f"Cylinder.{i}": Texture("images/music_scene/metal.jpg") for i in range(635, 660)},
+        "Cylinder.052": texture_cache.load("images/music_scene/metal.jpg", scope=TEXTURE_SCOPE),
+        "Cylinder.103": texture_cache.load("images/music_scene/metal.jpg", scope=TEXTURE_SCOPE),
+        "Cylinder.113": texture_cache.load("images/music_scene/metal.jpg", scope=TEXTURE_SCOPE),
+        **{f"Cylinder.{i}": texture_cache.load("images/music_scene/metal.jpg", scope=TEXTURE_SCOPE) for i in range(635, 660)},
 
         # Tuba
-        "Tuba": Texture("images/music_scene/dourado.jpg"),
+        "Tuba": texture_cache.load("images/music_scene/dourado.jpg", scope=TEXTURE_SCOPE),
 
         # Cello
-        "cello_body_cello_body": Texture("images/music_scene/madeira_corpo.jpg"),
-        "cello_black_cello_black": Texture("images/music_scene/preto.jpg"),
-        "cello_metal_cello_metal": Texture("images/music_scene/metal.jpg"),
-        "knob1_knob1": Texture("images/music_scene/preto.jpg"),
-        "knob2_knob2": Texture("images/music_scene/preto.jpg"),
-        "knob3_knob3": Texture("images/music_scene/preto.jpg"),
-        "knob4_knob4": Texture("images/music_scene/preto.jpg"),
-        "string1_string1": Texture("images/music_scene/metal.jpg"),
-        "string2_string2": Texture("images/music_scene/metal.jpg"),
-        "string3_string3": Texture("images/music_scene/metal.jpg"),
-        "string4_string4": Texture("images/music_scene/metal.jpg"),
+        "cello_body_cello_body": texture_cache.load("images/music_scene/madeira_corpo.jpg", scope=TEXTURE_SCOPE),
+        "cello_black_cello_black": texture_cache.load("images/music_scene/preto.jpg", scope=TEXTURE_SCOPE),
+        "cello_metal_cello_metal": texture_cache.load("images/music_scene/metal.jpg", scope=TEXTURE_SCOPE),
+        "knob1_knob1": texture_cache.load("images/music_scene/preto.jpg", scope=TEXTURE_SCOPE),
+        "knob2_knob2": texture_cache.load("images/music_scene/preto.jpg", scope=TEXTURE_SCOPE),
+        "knob3_knob3": texture_cache.load("images/music_scene/preto.jpg", scope=TEXTURE_SCOPE),
+        "knob4_knob4": texture_cache.load("images/music_scene/preto.jpg", scope=TEXTURE_SCOPE),
+        "string1_string1": texture_cache.load("images/music_scene/metal.jpg", scope=TEXTURE_SCOPE),
+        "string2_string2": texture_cache.load("images/music_scene/metal.jpg", scope=TEXTURE_SCOPE),
+        "string3_string3": texture_cache.load("images/music_scene/metal.jpg", scope=TEXTURE_SCOPE),
+        "string4_string4": texture_cache.load("images/music_scene/metal.jpg", scope=TEXTURE_SCOPE),
     }
 
     # Construção da cena
     for name, group_vertices, group_uvs in verticesSala:
         geometry = Geometry()
-        geometry.add_attribute("vec3", "vertexPosition", group_vertices)
-
-        if not group_uvs or len(group_uvs) != len(group_vertices):
+        if len(group_uvs) != len(group_vertices):
             print(f"⚠️ UVs ausentes ou inválidas em {name}, aplicando fallback.")
             group_uvs = [[0.0, 0.0] for _ in group_vertices]
 
-        geometry.add_attribute("vec2", "vertexUV", group_uvs)
+        geometry.add_indexed_attributes([
+            ("vec3", "vertexPosition", group_vertices),
+            ("vec2", "vertexUV", group_uvs),
+        ], optimize_cache=True)
 
         # Aplica a textura se existir, ou usa magenta para debug
         if name in texture_map:
@@ -88,9 +94,13 @@ def sala_musicaGeometry(sx, sy, sz, verticesSala):
 
         mesh = Mesh(geometry, material)
         sala.add(mesh)
+        part_names[mesh] = name
 
     # Aplica a escala
     for child in sala.children_list:
         child.scale(sx)
 
-    return sala
\ No newline at end of file
+    instanced_dict = instance_identical_meshes(sala)
+    batch = StaticBatch(sala, part_names, instanced_dict=instanced_dict)
+    batch.report("Sala musical")
+    return batch
\ No newline at end of file
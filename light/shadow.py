@@ -3,6 +3,7 @@ import OpenGL.GL as GL
 from core_ext.camera import Camera
 from core_ext.render_target import RenderTarget
 from material.depth import DepthMaterial
+from material.morph import MorphDepthMaterial
 
 
 class Shadow:
@@ -27,6 +28,8 @@ class Shadow:
         )
         # Render only depth data to target texture
         self._material = DepthMaterial()
+        # Same for animated characters, whose vertices come from a frame texture
+        self._morph_material = MorphDepthMaterial()
         # Controls darkness of shadow
         self._strength = strength
         # Used to avoid visual artifacts due to
@@ -45,6 +48,10 @@ class Shadow:
     def material(self):
         return self._material
 
+    @property
+    def morph_material(self):
+        return self._morph_material
+
     @property
     def light_source(self):
         return self._light_source
@@ -61,3 +68,5 @@ class Shadow:
         self._camera.update_view_matrix()
         self._material.uniform_dict["viewMatrix"].data = self._camera.view_matrix
         self._material.uniform_dict["projectionMatrix"].data = self._camera.projection_matrix
+        self._morph_material.uniform_dict["viewMatrix"].data = self._camera.view_matrix
+        self._morph_material.uniform_dict["projectionMatrix"].data = self._camera.projection_matrix
@@ -0,0 +1,75 @@
+from material.surface import SurfaceMaterial
+from material.texture import TextureMaterial
+
+
+class InstancedTextureMaterial(TextureMaterial):
+    """
+    TextureMaterial for InstancedMesh: every instance is placed by its own
+    instanceMatrix and, if useInstanceColors is set, tinted by its instanceColor
+    """
+    def __init__(self, texture, property_dict=None):
+        vertex_shader_code = """
+            uniform mat4 projectionMatrix;
+            uniform mat4 viewMatrix;
+            uniform mat4 modelMatrix;
+            uniform bool useInstanceColors;
+            in vec3 vertexPosition;
+            in vec2 vertexUV;
+            in mat4 instanceMatrix;
+            in vec3 instanceColor;
+            uniform vec2 repeatUV;
+            uniform vec2 offsetUV;
+            out vec2 UV;
+            out vec3 tint;
+            void main()
+            {
+                gl_Position = projectionMatrix * viewMatrix * modelMatrix * instanceMatrix * vec4(vertexPosition, 1.0);
+                UV = vertexUV * repeatUV + offsetUV;
+                tint = vec3(1.0, 1.0, 1.0);
+                if (useInstanceColors)
+                    tint = instanceColor;
+            }
+        """
+
+        fragment_shader_code = """
+            uniform vec3 baseColor;
+            uniform sampler2D textureSampler;
+            in vec2 UV;
+            in vec3 tint;
+            out vec4 fragColor;
+            void main()
+            {
+                vec4 color = vec4(baseColor * tint, 1.0) * texture(textureSampler, UV);
+                if (color.a < 0.1)
+                    discard;
+                fragColor = color;
+            }
+        """
+        super().__init__(texture, None, vertex_shader_code, fragment_shader_code)
+        self.add_uniform("bool", "useInstanceColors", False)
+        self.locate_uniforms()
+        self.set_properties(property_dict)
+
+
+class InstancedSurfaceMaterial(SurfaceMaterial):
+    """
+    SurfaceMaterial for InstancedMesh: every instance is placed by its own
+    instanceMatrix; with useVertexColors the color of each instance is its instanceColor
+    """
+    def __init__(self, property_dict=None):
+        vertex_shader_code = """
+            uniform mat4 projectionMatrix;
+            uniform mat4 viewMatrix;
+            uniform mat4 modelMatrix;
+            in vec3 vertexPosition;
+            in mat4 instanceMatrix;
+            in vec3 instanceColor;
+            out vec3 color;
+
+            void main()
+            {
+                gl_Position = projectionMatrix * viewMatrix * modelMatrix * instanceMatrix * vec4(vertexPosition, 1.0);
+                color = instanceColor;
+            }
+        """
+        super().__init__(vertex_shader_code, property_dict=property_dict)
@@ -1,12 +1,13 @@
 import OpenGL.GL as GL
 
+from core.program_cache import program_cache
 from core.uniform import Uniform
-from core.utils import Utils
 
 
 class Material:
     def __init__(self, vertex_shader_code, fragment_shader_code):
-        self._program_ref = Utils.initialize_program(vertex_shader_code, fragment_shader_code)
+        # Materials with the same shader code share one compiled program
+        self._program_ref = program_cache.get_program(vertex_shader_code, fragment_shader_code)
         # Store Uniform objects, indexed by name of associated variable in shader.
         # Each shader typically contains these uniforms; values will be set during render process from Mesh / Camera.
         self._uniform_dict = {
@@ -16,7 +17,9 @@ class Material:
         }
         # Store OpenGL render settings, indexed by variable name
         self._setting_dict = {
-            "drawStyle": GL.GL_TRIANGLES
+            "drawStyle": GL.GL_TRIANGLES,
+            # Transparent meshes are drawn after opaque ones, from back to front
+            "transparent": False,
         }
 
     @property
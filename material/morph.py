@@ -0,0 +1,118 @@
+from material.material import Material
+from material.surface import SurfaceMaterial
+
+# Vertex position read from the clip's frame texture, shared by the surface and depth shaders
+MORPH_POSITION_CODE = """
+    uniform sampler2D frameTexture;
+    uniform int textureWidth;
+    uniform int clipVertexCount;
+    uniform int frameA;
+    uniform int frameB;
+    uniform int framePrevious;
+    uniform int frameNext;
+    uniform float frameBlend;
+    uniform bool useCatmullRom;
+
+    vec3 framePosition(int frame)
+    {
+        int texel = frame * clipVertexCount + gl_VertexID;
+        return texelFetch(frameTexture, ivec2(texel % textureWidth, texel / textureWidth), 0).xyz;
+    }
+
+    vec3 morphPosition()
+    {
+        vec3 p1 = framePosition(frameA);
+        vec3 p2 = framePosition(frameB);
+        vec3 position = mix(p1, p2, frameBlend);
+        if (useCatmullRom)
+        {
+            vec3 p0 = framePosition(framePrevious);
+            vec3 p3 = framePosition(frameNext);
+            float t = frameBlend;
+            position = 0.5 * (2.0 * p1 + (p2 - p0) * t
+                              + (2.0 * p0 - 5.0 * p1 + 4.0 * p2 - p3) * t * t
+                              + (3.0 * (p1 - p2) + p3 - p0) * t * t * t);
+        }
+        return position;
+    }
+"""
+MORPH_UNIFORM_NAMES = ("frameTexture", "textureWidth", "clipVertexCount", "frameA", "frameB",
+                       "framePrevious", "frameNext", "frameBlend", "useCatmullRom")
+
+
+def add_morph_uniforms(material, frame_texture_ref, texture_width, clip_vertex_count):
+    material.add_uniform("sampler2D", "frameTexture", [frame_texture_ref, 2])
+    material.add_uniform("int", "textureWidth", texture_width)
+    material.add_uniform("int", "clipVertexCount", clip_vertex_count)
+    material.add_uniform("int", "frameA", 0)
+    material.add_uniform("int", "frameB", 0)
+    material.add_uniform("int", "framePrevious", 0)
+    material.add_uniform("int", "frameNext", 0)
+    material.add_uniform("float", "frameBlend", 0.0)
+    material.add_uniform("bool", "useCatmullRom", False)
+
+
+class MorphMaterial(SurfaceMaterial):
+    """
+    SurfaceMaterial for AnimationClip meshes: vertex positions are not read from the
+    vertex buffer but from the clip's frame texture, which holds the position of every
+    vertex in every frame (texel = frame * clipVertexCount + vertex). Colors come from
+    the vertexColor attribute (one color per .mtl group).
+    The shader blends frameA and frameB by frameBlend (linearly, or along a Catmull-Rom
+    spline through framePrevious and frameNext), so changing frame only changes uniforms.
+    """
+    def __init__(self, frame_texture_ref, texture_width, clip_vertex_count, property_dict=None):
+        vertex_shader_code = """
+            uniform mat4 projectionMatrix;
+            uniform mat4 viewMatrix;
+            uniform mat4 modelMatrix;
+            in vec3 vertexColor;
+            out vec3 color;
+        """ + MORPH_POSITION_CODE + """
+            void main()
+            {
+                gl_Position = projectionMatrix * viewMatrix * modelMatrix * vec4(morphPosition(), 1.0);
+                color = vertexColor;
+            }
+        """
+        super().__init__(vertex_shader_code)
+        add_morph_uniforms(self, frame_texture_ref, texture_width, clip_vertex_count)
+        self.locate_uniforms()
+        self.uniform_dict["useVertexColors"].data = True
+        self.set_properties(property_dict)
+
+
+class MorphDepthMaterial(Material):
+    """
+    DepthMaterial for AnimationClip meshes, used in the shadow pass: the same vertex
+    positions as MorphMaterial, so animated characters cast shadows. The frame
+    uniforms are copied from the mesh's MorphMaterial before each draw.
+    """
+    def __init__(self):
+        vertex_shader_code = """
+            uniform mat4 projectionMatrix;
+            uniform mat4 viewMatrix;
+            uniform mat4 modelMatrix;
+        """ + MORPH_POSITION_CODE + """
+            void main()
+            {
+                gl_Position = projectionMatrix * viewMatrix * modelMatrix * vec4(morphPosition(), 1.0);
+            }
+        """
+        fragment_shader_code = """
+            out vec4 fragColor;
+
+            void main()
+            {
+                float z = gl_FragCoord.z;
+                fragColor = vec4(z, z, z, 1);
+            }
+        """
+        super().__init__(vertex_shader_code, fragment_shader_code)
+        add_morph_uniforms(self, None, 0, 0)
+        self.locate_uniforms()
+
+    def copy_frame_uniforms(self, morph_material):
+        """ Take the frame texture and blend of the mesh being drawn """
+        for name in MORPH_UNIFORM_NAMES:
+            self.uniform_dict[name].data = morph_material.uniform_dict[name].data
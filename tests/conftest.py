@@ -0,0 +1,20 @@
+"""
+Shared setup for the tests: the repository root on sys.path, and stand-ins for
+OpenGL and pygame when they are not installed, so modules that import them at the
+top (the scene manager, the scenes) can be loaded. The tests only exercise code
+that runs on the CPU; nothing here calls into either library.
+"""
+import importlib.util
+import os
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# With a real pygame, importing the audio module opens the mixer: keep it silent
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+if importlib.util.find_spec("OpenGL") is None:
+    sys.modules["OpenGL"] = mock.MagicMock(name="OpenGL")
+    sys.modules["OpenGL.GL"] = sys.modules["OpenGL"].GL
+if importlib.util.find_spec("pygame") is None:
+    sys.modules["pygame"] = mock.MagicMock(name="pygame")
@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+
+from core.frustum import Frustum
+from core.matrix import Matrix
+from core_ext.bvh import BoundingVolumeHierarchy
+
+
+class FakeMesh:
+    """ Just what the tree reads from a mesh: the cached world matrix and the local box """
+    def __init__(self, global_matrix, bounding_box):
+        self.global_matrix = global_matrix
+        self.bounding_box = bounding_box
+
+
+def make_meshes(rng, count=200):
+    meshes = []
+    for _ in range(count):
+        matrix = Matrix.make_translation(*rng.uniform(-50, 50, 3)) @ Matrix.make_rotation_y(rng.uniform(0, 6))
+        box_min = rng.uniform(-2, 0, 3)
+        meshes.append(FakeMesh(matrix, (box_min, box_min + rng.uniform(0.1, 3, 3))))
+    return meshes
+
+
+def world_boxes(meshes):
+    matrices = np.array([mesh.global_matrix for mesh in meshes])
+    box_mins = np.array([mesh.bounding_box[0] for mesh in meshes])
+    box_maxs = np.array([mesh.bounding_box[1] for mesh in meshes])
+    return Frustum.world_boxes(matrices, box_mins, box_maxs)
+
+
+def ids(meshes):
+    return [id(mesh) for mesh in meshes]
+
+
+def brute_force_frustum(meshes, frustum):
+    box_mins, box_maxs = world_boxes(meshes)
+    inside = frustum.classify_boxes(box_mins, box_maxs) != Frustum.OUTSIDE
+    return [mesh for mesh, keep in zip(meshes, inside) if keep]
+
+
+def brute_force_sphere(meshes, center, radius):
+    box_mins, box_maxs = world_boxes(meshes)
+    closest = np.clip(center, box_mins, box_maxs)
+    overlaps = ((closest - center) ** 2).sum(axis=1) <= radius * radius
+    return [mesh for mesh, keep in zip(meshes, overlaps) if keep]
+
+
+def brute_force_ray(meshes, origin, direction, max_distance):
+    hits = []
+    for mesh, box_min, box_max in zip(meshes, *world_boxes(meshes)):
+        enter, leave = 0.0, np.inf
+        for axis in range(3):
+            near = (box_min[axis] - origin[axis]) / direction[axis]
+            far = (box_max[axis] - origin[axis]) / direction[axis]
+            enter = max(enter, min(near, far))
+            leave = min(leave, max(near, far))
+        if enter <= leave and enter <= max_distance:
+            hits.append((enter, mesh))
+    return sorted(hits, key=lambda hit: hit[0])
+
+
+def random_frusta(rng, count=20):
+    for _ in range(count):
+        view = Matrix.make_look_at(rng.uniform(-60, 60, 3), rng.uniform(-20, 20, 3))
+        yield Frustum(Matrix.make_perspective(rng.uniform(30, 90), 1.5, 0.1, rng.uniform(20, 150))
+                      @ np.linalg.inv(view))
+
+
+@pytest.mark.parametrize("leaf_size", [1, 4, 16])
+def test_queries_match_brute_force(leaf_size):
+    rng = np.random.default_rng(9)
+    meshes = make_meshes(rng)
+    bvh = BoundingVolumeHierarchy(meshes, leaf_size)
+    assert len(bvh) == len(meshes)
+    assert bvh.depth > 1
+    for frustum in random_frusta(rng):
+        assert ids(bvh.query_frustum(frustum)) == ids(brute_force_frustum(meshes, frustum))
+    for _ in range(20):
+        center = rng.uniform(-50, 50, 3)
+        radius = rng.uniform(1, 40)
+        assert ids(bvh.query_sphere(center, radius)) == ids(brute_force_sphere(meshes, center, radius))
+    for _ in range(20):
+        origin = rng.uniform(-60, 60, 3)
+        direction = rng.normal(size=3)
+        max_distance = rng.choice([np.inf, rng.uniform(5, 80)])
+        hits = bvh.query_ray(origin, direction, max_distance)
+        expected = brute_force_ray(meshes, origin, direction, max_distance)
+        assert ids(mesh for _, mesh in hits) == ids(mesh for _, mesh in expected)
+        np.testing.assert_allclose([distance for distance, _ in hits], [distance for distance, _ in expected])
+
+
+def test_world_boxes_cover_nodes():
+    rng = np.random.default_rng(10)
+    meshes = make_meshes(rng, 50)
+    bvh = BoundingVolumeHierarchy(meshes)
+    box_mins, box_maxs = world_boxes(meshes)
+    for mesh, box_min, box_max in zip(meshes, box_mins, box_maxs):
+        world_min, world_max = bvh.world_box(mesh)
+        np.testing.assert_allclose(world_min, box_min)
+        np.testing.assert_allclose(world_max, box_max)
+    # The root box holds every mesh
+    assert bvh.query_sphere(box_mins.mean(axis=0), 1e4) == meshes
+
+
+def test_refit_after_moving_meshes():
+    rng = np.random.default_rng(11)
+    meshes = make_meshes(rng)
+    bvh = BoundingVolumeHierarchy(meshes)
+    assert bvh.refit() == 0
+    moved = meshes[::7]
+    for mesh in moved:
+        # The cached matrix is replaced, not changed in place
+        mesh.global_matrix = Matrix.make_translation(*rng.uniform(-80, 80, 3)) @ mesh.global_matrix
+    assert bvh.refit() == len(moved)
+    for frustum in random_frusta(rng):
+        assert ids(bvh.query_frustum(frustum)) == ids(brute_force_frustum(meshes, frustum))
+    for _ in range(20):
+        center = rng.uniform(-80, 80, 3)
+        radius = rng.uniform(1, 40)
+        assert ids(bvh.query_sphere(center, radius)) == ids(brute_force_sphere(meshes, center, radius))
+
+
+def test_meshes_without_bounds():
+    rng = np.random.default_rng(12)
+    meshes = make_meshes(rng, 30)
+    empty = FakeMesh(np.identity(4), None)
+    bvh = BoundingVolumeHierarchy(meshes + [empty])
+    assert len(bvh) == len(meshes)
+    assert empty not in bvh
+    assert meshes[0] in bvh
+    assert empty not in bvh.query_sphere([0, 0, 0], 1e4)
+    # Gaining bounds rebuilds the tree
+    empty.bounding_box = (np.zeros(3), np.ones(3))
+    bvh.refit()
+    assert empty in bvh
+    assert empty in bvh.query_sphere([0.5, 0.5, 0.5], 0.1)
+
+
+def test_empty_tree():
+    bvh = BoundingVolumeHierarchy([])
+    assert len(bvh) == 0
+    assert bvh.node_count == 0
+    assert bvh.depth == 0
+    assert bvh.query_sphere([0, 0, 0], 10) == []
+    assert bvh.query_ray([0, 0, 0], [1, 0, 0]) == []
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from core.frustum import Frustum
+from core.matrix import Matrix
+
+
+@pytest.fixture
+def box_frustum():
+    # Orthographic camera at the origin looking down -z: the box [-1, 1]^2 x [-10, 0]
+    return Frustum(Matrix.make_orthographic(-1, 1, -1, 1, 0, 10))
+
+
+def test_planes_are_normalized(box_frustum):
+    np.testing.assert_allclose(np.linalg.norm(box_frustum.planes[:, 0:3], axis=1), 1.0)
+
+
+def test_contains_sphere(box_frustum):
+    assert box_frustum.contains_sphere([0, 0, -5], 0.1)
+    # Outside the right plane, but reaching across it
+    assert box_frustum.contains_sphere([1.5, 0, -5], 0.6)
+    assert not box_frustum.contains_sphere([1.5, 0, -5], 0.4)
+    # Behind the camera
+    assert not box_frustum.contains_sphere([0, 0, 1], 0.5)
+
+
+def test_contains_spheres_matches_single(box_frustum):
+    rng = np.random.default_rng(1)
+    centers = rng.uniform(-3, 3, (200, 3)) + [0, 0, -5]
+    radii = rng.uniform(0, 1, 200)
+    expected = [box_frustum.contains_sphere(center, radius) for center, radius in zip(centers, radii)]
+    assert box_frustum.contains_spheres(centers, radii).tolist() == expected
+
+
+def test_classify_boxes(box_frustum):
+    box_mins = np.array([[-0.5, -0.5, -6], [0.5, -0.5, -6], [2, 2, -6], [-0.5, -0.5, 1]])
+    box_maxs = box_mins + 1
+    assert box_frustum.classify_boxes(box_mins, box_maxs).tolist() == [
+        Frustum.INSIDE, Frustum.INTERSECTING, Frustum.OUTSIDE, Frustum.OUTSIDE]
+
+
+def test_perspective_frustum_against_points():
+    # A box is OUTSIDE only if no point of it projects inside the clip volume
+    matrix = Matrix.make_perspective(60, 1.5, 0.5, 50) @ Matrix.make_rotation_y(0.3)
+    frustum = Frustum(matrix)
+    rng = np.random.default_rng(2)
+    box_mins = rng.uniform(-30, 30, (300, 3))
+    box_maxs = box_mins + rng.uniform(0.1, 4, (300, 3))
+    result = frustum.classify_boxes(box_mins, box_maxs)
+    for box_min, box_max, kind in zip(box_mins, box_maxs, result):
+        points = box_min + rng.uniform(0, 1, (64, 3)) * (box_max - box_min)
+        clip = np.c_[points, np.ones(len(points))] @ matrix.T
+        inside = (np.abs(clip[:, 0:3]) <= clip[:, 3:4]).all(axis=1)
+        if kind == Frustum.OUTSIDE:
+            assert not inside.any()
+        elif kind == Frustum.INSIDE:
+            assert inside.all()
+
+
+def test_world_boxes_contain_transformed_corners():
+    rng = np.random.default_rng(3)
+    matrices = np.array([Matrix.make_translation(*rng.uniform(-5, 5, 3))
+                         @ Matrix.make_rotation_x(rng.uniform(0, 6)) @ Matrix.make_rotation_y(rng.uniform(0, 6))
+                         @ Matrix.make_scale(rng.uniform(0.5, 2)) for _ in range(20)])
+    box_mins = rng.uniform(-1, 0, (20, 3))
+    box_maxs = rng.uniform(0, 1, (20, 3))
+    world_mins, world_maxs = Frustum.world_boxes(matrices, box_mins, box_maxs)
+    corner_choice = np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)])
+    for matrix, box_min, box_max, world_min, world_max in zip(matrices, box_mins, box_maxs,
+                                                              world_mins, world_maxs):
+        corners = np.where(corner_choice, box_max, box_min)
+        world_corners = corners @ matrix[0:3, 0:3].T + matrix[0:3, 3]
+        assert (world_corners >= world_min - 1e-9).all()
+        assert (world_corners <= world_max + 1e-9).all()
+
+
+def test_world_spheres_scale_with_largest_axis():
+    matrix = Matrix.make_translation(1, 2, 3) @ np.diag([1.0, 3.0, 2.0, 1.0])
+    centers, radii = Frustum.world_spheres(np.array([matrix]), [[1, 1, 1]], [2.0])
+    np.testing.assert_allclose(centers[0], [2, 5, 5])
+    assert radii[0] == pytest.approx(6.0)
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from core.instance_detect import find_identical_groups, rigid_transform
+from core.matrix import Matrix
+
+
+def random_shape(rng, count=20):
+    return rng.uniform(-1, 1, (count, 3))
+
+
+def transform(matrix, positions):
+    return positions @ matrix[0:3, 0:3].T + matrix[0:3, 3]
+
+
+def random_rigid_matrix(rng):
+    return (Matrix.make_translation(*rng.uniform(-10, 10, 3)) @ Matrix.make_rotation_z(rng.uniform(0, 6))
+            @ Matrix.make_rotation_x(rng.uniform(0, 6)) @ Matrix.make_rotation_y(rng.uniform(0, 6)))
+
+
+def test_rigid_transform_recovers_matrix():
+    rng = np.random.default_rng(5)
+    reference = random_shape(rng)
+    for _ in range(10):
+        expected = random_rigid_matrix(rng)
+        matrix, error = rigid_transform(reference, transform(expected, reference))
+        np.testing.assert_allclose(matrix, expected, atol=1e-9)
+        assert error < 1e-9
+
+
+def test_rigid_transform_rejects_reflection():
+    rng = np.random.default_rng(6)
+    reference = random_shape(rng)
+    matrix, error = rigid_transform(reference, reference * [-1, 1, 1])
+    # The best rotation cannot mirror the points
+    assert np.linalg.det(matrix[0:3, 0:3]) == pytest.approx(1.0)
+    assert error > 0.1
+
+
+def test_find_identical_groups():
+    rng = np.random.default_rng(7)
+    chair = random_shape(rng)
+    plate = random_shape(rng, 30)
+    matrices = [random_rigid_matrix(rng) for _ in range(3)]
+    items = [
+        (chair, "wood"),
+        (plate, "china"),
+        (transform(matrices[0], chair), "wood"),
+        # Same shape, another material: not an instance
+        (transform(matrices[1], chair), "metal"),
+        (transform(matrices[2], chair), "wood"),
+        # Same vertex count and material, another shape
+        (random_shape(rng), "wood"),
+        # Too few points to place
+        (chair[0:2], "wood"),
+        (chair[0:2], "wood"),
+    ]
+    groups = find_identical_groups(items)
+    assert len(groups) == 1
+    reference_index, matches = groups[0]
+    assert reference_index == 0
+    assert [index for index, _ in matches] == [0, 2, 4]
+    np.testing.assert_array_equal(matches[0][1], np.identity(4))
+    for (index, matrix), expected in zip(matches[1:], (matrices[0], matrices[2])):
+        np.testing.assert_allclose(matrix, expected, atol=1e-9)
+        np.testing.assert_allclose(transform(matrix, chair), items[index][0], atol=1e-9)
+
+
+def test_find_identical_groups_tolerance_and_min_count():
+    rng = np.random.default_rng(8)
+    cup = random_shape(rng)
+    copy = transform(random_rigid_matrix(rng), cup)
+    # Small errors (well under the default tolerance) still make an instance
+    noisy = copy + rng.normal(0, 1e-6, copy.shape)
+    assert len(find_identical_groups([(cup, None), (noisy, None)])) == 1
+    assert find_identical_groups([(cup, None), (noisy, None)], tolerance=1e-8) == []
+    assert find_identical_groups([(cup, None), (copy, None)], min_count=3) == []
@@ -0,0 +1,115 @@
+import pytest
+
+from animation.base_scene import BaseScene
+from animation.effects.timeline import MusicTimeline
+from animation.scene_manager import SceneManager
+
+
+def make_scenes():
+    # The scene constructors only set up waypoints and keyframes (no OpenGL)
+    return [scene_class(None, None, None, None) for scene_class in SceneManager.SCENE_CLASSES]
+
+
+def make_manager():
+    manager = SceneManager.__new__(SceneManager)
+    manager.scenes = make_scenes()
+    manager._build_seek_table()
+    return manager
+
+
+def test_cumulative_starts():
+    items = [{"duration": 2.0}, {"duration": 3.0}, {"duration": 0.5}]
+    assert BaseScene.cumulative_starts(items) == [0.0, 2.0, 5.0]
+    assert BaseScene.cumulative_starts([]) == [0.0]
+
+
+@pytest.mark.parametrize("time, expected", [
+    (0.0, (0, 0.0)),
+    (1.5, (0, 1.5)),
+    (2.0, (1, 0.0)),
+    (4.0, (1, 2.0)),
+    (6.0, (2, 1.0)),
+    # Past the end, the last item keeps counting
+    (9.0, (2, 4.0)),
+])
+def test_lookup(time, expected):
+    assert BaseScene.lookup([0.0, 2.0, 5.0], time) == expected
+
+
+def test_scene_time_tables_follow_durations():
+    for scene in make_scenes():
+        for items_name, starts_name in (("waypoints", "waypoint_starts"),
+                                        ("camera_keyframes", "camera_keyframe_starts")):
+            # Not every scene has waypoints or camera keyframes (the rally is a black screen)
+            if not hasattr(scene, starts_name):
+                continue
+            items = getattr(scene, items_name)
+            starts = getattr(scene, starts_name)
+            assert starts == BaseScene.cumulative_starts(items)
+            # Every item is found from its own start and from just before the next one
+            for index, start in enumerate(starts):
+                assert BaseScene.lookup(starts, start) == (index, 0.0)
+                end = start + items[index]["duration"]
+                assert BaseScene.lookup(starts, end - 1e-6)[0] == index
+
+
+def test_music_room_animation_starts():
+    scene = make_scenes()[0]
+    for index, waypoint in enumerate(scene.waypoints):
+        start = scene.animation_starts[index]
+        assert start <= scene.waypoint_starts[index]
+        if index == 0 or waypoint["animation"] != scene.waypoints[index - 1]["animation"]:
+            assert start == scene.waypoint_starts[index]
+        else:
+            assert start == scene.animation_starts[index - 1]
+
+
+def test_seek_table_layout():
+    manager = make_manager()
+    kinds = [(kind, index) for _, kind, index in manager.seek_parts]
+    assert kinds == [("initial", 0), ("scene", 0),
+                     ("transition", 1), ("scene", 1),
+                     ("transition", 2), ("scene", 2),
+                     ("transition", 3), ("scene", 3),
+                     ("transition", 4), ("scene", 4)]
+    assert manager.seek_starts == sorted(manager.seek_starts)
+    # Each part starts where the previous one ends
+    durations = {"initial": SceneManager.INITIAL_TRANSITION, "transition": SceneManager.TRANSITION_DURATION}
+    ends = manager.seek_starts[1:] + [manager.clip_length]
+    for (start, kind, index), end in zip(manager.seek_parts, ends):
+        expected = manager.scene_durations[index] if kind == "scene" else durations[kind]
+        assert end - start == pytest.approx(expected)
+
+
+def test_clip_duration_matches_seek_table():
+    manager = make_manager()
+    assert SceneManager.clip_duration() == pytest.approx(manager.clip_length)
+    assert manager.clip_length == pytest.approx(
+        SceneManager.INITIAL_TRANSITION + sum(scene.get_duration() for scene in make_scenes())
+        + SceneManager.TRANSITION_DURATION * (len(SceneManager.SCENE_CLASSES) - 1))
+
+
+def test_seek_table_lookup():
+    manager = make_manager()
+    for start, kind, index in manager.seek_parts:
+        part_index, local_time = BaseScene.lookup(manager.seek_starts, start + 0.25)
+        assert manager.seek_parts[part_index] == (start, kind, index)
+        assert local_time == pytest.approx(0.25)
+
+
+def test_music_timeline_find_entry():
+    timeline = MusicTimeline(audio_manager=None)
+    timeline.set_timeline([
+        {"start": 10, "end": 20, "music": "b", "volume": 1.0, "loop": False},
+        {"start": 0, "end": 8, "music": "a", "volume": 1.0, "loop": True},
+        {"start": 20, "end": 30, "music": None, "volume": 0.0, "loop": False},
+    ])
+    assert timeline.entry_starts == [0, 10, 20]
+    assert timeline._find_entry(0.0) == (0, timeline.music_timeline[0])
+    assert timeline._find_entry(7.9)[0] == 0
+    # Between entries and after the last one there is no entry
+    assert timeline._find_entry(9.0) == (-1, None)
+    assert timeline._find_entry(10.0)[1]["music"] == "b"
+    assert timeline._find_entry(20.0)[0] == 2
+    assert timeline._find_entry(30.0) == (-1, None)
+    assert timeline._find_entry(-1.0) == (-1, None)
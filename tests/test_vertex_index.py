@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from core.vertex_index import index_vertices, optimize_vertex_cache, reorder_vertices, simulate_vertex_cache
+
+
+def make_grid(size):
+    """ Expanded (non-indexed) positions and uvs of a size x size grid of quads """
+    corners = []
+    for row in range(size):
+        for column in range(size):
+            a, b, c, d = (row, column), (row, column + 1), (row + 1, column + 1), (row + 1, column)
+            corners += [a, b, c, a, c, d]
+    corners = np.array(corners, dtype=np.float32)
+    positions = np.c_[corners, np.zeros(len(corners), dtype=np.float32)]
+    uvs = corners / size
+    return positions, uvs
+
+
+def sorted_triangles(indices):
+    # Rotating a triangle keeps its winding, so compare each one from its smallest vertex
+    triangles = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+    rolled = [np.roll(triangle, -int(np.argmin(triangle))).tolist() for triangle in triangles]
+    return sorted(rolled)
+
+
+def test_index_vertices_round_trip():
+    positions, uvs = make_grid(6)
+    (unique_positions, unique_uvs), indices = index_vertices([positions, uvs])
+    assert indices.dtype == np.uint32
+    assert len(unique_positions) == 7 * 7
+    np.testing.assert_array_equal(unique_positions[indices], positions)
+    np.testing.assert_array_equal(unique_uvs[indices], uvs)
+    # Unique vertices are numbered in order of first use
+    first_uses = [int(np.flatnonzero(indices == vertex)[0]) for vertex in range(len(unique_positions))]
+    assert first_uses == sorted(first_uses)
+
+
+def test_index_vertices_keeps_different_attributes_apart():
+    positions = np.array([[0, 0, 0], [0, 0, 0], [-0.0, 0, 0]], dtype=np.float32)
+    normals = np.array([[0, 0, 1], [0, 1, 0], [0, 0, 1]], dtype=np.float32)
+    (unique_positions, _), indices = index_vertices([positions, normals])
+    # Same position with another normal is another vertex; -0.0 equals 0.0
+    assert len(unique_positions) == 2
+    assert indices.tolist() == [0, 1, 0]
+
+
+def test_index_vertices_empty():
+    arrays, indices = index_vertices([np.zeros((0, 3))])
+    assert len(arrays[0]) == 0
+    assert len(indices) == 0
+
+
+@pytest.mark.parametrize("cache_size", [8, 16, 32])
+def test_optimize_vertex_cache_keeps_triangles(cache_size):
+    positions, uvs = make_grid(24)
+    (unique_positions, _), indices = index_vertices([positions, uvs])
+    # Shuffled triangles: the worst case for the cache
+    rng = np.random.default_rng(4)
+    shuffled = indices.reshape(-1, 3)[rng.permutation(len(indices) // 3)].ravel()
+    optimized = optimize_vertex_cache(shuffled, len(unique_positions), cache_size)
+    assert optimized.dtype == np.uint32
+    assert sorted_triangles(optimized) == sorted_triangles(shuffled)
+    assert simulate_vertex_cache(optimized, cache_size) < simulate_vertex_cache(shuffled, cache_size)
+
+
+def test_optimize_vertex_cache_empty():
+    assert len(optimize_vertex_cache(np.zeros(0, dtype=np.uint32), 0)) == 0
+
+
+def test_reorder_vertices_round_trip():
+    positions, uvs = make_grid(10)
+    (unique_positions, unique_uvs), indices = index_vertices([positions, uvs])
+    optimized = optimize_vertex_cache(indices, len(unique_positions))
+    (new_positions, new_uvs), new_indices = reorder_vertices([unique_positions, unique_uvs], optimized)
+    np.testing.assert_array_equal(new_positions[new_indices], unique_positions[optimized])
+    np.testing.assert_array_equal(new_uvs[new_indices], unique_uvs[optimized])
+    first_uses = [int(np.flatnonzero(new_indices == vertex)[0]) for vertex in range(len(new_positions))]
+    assert first_uses == sorted(first_uses)
+
+
+def test_simulate_vertex_cache():
+    assert simulate_vertex_cache([0, 1, 2, 0, 1, 2], cache_size=3) == 3
+    # 0 is evicted by 3 before it is used again
+    assert simulate_vertex_cache([0, 1, 2, 3, 0], cache_size=3) == 5